@@ -0,0 +1,182 @@
+import argparse
+import json
+import sys
+from array import array
+from collections import deque
+from pathlib import Path
+
+from armazenamento import abrir_banco
+from busca import normalizar
+
+# Caracteres lidos por vez dos arquivos (a memória não depende do tamanho do documento)
+TAMANHO_BLOCO = 1 << 16
+# Códigos de caractere cabem em 21 bits: a transição (estado, caractere) vira uma chave inteira
+BITS_CARACTERE = 21
+
+
+class AnotadorTermos:
+    # Autômato de Aho-Corasick com todos os nomes e sinônimos do glossário,
+    # sem acentos e caixa. Percorre o documento uma única vez, caractere a
+    # caractere, e encontra todas as ocorrências de todos os termos ao mesmo
+    # tempo, em palavras inteiras. Os offsets são do texto original.
+
+    def __init__(self, dados):
+        self._transicoes = {}   # (estado << BITS_CARACTERE | código) -> próximo estado
+        self._saidas = {}       # estado -> ((tamanho do padrão, termo), ...), do mais longo ao mais curto
+        self._dobras = {}       # caractere original -> caracteres dobrados (cache)
+        filhos = [[]]
+        self.maior = 0
+        for termo in dados:
+            for nome in dict.fromkeys([termo["termo"], *termo.get("sinonimos", [])]):
+                padrao = self._dobrar_texto(nome)
+                if padrao:
+                    self._incluir(padrao, termo["termo"], filhos)
+        self._ligar_falhas(filhos)
+
+    def _dobrar(self, caractere):
+        # Sem acentos e caixa; qualquer espaço em branco vira " "
+        dobrado = self._dobras.get(caractere)
+        if dobrado is None:
+            dobrado = self._dobras[caractere] = " " if caractere.isspace() else normalizar(caractere)
+        return dobrado
+
+    def _dobrar_texto(self, texto):
+        return " ".join("".join(self._dobrar(c) for c in texto).split())
+
+    def _incluir(self, padrao, termo, filhos):
+        estado = 0
+        for caractere in padrao:
+            chave = estado << BITS_CARACTERE | ord(caractere)
+            proximo = self._transicoes.get(chave)
+            if proximo is None:
+                proximo = self._transicoes[chave] = len(filhos)
+                filhos[estado].append((ord(caractere), proximo))
+                filhos.append([])
+            estado = proximo
+        saidas = self._saidas.get(estado, ())
+        if (len(padrao), termo) not in saidas:
+            self._saidas[estado] = saidas + ((len(padrao), termo),)
+        self.maior = max(self.maior, len(padrao))
+
+    def _ligar_falhas(self, filhos):
+        # Busca em largura: a falha de um estado é o maior sufixo próprio que
+        # também é prefixo de algum padrão; as saídas dela são herdadas
+        falhas = array("I", [0]) * len(filhos)
+        fila = deque(proximo for _, proximo in filhos[0])
+        while fila:
+            estado = fila.popleft()
+            for codigo, proximo in filhos[estado]:
+                fila.append(proximo)
+                falha = falhas[estado]
+                while falha and (falha << BITS_CARACTERE | codigo) not in self._transicoes:
+                    falha = falhas[falha]
+                destino = self._transicoes.get(falha << BITS_CARACTERE | codigo, 0)
+                falhas[proximo] = destino if destino != proximo else 0
+                herdadas = self._saidas.get(falhas[proximo])
+                if herdadas:
+                    proprias = self._saidas.get(proximo, ())
+                    self._saidas[proximo] = tuple(sorted(set(proprias + herdadas), key=lambda s: (-s[0], s[1])))
+        self._falhas = falhas
+
+    def atualizado(self, dados, alterados):
+        # As falhas dependem de todos os padrões: versão nova montada do zero
+        return AnotadorTermos(dados)
+
+    def anotar_fluxo(self, blocos):
+        # Recebe o documento em pedaços (strings) e gera (início, fim, termo)
+        # na ordem do texto. Memória limitada ao tamanho do maior padrão.
+        # Uma ocorrência dentro de outra maior ("Corpus" em "Habeas Corpus")
+        # não é emitida; sobreposições parciais são.
+        transicoes, falhas, saidas = self._transicoes, self._falhas, self._saidas
+        janela = deque(maxlen=self.maior + 1)   # (offset original, é letra/dígito) por caractere dobrado
+        pendentes = []     # ocorrências esperando o caractere seguinte (limite da palavra)
+        candidatas = []    # ocorrências confirmadas ainda sujeitas a uma maior que as contenha
+        estado = 0
+        lidos = 0          # caracteres dobrados consumidos
+        posicao = 0        # offset original do próximo caractere
+        anterior = " "
+
+        for bloco in blocos:
+            for caractere in bloco:
+                for dobrado in self._dobrar(caractere):
+                    if dobrado == " " and anterior == " ":
+                        continue
+                    anterior = dobrado
+                    letra = dobrado.isalnum()
+                    if pendentes:
+                        if not letra:
+                            self._confirmar(pendentes, candidatas)
+                        pendentes.clear()
+                    if candidatas and candidatas[0][0] <= lidos - self.maior:
+                        yield from self._liberar(candidatas, lidos - self.maior)
+
+                    janela.append((posicao, letra))
+                    lidos += 1
+                    codigo = ord(dobrado)
+                    while estado and (estado << BITS_CARACTERE | codigo) not in transicoes:
+                        estado = falhas[estado]
+                    estado = transicoes.get(estado << BITS_CARACTERE | codigo, 0)
+                    for tamanho, termo in saidas.get(estado, ()):
+                        # Limite à esquerda: o caractere antes do padrão não é letra/dígito
+                        if tamanho < len(janela) and janela[-tamanho - 1][1]:
+                            continue
+                        pendentes.append((lidos - tamanho, lidos, janela[-tamanho][0], posicao + 1, termo))
+                posicao += 1
+
+        self._confirmar(pendentes, candidatas)
+        yield from self._liberar(candidatas, lidos)
+
+    @staticmethod
+    def _confirmar(novas, candidatas):
+        # Descarta as contidas em outra ocorrência e remove as que a nova contém
+        for nova in novas:
+            inicio, fim = nova[0], nova[1]
+            if any(c[0] <= inicio and fim <= c[1] and (c[0], c[1]) != (inicio, fim) for c in candidatas):
+                continue
+            candidatas[:] = [c for c in candidatas
+                             if not (inicio <= c[0] and c[1] <= fim and (c[0], c[1]) != (inicio, fim))]
+            candidatas.append(nova)
+        candidatas.sort()
+
+    @staticmethod
+    def _liberar(candidatas, limite):
+        # Nenhum padrão futuro começa antes de "limite": essas já são definitivas
+        while candidatas and candidatas[0][0] <= limite:
+            _, _, inicio, fim, termo = candidatas.pop(0)
+            yield inicio, fim, termo
+
+    def anotar(self, texto):
+        return list(self.anotar_fluxo([texto]))
+
+    def anotar_arquivo(self, caminho, encoding="utf-8", tamanho_bloco=TAMANHO_BLOCO):
+        with open(caminho, encoding=encoding) as arquivo:
+            yield from self.anotar_fluxo(iter(lambda: arquivo.read(tamanho_bloco), ""))
+
+
+def carregar_anotador(origem=None):
+    # Do banco padrão (dados/glossario.db) ou de um JSON no formato do glossário
+    if origem is not None and Path(origem).suffix == ".json":
+        with open(origem, encoding="utf-8") as arquivo:
+            return AnotadorTermos(json.load(arquivo))
+    banco = abrir_banco(origem) if origem else abrir_banco()
+    return AnotadorTermos(banco.buscar())
+
+
+if __name__ == "__main__":
+    # python anotador.py peticao.txt [sentenca.txt ...] [--glossario dados/glossario.json] [--jsonl]
+    parser = argparse.ArgumentParser(description="Marca os termos do glossário em documentos jurídicos")
+    parser.add_argument("arquivos", nargs="+", type=Path)
+    parser.add_argument("--glossario", help="banco SQLite ou JSON do glossário (padrão: dados/glossario.db)")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--jsonl", action="store_true", help="uma ocorrência por linha em JSON")
+    args = parser.parse_args()
+
+    anotador = carregar_anotador(args.glossario)
+    for caminho in args.arquivos:
+        for inicio, fim, termo in anotador.anotar_arquivo(caminho, args.encoding):
+            if args.jsonl:
+                print(json.dumps({"arquivo": str(caminho), "inicio": inicio, "fim": fim, "termo": termo},
+                                 ensure_ascii=False))
+            else:
+                print(f"{caminho}\t{inicio}\t{fim}\t{termo}")
+    sys.stdout.flush()
@@ -0,0 +1,245 @@
+import argparse
+import gzip
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote
+
+from armazenamento import abrir_banco
+from versoes import GerenciadorVersoes
+
+LOG = logging.getLogger(__name__)
+
+LIMITE_PADRAO = 20
+LIMITE_MAXIMO = 100
+# Corpos menores que isto não compensam a compressão
+TAMANHO_MINIMO_GZIP = 1024
+# Respostas prontas (JSON serializado e, se for o caso, comprimido) por versão
+RESPOSTAS_EM_CACHE = 4096
+
+
+class ErroAPI(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def _resposta_erro(status, mensagem, cabecalhos=()):
+    corpo = json.dumps({"erro": mensagem}, ensure_ascii=False).encode("utf-8")
+    return status, [*cabecalhos, ("Content-Type", "application/json; charset=utf-8")], corpo
+
+
+class APIGlossario:
+    # API JSON somente leitura sobre a mesma versão do glossário usada pelo
+    # streamlit_app (GerenciadorVersoes: snapshot mmap + índices). Cada
+    # resposta depende só da URL e da versão dos dados: o ETag vem da versão
+    # e o corpo fica pronto em cache até os dados mudarem. Também é um app
+    # WSGI (ex.: gunicorn "api:criar_aplicacao()").
+    #
+    #   GET /saude
+    #   GET /termos?busca=&area=&limite=&deslocamento=
+    #   GET /termos/<nome>
+    #   GET /termos/<nome>/relacionados
+    #   GET /areas
+    #   GET /areas/<area>?limite=&deslocamento=
+
+    def __init__(self, versoes):
+        self.versoes = versoes
+        self._respostas = {}
+        self._versao_respostas = None
+        self._trava = threading.Lock()
+
+    def responder(self, metodo, caminho, consulta="", cabecalhos=None):
+        # Devolve (status, [(cabeçalho, valor)], corpo). Falhas inesperadas
+        # viram um 500 em JSON, fora do cache de respostas
+        try:
+            return self._responder(metodo, caminho, consulta, cabecalhos or {})
+        except Exception:
+            LOG.exception("Erro ao responder %s %s?%s", metodo, caminho, consulta)
+            return _resposta_erro(500, "Erro interno")
+
+    def _responder(self, metodo, caminho, consulta, cabecalhos):
+        if metodo not in ("GET", "HEAD"):
+            return _resposta_erro(405, "Método não permitido", [("Allow", "GET, HEAD")])
+
+        versao = self.versoes.atual()
+        usa_gzip = "gzip" in (cabecalhos.get("Accept-Encoding") or "")
+        chave = (caminho, consulta, usa_gzip)
+        with self._trava:
+            if versao.versao != self._versao_respostas:
+                self._respostas = {}
+                self._versao_respostas = versao.versao
+            resposta = self._respostas.get(chave)
+        if resposta is None:
+            resposta = self._montar_resposta(versao, caminho, consulta, usa_gzip)
+            with self._trava:
+                if self._versao_respostas == versao.versao:
+                    if len(self._respostas) >= RESPOSTAS_EM_CACHE:
+                        self._respostas.clear()
+                    self._respostas[chave] = resposta
+
+        status, lista_cabecalhos, corpo, etag = resposta
+        if etag and etag in (cabecalhos.get("If-None-Match") or ""):
+            return 304, [("ETag", etag), ("Cache-Control", "no-cache"), ("Vary", "Accept-Encoding")], b""
+        return status, lista_cabecalhos, corpo
+
+    def _montar_resposta(self, versao, caminho, consulta, usa_gzip):
+        try:
+            status, dados = 200, self._rotear(versao, caminho, parse_qs(consulta))
+        except ErroAPI as erro:
+            status, dados = erro.status, {"erro": str(erro)}
+        corpo = json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        cabecalhos = [("Content-Type", "application/json; charset=utf-8"), ("Vary", "Accept-Encoding")]
+        etag = None
+        comprimido = usa_gzip and len(corpo) >= TAMANHO_MINIMO_GZIP
+        if comprimido:
+            corpo = gzip.compress(corpo, compresslevel=6)
+            cabecalhos.append(("Content-Encoding", "gzip"))
+        if status == 200:
+            # Uma representação por versão dos dados e por codificação
+            etag = f'"{versao.versao}{"-gz" if comprimido else ""}"'
+            cabecalhos += [("ETag", etag), ("Cache-Control", "no-cache")]
+        return status, cabecalhos, corpo, etag
+
+    # Rotas
+    def _rotear(self, versao, caminho, parametros):
+        partes = [unquote(parte) for parte in caminho.strip("/").split("/")]
+        if partes == ["saude"]:
+            return {"versao": versao.versao, "termos": len(versao.dados)}
+        if partes[0] == "termos":
+            if len(partes) == 1:
+                return self._buscar(versao, parametros)
+            termo = self._resolver_termo(versao, partes[1])
+            if len(partes) == 2:
+                return {"versao": versao.versao, "termo": dict(termo)}
+            if len(partes) == 3 and partes[2] == "relacionados":
+                relacionados = versao.indice_termos.obter_relacionados(termo["termo"])
+                return {"versao": versao.versao, "termo": termo["termo"],
+                        "relacionados": [{"termo": nome, "existe": existe} for nome, existe in relacionados]}
+        if partes[0] == "areas":
+            if len(partes) == 1:
+                return {"versao": versao.versao,
+                        "areas": [{"area": area, "quantidade": quantidade}
+                                  for area, quantidade in versao.estatisticas.contagem_areas()]}
+            if len(partes) == 2:
+                if partes[1] not in versao.estatisticas.por_area:
+                    raise ErroAPI(404, f"Área não encontrada: {partes[1]}")
+                return self._pagina(versao, versao.dados.ids_por_area(partes[1]), parametros)
+        raise ErroAPI(404, f"Rota não encontrada: {caminho}")
+
+    def _buscar(self, versao, parametros):
+        busca = self._parametro(parametros, "busca")
+        area = self._parametro(parametros, "area")
+        if busca:
+            ids = versao.buscar(busca, area)
+        elif area:
+            ids = versao.dados.ids_por_area(area)
+        else:
+            ids = range(len(versao.dados))
+        return self._pagina(versao, ids, parametros)
+
+    def _resolver_termo(self, versao, nome):
+        # Nome exato ou apelido de um único termo ("HC" -> Habeas Corpus)
+        termo = versao.indice_termos.obter(nome)
+        if termo is None:
+            ids = versao.indice_apelidos.resolver_ids(nome)
+            if len(ids) != 1:
+                raise ErroAPI(404, f"Termo não encontrado: {nome}")
+            termo = versao.dados[ids[0]]
+        return termo
+
+    def _pagina(self, versao, ids, parametros):
+        limite = self._inteiro(parametros, "limite", LIMITE_PADRAO, 1, LIMITE_MAXIMO)
+        deslocamento = self._inteiro(parametros, "deslocamento", 0, 0, None)
+        return {
+            "versao": versao.versao,
+            "total": len(ids),
+            "limite": limite,
+            "deslocamento": deslocamento,
+            "termos": [dict(versao.dados[doc_id]) for doc_id in ids[deslocamento:deslocamento + limite]],
+        }
+
+    @staticmethod
+    def _parametro(parametros, nome):
+        valores = parametros.get(nome)
+        return valores[0].strip() if valores and valores[0].strip() else None
+
+    @classmethod
+    def _inteiro(cls, parametros, nome, padrao, minimo, maximo):
+        valor = cls._parametro(parametros, nome)
+        if valor is None:
+            return padrao
+        try:
+            valor = int(valor)
+        except ValueError:
+            raise ErroAPI(400, f"Parâmetro '{nome}' deve ser um número inteiro") from None
+        if valor < minimo:
+            raise ErroAPI(400, f"Parâmetro '{nome}' deve ser no mínimo {minimo}")
+        return valor if maximo is None else min(valor, maximo)
+
+    # WSGI
+    def __call__(self, environ, start_response):
+        cabecalhos = {
+            "Accept-Encoding": environ.get("HTTP_ACCEPT_ENCODING", ""),
+            "If-None-Match": environ.get("HTTP_IF_NONE_MATCH", ""),
+        }
+        status, lista_cabecalhos, corpo = self.responder(
+            environ["REQUEST_METHOD"], environ.get("PATH_INFO", "/"), environ.get("QUERY_STRING", ""), cabecalhos)
+        start_response(f"{status} {HTTPStatus(status).phrase}",
+                       lista_cabecalhos + [("Content-Length", str(len(corpo)))])
+        return [] if environ["REQUEST_METHOD"] == "HEAD" else [corpo]
+
+
+def criar_aplicacao():
+    # Mesmo banco e mesma pasta de snapshots do streamlit_app
+    return APIGlossario(GerenciadorVersoes(abrir_banco()))
+
+
+def criar_servidor(api, host="127.0.0.1", porta=8502):
+    # Servidor da biblioteca padrão, uma thread por conexão, com keep-alive
+    class Manipulador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Cabeçalhos e corpo saem em escritas separadas: com Nagle ligado, o
+        # corpo esperaria o ACK atrasado do cliente (~40 ms por resposta)
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self._responder()
+
+        def do_HEAD(self):
+            self._responder()
+
+        def _responder(self):
+            caminho, _, consulta = self.path.partition("?")
+            status, cabecalhos, corpo = api.responder(self.command, caminho, consulta, self.headers)
+            self.send_response(status)
+            for nome, valor in cabecalhos:
+                self.send_header(nome, valor)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            # Sem log por requisição: sob carga ele custaria mais que a resposta
+            pass
+
+    return ThreadingHTTPServer((host, porta), Manipulador)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API JSON do Glossário Jurídico")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8502)
+    args = parser.parse_args()
+
+    servidor = criar_servidor(criar_aplicacao(), args.host, args.porta)
+    print(f"API do glossário em http://{args.host}:{args.porta}/termos")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
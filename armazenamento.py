@@ -0,0 +1,224 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from modelos import Termo
+
+PASTA_DADOS = Path(__file__).with_name("dados")
+CAMINHO_BANCO = PASTA_DADOS / "glossario.db"
+CAMINHO_GLOSSARIO = PASTA_DADOS / "glossario.json"
+CAMINHO_NOTICIAS = PASTA_DADOS / "noticias.json"
+
+ESQUEMA = """
+-- WAL: leitores (páginas) não bloqueiam enquanto a ingestão de notícias escreve
+PRAGMA journal_mode = WAL;
+
+CREATE TABLE IF NOT EXISTS termos (
+    id INTEGER PRIMARY KEY,
+    termo TEXT NOT NULL UNIQUE,
+    definicao TEXT NOT NULL,
+    fonte TEXT NOT NULL,
+    jurisprudencia TEXT NOT NULL DEFAULT '',
+    area TEXT NOT NULL,
+    exemplo TEXT NOT NULL DEFAULT '',
+    sinonimos TEXT NOT NULL DEFAULT '[]',
+    relacionados TEXT NOT NULL DEFAULT '[]',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_termos_area ON termos(area);
+CREATE INDEX IF NOT EXISTS idx_termos_fonte ON termos(fonte);
+CREATE INDEX IF NOT EXISTS idx_termos_data ON termos(data);
+
+-- A busca por texto usa os índices em memória (busca.py); remove o índice
+-- FTS5 e os gatilhos criados por versões anteriores do esquema
+DROP TRIGGER IF EXISTS termos_ai;
+DROP TRIGGER IF EXISTS termos_ad;
+DROP TRIGGER IF EXISTS termos_au;
+DROP TABLE IF EXISTS termos_fts;
+
+CREATE TABLE IF NOT EXISTS noticias (
+    id INTEGER PRIMARY KEY,
+    termo TEXT NOT NULL,
+    titulo TEXT NOT NULL,
+    fonte TEXT NOT NULL,
+    data TEXT NOT NULL,
+    resumo TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '#'
+);
+CREATE INDEX IF NOT EXISTS idx_noticias_termo ON noticias(termo, data DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_noticias_unica ON noticias(termo, titulo, fonte);
+
+-- Versão (hash do arquivo de origem) com que os termos foram sincronizados
+CREATE TABLE IF NOT EXISTS metadados (
+    chave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+
+
+def linha_para_termo(linha):
+    return Termo(
+        linha["termo"], linha["definicao"], linha["fonte"], linha["jurisprudencia"],
+        linha["area"], linha["exemplo"], json.loads(linha["sinonimos"]),
+        json.loads(linha["relacionados"]), linha["data"],
+    )
+
+
+class BancoGlossario:
+    # Acesso ao glossário em SQLite. Cada thread do Streamlit usa sua própria
+    # conexão; as páginas buscam apenas as linhas que vão exibir.
+
+    def __init__(self, caminho=CAMINHO_BANCO):
+        self.caminho = Path(caminho)
+        self._local = threading.local()
+
+    def conexao(self):
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho)
+            conexao.row_factory = sqlite3.Row
+            self._local.conexao = conexao
+        return conexao
+
+    def criar_esquema(self):
+        conexao = self.conexao()
+        conexao.executescript(ESQUEMA)
+        conexao.commit()
+
+    # Escrita
+    def gravar_termos(self, conexao, termos, data):
+        # Upsert pelo nome dentro de uma transação do chamador (ex.: importação em blocos)
+        linhas = [(
+            termo["termo"], termo["definicao"], termo["fonte"],
+            termo.get("jurisprudencia", ""), termo["area"], termo.get("exemplo", ""),
+            json.dumps(termo.get("sinonimos", []), ensure_ascii=False),
+            json.dumps(termo.get("relacionados", []), ensure_ascii=False),
+            termo.get("data") or data,
+        ) for termo in termos]
+        # Linhas sem mudança de conteúdo não são reescritas
+        conexao.executemany("""
+            INSERT INTO termos (termo, definicao, fonte, jurisprudencia, area, exemplo,
+                                sinonimos, relacionados, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(termo) DO UPDATE SET
+                definicao = excluded.definicao, fonte = excluded.fonte,
+                jurisprudencia = excluded.jurisprudencia, area = excluded.area,
+                exemplo = excluded.exemplo, sinonimos = excluded.sinonimos,
+                relacionados = excluded.relacionados, data = excluded.data
+            WHERE (definicao, fonte, jurisprudencia, area, exemplo, sinonimos, relacionados)
+                IS NOT (excluded.definicao, excluded.fonte, excluded.jurisprudencia, excluded.area,
+                        excluded.exemplo, excluded.sinonimos, excluded.relacionados)
+        """, linhas)
+        return len(linhas)
+
+    def salvar_termos(self, termos, data=None):
+        data = data or datetime.now().strftime("%Y-%m-%d")
+        conexao = self.conexao()
+        with conexao:
+            return self.gravar_termos(conexao, termos, data)
+
+    def sincronizar_termos(self, termos, data=None, versao=None):
+        # Deixa a tabela igual à lista, numa única transação: grava os termos,
+        # remove os que não estão mais nela e registra a versão de origem
+        data = data or datetime.now().strftime("%Y-%m-%d")
+        conexao = self.conexao()
+        with conexao:
+            self.gravar_termos(conexao, termos, data)
+            conexao.execute("CREATE TEMP TABLE IF NOT EXISTS nomes_sincronizados (termo TEXT PRIMARY KEY)")
+            conexao.execute("DELETE FROM nomes_sincronizados")
+            conexao.executemany("INSERT OR IGNORE INTO nomes_sincronizados VALUES (?)",
+                                [(termo["termo"],) for termo in termos])
+            removidos = conexao.execute(
+                "DELETE FROM termos WHERE termo NOT IN (SELECT termo FROM nomes_sincronizados)").rowcount
+            if versao:
+                conexao.execute("INSERT OR REPLACE INTO metadados (chave, valor) VALUES ('versao_termos', ?)",
+                                (versao,))
+        return removidos
+
+    def salvar_noticias(self, termo, noticias):
+        # Notícias já gravadas (mesmo termo, título e fonte) são ignoradas;
+        # devolve quantas eram novas
+        conexao = self.conexao()
+        antes = conexao.total_changes
+        with conexao:
+            conexao.executemany(
+                "INSERT OR IGNORE INTO noticias (termo, titulo, fonte, data, resumo, url) VALUES (?, ?, ?, ?, ?, ?)",
+                [(termo, n["titulo"], n["fonte"], n["data"], n.get("resumo", ""), n.get("url", "#"))
+                 for n in noticias])
+        return conexao.total_changes - antes
+
+    # Leitura
+    def _filtros(self, area=None, fonte=None):
+        condicoes, parametros = [], []
+        if area and area != "Todas":
+            condicoes.append("t.area = ?")
+            parametros.append(area)
+        if fonte and fonte != "Todas":
+            condicoes.append("t.fonte = ?")
+            parametros.append(fonte)
+        where = " WHERE " + " AND ".join(condicoes) if condicoes else ""
+        return where, parametros
+
+    def obter(self, nome):
+        linha = self.conexao().execute("SELECT * FROM termos WHERE termo = ?", (nome,)).fetchone()
+        return linha_para_termo(linha) if linha else None
+
+    def buscar(self, area=None, fonte=None, limite=None, deslocamento=0):
+        where, parametros = self._filtros(area, fonte)
+        sql = f"SELECT t.* FROM termos t{where} ORDER BY t.id LIMIT ? OFFSET ?"
+        parametros += [-1 if limite is None else limite, deslocamento]
+        return [linha_para_termo(l) for l in self.conexao().execute(sql, parametros)]
+
+    def contar(self, area=None, fonte=None):
+        where, parametros = self._filtros(area, fonte)
+        return self.conexao().execute(f"SELECT COUNT(*) FROM termos t{where}", parametros).fetchone()[0]
+
+    def versao_termos(self):
+        linha = self.conexao().execute("SELECT valor FROM metadados WHERE chave = 'versao_termos'").fetchone()
+        return linha[0] if linha else None
+
+    def registrar_versao_termos(self, versao):
+        conexao = self.conexao()
+        with conexao:
+            conexao.execute("INSERT OR REPLACE INTO metadados (chave, valor) VALUES ('versao_termos', ?)",
+                            (versao,))
+
+    def noticias(self, termo, limite=10):
+        return [dict(l) for l in self.conexao().execute(
+            "SELECT titulo, fonte, data, resumo, url FROM noticias WHERE termo = ? ORDER BY data DESC LIMIT ?",
+            (termo, limite))]
+
+
+def construir_banco(caminho=CAMINHO_BANCO, glossario=CAMINHO_GLOSSARIO, noticias=CAMINHO_NOTICIAS):
+    # Gera o banco a partir dos arquivos JSON versionados no repositório
+    caminho = Path(caminho)
+    temporario = caminho.with_name(f"{caminho.name}.{os.getpid()}.tmp")
+    temporario.unlink(missing_ok=True)
+    banco = BancoGlossario(temporario)
+    banco.criar_esquema()
+    with open(glossario, encoding="utf-8") as arquivo:
+        banco.salvar_termos(json.load(arquivo))
+    with open(noticias, encoding="utf-8") as arquivo:
+        for termo, itens in json.load(arquivo).items():
+            banco.salvar_noticias(termo, itens)
+    banco.conexao().close()
+    # Troca atômica: leitores nunca veem um banco pela metade
+    temporario.replace(caminho)
+    return BancoGlossario(caminho)
+
+
+def abrir_banco(caminho=CAMINHO_BANCO):
+    if not Path(caminho).exists():
+        return construir_banco(caminho)
+    # Garante tabelas e índices novos em bancos gerados por versões anteriores
+    banco = BancoGlossario(caminho)
+    banco.criar_esquema()
+    return banco
+
+
+if __name__ == "__main__":
+    banco = construir_banco()
+    print(f"Banco gerado em {banco.caminho} com {banco.contar()} termos")
@@ -0,0 +1,4 @@
+# Benchmarks do Glossário Jurídico, por área: índices de busca, persistência
+# (SQLite, snapshot, importação, versões), rede (fontes, HTTP, ingestão, API),
+# páginas (pandas, sessões, gráfico) e a suíte de regressão.
+# Uso: python -m benchmarks [--suite --tamanhos 1000,10000 --saida r.json]
@@ -0,0 +1,53 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.indices import (benchmark_anotador, benchmark_autocompletar, benchmark_busca,
+                                benchmark_busca_aproximada, benchmark_relevancia)
+from benchmarks.paginas import benchmark_dataframe, benchmark_grafico, benchmark_instrumentacao, benchmark_sessoes
+from benchmarks.persistencia import (benchmark_armazenamento, benchmark_importacao, benchmark_snapshot,
+                                     benchmark_termo, benchmark_versoes)
+from benchmarks.rede import benchmark_api, benchmark_cliente_http, benchmark_fontes_paralelas, benchmark_ingestao
+from benchmarks.suite import comparar_resultados, executar_suite
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks do Glossário Jurídico")
+    parser.add_argument("--termos", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=200)
+    parser.add_argument("--suite", action="store_true",
+                        help="mede os caminhos quentes das páginas em vários tamanhos de glossário")
+    parser.add_argument("--tamanhos", default="1000,10000,100000",
+                        help="tamanhos da suíte separados por vírgula (ex.: 1000,10000,100000,1000000)")
+    parser.add_argument("--saida", help="arquivo JSON com os resultados da suíte")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para detectar regressões")
+    args = parser.parse_args()
+
+    if args.suite:
+        relatorio = executar_suite([int(t) for t in args.tamanhos.split(",")], args.repeticoes)
+        if args.saida:
+            Path(args.saida).write_text(json.dumps(relatorio, ensure_ascii=False, indent=2), encoding="utf-8")
+            print(f"Resultados gravados em {args.saida}")
+        if args.comparar:
+            anterior = json.loads(Path(args.comparar).read_text(encoding="utf-8"))
+            sys.exit(1 if comparar_resultados(anterior, relatorio) else 0)
+        sys.exit(0)
+
+    benchmark_busca(args.termos, args.repeticoes)
+    benchmark_busca_aproximada(args.termos, args.repeticoes)
+    benchmark_autocompletar(args.termos, args.repeticoes)
+    benchmark_armazenamento(args.termos, args.repeticoes)
+    benchmark_snapshot(args.termos, args.repeticoes)
+    benchmark_fontes_paralelas(min(args.repeticoes, 10))
+    benchmark_cliente_http(args.repeticoes)
+    benchmark_ingestao(min(args.termos, 10_000), args.repeticoes)
+    benchmark_importacao(min(args.termos, 20_000))
+    benchmark_versoes(args.termos)
+    benchmark_dataframe(args.termos, args.repeticoes)
+    benchmark_sessoes(min(args.termos, 20_000))
+    benchmark_grafico(min(args.termos, 10_000), args.repeticoes)
+    benchmark_termo(args.termos)
+    benchmark_relevancia(args.termos, args.repeticoes)
+    benchmark_anotador(min(args.termos, 10_000))
+    benchmark_api(min(args.termos, 10_000))
+    benchmark_instrumentacao(args.repeticoes)
@@ -0,0 +1,94 @@
+import random
+import statistics
+import time
+import tracemalloc
+
+# Vocabulário usado para montar termos sintéticos com o mesmo formato do GLOSSARIO_DADOS
+PALAVRAS = [
+    "ação", "recurso", "sentença", "habeas", "corpus", "mandado", "segurança",
+    "usucapião", "posse", "propriedade", "contrato", "obrigação", "execução",
+    "penhora", "embargos", "declaração", "apelação", "agravo", "instrumento",
+    "petição", "inicial", "citação", "intimação", "prescrição", "decadência",
+    "dolo", "culpa", "crime", "pena", "prisão", "liberdade", "coisa", "julgada",
+    "competência", "jurisdição", "tributo", "imposto", "licitação", "servidor",
+    "público", "princípio", "isonomia", "legalidade", "família", "sucessão",
+    "herança", "testamento", "divórcio", "alimentos", "guarda", "tutela",
+    "urgência", "evidência", "liminar", "cautelar", "nulidade", "revelia",
+]
+AREAS = [
+    "Direito Constitucional", "Direito Civil", "Direito Penal",
+    "Direito Processual Civil", "Direito Processual Penal",
+    "Direito Administrativo", "Direito Empresarial", "Direito Tributário",
+]
+# Sílabas para palavras raras: o vocabulário segue uma cauda longa, como num glossário real
+SILABAS = ["ca", "pi", "ão", "ju", "ris", "dic", "ção", "le", "gal", "tri", "bu", "to", "ex", "ne", "re"]
+FONTES = [
+    "STF - Supremo Tribunal Federal", "STJ - Superior Tribunal de Justiça",
+    "Código Civil", "Código Penal", "Planalto", "Câmara dos Deputados",
+]
+
+
+def _frase(rng, raras, tamanho):
+    # Mistura palavras comuns do Direito com palavras raras
+    return " ".join(rng.choice(PALAVRAS) if rng.random() < 0.3 else rng.choice(raras)
+                    for _ in range(tamanho))
+
+
+def gerar_glossario_sintetico(quantidade, semente=42):
+    rng = random.Random(semente)
+    raras = sorted({"".join(rng.choices(SILABAS, k=rng.randint(3, 5)))
+                    for _ in range(max(2000, quantidade // 2))})
+    dados = []
+    for i in range(quantidade):
+        nome = " ".join(rng.sample(PALAVRAS, 2)).title() + " " + rng.choice(raras).title() + f" {i}"
+        dados.append({
+            "termo": nome,
+            "definicao": _frase(rng, raras, 20).capitalize() + ".",
+            "fonte": rng.choice(FONTES),
+            "jurisprudencia": f"REsp {rng.randint(100000, 999999)} - " + _frase(rng, raras, 8),
+            "area": rng.choice(AREAS),
+            "exemplo": _frase(rng, raras, 12).capitalize() + ".",
+            "sinonimos": [" ".join(rng.sample(PALAVRAS, 2)).title()],
+            "relacionados": [],
+            "data": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        })
+    # Relacionados apontam para outros termos do próprio corpus
+    for termo in dados:
+        termo["relacionados"] = [rng.choice(dados)["termo"] for _ in range(3)]
+    return dados
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    return {
+        "p50_ms": statistics.median(tempos),
+        "p95_ms": tempos[max(0, int(len(tempos) * 0.95) - 1)],
+        "p99_ms": tempos[max(0, int(len(tempos) * 0.99) - 1)],
+        "max_ms": tempos[-1],
+    }
+
+
+def medir_memoria(funcao):
+    # Pico de memória alocada pelo Python (KB) durante uma chamada
+    tracemalloc.start()
+    try:
+        resultado = funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, pico / 1024
+
+
+def importar_apps():
+    # Os dois apps chamam st.* no nível do módulo; fora do "streamlit run"
+    # isso só gera avisos. Importá-los garante que a suíte mede o código real.
+    from streamlit.logger import set_log_level
+    set_log_level("error")
+    import main as app_pandas
+    import streamlit_app as app
+    return app, app_pandas
@@ -0,0 +1,142 @@
+import random
+import time
+
+from anotador import AnotadorTermos
+from benchmarks.comum import gerar_glossario_sintetico, medir, medir_memoria
+from busca import IndicePrefixos, IndiceRelevancia, IndiceSubstring, IndiceTrigramas, normalizar
+
+
+def busca_linear(dados, busca):
+    # Comportamento original de filtrar_por_busca, com a mesma normalização
+    consulta = normalizar(busca)
+    return [termo for termo in dados
+            if consulta in normalizar(termo["termo"])
+            or consulta in normalizar(termo["definicao"])]
+
+
+def benchmark_busca(quantidade, repeticoes):
+    dados = gerar_glossario_sintetico(quantidade)
+
+    inicio = time.perf_counter()
+    indice = IndiceSubstring(dados)
+    construcao = time.perf_counter() - inicio
+    print(f"[busca] {quantidade} termos - índice construído em {construcao:.2f}s")
+
+    consultas = ["capijuris", "Habeas Corpus 12", "trileto", "1234", "acao recurso"]
+    for consulta in consultas:
+        resultado = medir(lambda: (indice._cache.clear(), indice._cache_fragmentos.clear(), indice.buscar_ids(consulta)),
+                          repeticoes)
+        print(f"  {consulta!r:26} índice p50={resultado['p50_ms']:.3f}ms "
+              f"p95={resultado['p95_ms']:.3f}ms ({len(indice.buscar_ids(consulta))} resultados)")
+
+    linear = medir(lambda: busca_linear(dados, "usucapiao"), 3)
+    print(f"  varredura linear de referência p50={linear['p50_ms']:.1f}ms")
+
+
+def benchmark_busca_aproximada(quantidade, repeticoes):
+    dados = gerar_glossario_sintetico(quantidade)
+
+    inicio = time.perf_counter()
+    indice = IndiceTrigramas(dados)
+    construcao = time.perf_counter() - inicio
+    print(f"[aproximada] {quantidade} termos - índice construído em {construcao:.2f}s")
+
+    # Nomes reais do corpus com um erro de digitação
+    consultas = [dados[7]["termo"][1:], dados[123]["termo"].replace("a", "e", 1), "abeas corpus"]
+    for consulta in consultas:
+        resultado = medir(lambda: indice.sugerir(consulta), repeticoes)
+        sugestoes = indice.sugerir(consulta)
+        melhor = sugestoes[0][0]["termo"] if sugestoes else "-"
+        print(f"  {consulta!r:40} p50={resultado['p50_ms']:.3f}ms "
+              f"p95={resultado['p95_ms']:.3f}ms -> {melhor}")
+
+
+def benchmark_autocompletar(quantidade, repeticoes):
+    dados = gerar_glossario_sintetico(quantidade)
+
+    inicio = time.perf_counter()
+    indice = IndicePrefixos(dados)
+    construcao = time.perf_counter() - inicio
+    print(f"[autocompletar] {quantidade} termos - índice construído em {construcao:.2f}s")
+
+    for prefixo in ["h", "hab", "mandado de s", "sucessao juris", "zzz"]:
+        resultado = medir(lambda: indice.completar(prefixo), repeticoes)
+        print(f"  {prefixo!r:26} p50={resultado['p50_ms'] * 1000:.1f}µs "
+              f"p95={resultado['p95_ms'] * 1000:.1f}µs")
+
+
+def benchmark_relevancia(quantidade, repeticoes):
+    dados = gerar_glossario_sintetico(quantidade)
+    inicio = time.perf_counter()
+    indice = IndiceRelevancia(dados)
+    print(f"[relevância] {quantidade} termos - BM25F montado em {time.perf_counter() - inicio:.2f}s")
+
+    rng = random.Random(7)
+    consultas = ["recurso", "habeas corpus", "rec"] + [rng.choice(dados)["termo"].split()[2] for _ in range(20)]
+    for rotulo, lote in (("palavra comum", consultas[:1]), ("duas palavras", consultas[1:2]),
+                         ("prefixo curto", consultas[2:3]), ("palavra rara", consultas[3:])):
+        def consultar():
+            # Sem o cache de consultas do índice: mede o ranqueamento em si
+            for consulta in lote:
+                indice._cache.clear()
+                indice.ranquear(consulta)
+        resultado = medir(consultar, max(3, repeticoes // 20))
+        quantidade_resultados = len(indice.ranquear(lote[0]))
+        print(f"  {rotulo:26} p50={resultado['p50_ms'] / len(lote):7.2f}ms  ({quantidade_resultados} resultados)")
+
+    # Termos com a palavra no nome devem vir antes dos que só a citam no texto
+    palavra = dados[quantidade // 2]["termo"].split()[2]
+    no_nome = [palavra.lower() in dados[doc_id]["termo"].lower() for doc_id in indice.ranquear(palavra)]
+    print(f"  '{palavra}': {sum(no_nome)} de {len(no_nome)} resultados com a palavra no nome, "
+          f"todos no topo: {no_nome == sorted(no_nome, reverse=True)}")
+
+
+def _documento_sintetico(dados, paragrafos, semente=11):
+    # Petição sintética: definições do glossário com nomes de termos no meio
+    rng = random.Random(semente)
+    for _ in range(paragrafos):
+        citado = rng.choice(dados)["termo"] if rng.random() < 0.3 else ""
+        yield f"{rng.choice(dados)['definicao']} Conforme {citado}, {rng.choice(dados)['exemplo']}\n"
+
+
+def busca_termo_a_termo(dados, texto):
+    # Abordagem ingênua: uma varredura do documento por nome (como filtrar_por_busca)
+    texto = normalizar(texto)
+    ocorrencias = 0
+    for termo in dados:
+        padrao = normalizar(termo["termo"])
+        posicao = texto.find(padrao)
+        while posicao != -1:
+            ocorrencias += 1
+            posicao = texto.find(padrao, posicao + 1)
+    return ocorrencias
+
+
+def benchmark_anotador(quantidade, paragrafos=2_000):
+    dados = gerar_glossario_sintetico(quantidade)
+    inicio = time.perf_counter()
+    anotador = AnotadorTermos(dados)
+    print(f"[anotador] {quantidade} termos - autômato montado em {time.perf_counter() - inicio:.2f}s")
+
+    texto = "".join(_documento_sintetico(dados, paragrafos))
+    inicio = time.perf_counter()
+    ocorrencias = anotador.anotar(texto)
+    tempo = time.perf_counter() - inicio
+    print(f"  Aho-Corasick: {len(texto) / tempo / 1e6:.2f} M caracteres/s "
+          f"({len(texto)} caracteres, {len(ocorrencias)} ocorrências)")
+
+    # A ingênua cresce com o número de termos: mede numa amostra e extrapola
+    amostra = dados[:200]
+    inicio = time.perf_counter()
+    busca_termo_a_termo(amostra, texto)
+    estimado = (time.perf_counter() - inicio) * len(dados) / len(amostra)
+    print(f"  termo a termo (estimado p/ {quantidade} termos): {len(texto) / estimado / 1e6:.3f} M caracteres/s "
+          f"-> {estimado / tempo:.0f}x mais lento")
+
+    # Memória do fluxo: o documento 10x maior nunca fica inteiro em memória
+    def anotar_em_fluxo(multiplicador):
+        for _ in anotador.anotar_fluxo(_documento_sintetico(dados, paragrafos * multiplicador)):
+            pass
+    for multiplicador in (1, 10):
+        _, pico = medir_memoria(lambda: anotar_em_fluxo(multiplicador))
+        print(f"  fluxo com {paragrafos * multiplicador} parágrafos: pico de {pico:.0f} KB")
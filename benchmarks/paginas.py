@@ -0,0 +1,148 @@
+import json
+import pickle
+import time
+import tracemalloc
+
+import pandas as pd
+import plotly.tools
+import plotly.utils
+import pyarrow as pa
+
+from benchmarks.comum import AREAS, gerar_glossario_sintetico, importar_apps, medir
+from estatisticas import EstatisticasGlossario
+from instrumentacao import METRICAS, etapa, iniciar_execucao
+
+
+def filtro_original(df, area_selecionada, fonte_selecionada, termo_busca):
+    # Filtro original do exibir_explorar_termos do main.py
+    df_filtrado = df.copy()
+    if area_selecionada != "Todas": df_filtrado = df_filtrado[df_filtrado['area'] == area_selecionada]
+    if fonte_selecionada != "Todas": df_filtrado = df_filtrado[df_filtrado['fonte'] == fonte_selecionada]
+    if termo_busca: df_filtrado = df_filtrado[df_filtrado['termo'].str.contains(termo_busca, case=False)]
+    return df_filtrado
+
+
+def memoria_dataframe(*tabelas):
+    return sum(tabela.memory_usage(deep=True).sum() for tabela in tabelas) / 1e6
+
+
+def benchmark_dataframe(quantidade, repeticoes):
+    # DataFrame de objetos Python (antes) x colunar tipado (main.montar_tabelas)
+    _, app_pandas = importar_apps()
+    dados = gerar_glossario_sintetico(quantidade)
+    colunas = app_pandas.COLUNAS_TEXTO + app_pandas.COLUNAS_CATEGORIAS + ["data"] + app_pandas.COLUNAS_LISTAS
+    antigo = pd.DataFrame(dados).reindex(columns=colunas).fillna({"detalhes": ""})
+    inicio = time.perf_counter()
+    novo, listas = app_pandas.montar_tabelas(dados)
+    print(f"[dataframe] {quantidade} termos - colunar montado em {time.perf_counter() - inicio:.2f}s")
+    print(f"  {'memória objetos Python':26} {memoria_dataframe(antigo):.1f} MB")
+    print(f"  {'memória colunar + listas':26} {memoria_dataframe(novo, *listas.values()):.1f} MB")
+
+    # Renderização da lista do Explorar filtrada por área (todas as linhas visitadas)
+    filtrado_antigo = antigo[antigo["area"] == AREAS[0]]
+    filtrado_novo = novo[novo["area"] == AREAS[0]]
+
+    def iterrows():
+        for _, termo in filtrado_antigo.iterrows():
+            (termo["termo"], termo["definicao"], termo["area"], termo["fonte"])
+
+    def itertuples():
+        for termo in filtrado_novo[["termo", "definicao", "area", "fonte"]].itertuples(index=False):
+            (termo.termo, termo.definicao, termo.area, termo.fonte)
+
+    vezes = max(3, repeticoes // 20)
+    for rotulo, funcao in ((f"iterrows ({len(filtrado_antigo)} linhas)", iterrows),
+                           (f"itertuples ({len(filtrado_novo)} linhas)", itertuples)):
+        resultado = medir(funcao, vezes)
+        print(f"  {rotulo:26} p50={resultado['p50_ms']:.1f}ms")
+
+    # Filtros: cópia + três seleções + regex (antes) x máscara única literal
+    busca = novo["termo"].iloc[quantidade // 2].split()[2]
+    filtros = {
+        "área (antes)": lambda: filtro_original(antigo, AREAS[0], "Todas", ""),
+        "área": lambda: app_pandas.calcular_filtro(novo, AREAS[0], "Todas", ""),
+        "área + busca (antes)": lambda: filtro_original(antigo, AREAS[0], "Todas", busca),
+        "área + busca": lambda: app_pandas.calcular_filtro(novo, AREAS[0], "Todas", busca),
+    }
+    for rotulo, funcao in filtros.items():
+        resultado = medir(funcao, vezes)
+        print(f"  {'filtro ' + rotulo:26} p50={resultado['p50_ms']:.2f}ms")
+
+
+def _memoria_alocada():
+    # Python (tracemalloc) + buffers do Arrow (colunas string[pyarrow]), em bytes
+    return tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes()
+
+
+def benchmark_sessoes(quantidade, sessoes=(1, 10, 100, 500), sessoes_copia=(1, 10)):
+    # Memória por sessão simultânea no main.py: cache_data (cada chamada
+    # desserializa uma cópia do df e das listas) x tabelas compartilhadas
+    # com cache_resource (cada sessão recebe vistas rasas)
+    _, app_pandas = importar_apps()
+    tabelas = app_pandas.montar_tabelas(gerar_glossario_sintetico(quantidade), versao="sessoes")
+    serializado = pickle.dumps(tabelas)  # o que o cache_data guarda e desserializa a cada chamada
+    area = tabelas[0]["area"].iloc[0]
+
+    def execucao(carregar):
+        # O que uma sessão mantém durante uma execução da página
+        df, listas = carregar()
+        return df, listas, df.iloc[app_pandas.calcular_filtro(df, area, "Todas", "")[:20]]
+
+    # Fora do "streamlit run" o cache_resource não guarda nada: a função
+    # devolve diretamente a cópia única
+    compartilhadas = app_pandas.tabelas_compartilhadas
+    app_pandas.tabelas_compartilhadas = lambda: tabelas
+    print(f"[sessões] {quantidade} termos, {memoria_dataframe(tabelas[0], *tabelas[1].values()):.1f} MB de tabelas")
+    try:
+        for rotulo, carregar, quantidades in (
+                ("cache_data (cópia)", lambda: pickle.loads(serializado), sessoes_copia),
+                ("cache_resource (vistas)", app_pandas.carregar_dados_juridicos, sessoes)):
+            for quantidade_sessoes in quantidades:
+                tracemalloc.start()
+                antes = _memoria_alocada()
+                ativas = [execucao(carregar) for _ in range(quantidade_sessoes)]
+                total = _memoria_alocada() - antes
+                tracemalloc.stop()
+                print(f"  {rotulo:26} {quantidade_sessoes:4} sessões: {total / 1e6:8.1f} MB "
+                      f"({total / quantidade_sessoes / 1024:.0f} KB por sessão)")
+                del ativas
+    finally:
+        app_pandas.tabelas_compartilhadas = compartilhadas
+
+
+def serializar_grafico(figura):
+    # O que o st.plotly_chart faz com a figura a cada execução da página
+    figura = plotly.tools.return_figure_from_figure_or_data(figura, validate_figure=True)
+    return json.dumps(figura, cls=plotly.utils.PlotlyJSONEncoder)
+
+
+def benchmark_grafico(quantidade, repeticoes):
+    # Gráfico de áreas da página inicial: montado a cada execução (antes) x
+    # spec em cache por versão, só convertido em figura e serializado
+    _, app_pandas = importar_apps()
+    estatisticas = EstatisticasGlossario(gerar_glossario_sintetico(quantidade))
+    spec = app_pandas.criar_grafico_areas(estatisticas).to_json()
+    vezes = max(5, repeticoes // 10)
+    print(f"[gráfico] {estatisticas.quantidade_areas} áreas, spec de {len(spec) / 1024:.1f} KB")
+    for rotulo, funcao in (("montado a cada execução", lambda: serializar_grafico(app_pandas.criar_grafico_areas(estatisticas))),
+                           ("spec em cache", lambda: serializar_grafico(app_pandas.figura_do_spec(spec)))):
+        resultado = medir(funcao, vezes)
+        print(f"  {rotulo:26} p50={resultado['p50_ms']:.2f}ms p95={resultado['p95_ms']:.2f}ms")
+
+
+def benchmark_instrumentacao(repeticoes):
+    # Custo de uma etapa cronometrada, com e sem a execução atual registrando
+    @etapa("benchmark")
+    def vazia():
+        pass
+
+    def cem_chamadas():
+        for _ in range(100):
+            vazia()
+
+    sem = medir(cem_chamadas, repeticoes)
+    iniciar_execucao()
+    com = medir(lambda: (iniciar_execucao(), cem_chamadas()), repeticoes)
+    print(f"[instrumentação] custo por etapa: {sem['p50_ms'] * 10:.2f}µs (só histograma), "
+          f"{com['p50_ms'] * 10:.2f}µs (com detalhamento da execução)")
+    METRICAS.limpar()
@@ -0,0 +1,163 @@
+import csv
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from armazenamento import BancoGlossario
+from benchmarks.comum import AREAS, gerar_glossario_sintetico, medir, medir_memoria
+from busca import IndicePrefixos, IndiceTermos, IndiceTrigramas
+from estatisticas import EstatisticasGlossario
+from importacao import ImportadorGlossario, exportar_glossario
+from modelos import Termo
+from snapshot import SnapshotGlossario, compilar_snapshot
+from versoes import GerenciadorVersoes
+
+
+def benchmark_armazenamento(quantidade, repeticoes):
+    dados = gerar_glossario_sintetico(quantidade)
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / "glossario.db"
+        inicio = time.perf_counter()
+        banco = BancoGlossario(caminho)
+        banco.criar_esquema()
+        banco.salvar_termos(dados)
+        print(f"[sqlite] {quantidade} termos - banco gerado em {time.perf_counter() - inicio:.2f}s")
+
+        # Abertura a frio: nova conexão e a primeira página de resultados
+        def abrir_e_listar():
+            BancoGlossario(caminho).buscar(limite=20)
+        consultas = {
+            "abertura + 1ª página": abrir_e_listar,
+            "obter por nome": lambda: banco.obter(dados[quantidade // 2]["termo"]),
+            "1ª página por área": lambda: banco.buscar(area=AREAS[0], limite=20),
+            "contagem por área": lambda: banco.contar(area=AREAS[0]),
+        }
+        for nome, funcao in consultas.items():
+            resultado = medir(funcao, repeticoes)
+            print(f"  {nome:26} p50={resultado['p50_ms']:.3f}ms p95={resultado['p95_ms']:.3f}ms")
+
+
+def benchmark_snapshot(quantidade, repeticoes):
+    dados = gerar_glossario_sintetico(quantidade)
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_json = Path(pasta) / "glossario.json"
+        caminho_json.write_text(json.dumps(dados, ensure_ascii=False), encoding="utf-8")
+        caminho = Path(pasta) / "glossario.snap"
+        inicio = time.perf_counter()
+        compilar_snapshot(dados, caminho)
+        print(f"[snapshot] {quantidade} termos - compilado em {time.perf_counter() - inicio:.2f}s "
+              f"({caminho.stat().st_size / 1e6:.1f} MB)")
+
+        consultas = {
+            "abertura via mmap": lambda: SnapshotGlossario(caminho),
+            "abertura + leitura": lambda: SnapshotGlossario(caminho)[quantidade // 2],
+        }
+        for rotulo, funcao in consultas.items():
+            resultado = medir(funcao, repeticoes)
+            print(f"  {rotulo:26} p50={resultado['p50_ms']:.3f}ms p95={resultado['p95_ms']:.3f}ms")
+
+        def carregar_json():
+            with open(caminho_json, encoding="utf-8") as arquivo:
+                json.load(arquivo)
+        resultado = medir(carregar_json, 3)
+        print(f"  {'carga JSON de referência':26} p50={resultado['p50_ms']:.1f}ms")
+
+
+def _gravar_dump(dados, caminho, semente=5):
+    # Dump de uma fonte oficial: ~10% dos termos repetidos com outra caixa e sinônimos novos
+    rng = random.Random(semente)
+    campos = ["termo", "definicao", "fonte", "jurisprudencia", "area", "exemplo", "sinonimos", "relacionados"]
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        escritor = csv.DictWriter(arquivo, campos, extrasaction="ignore") if caminho.suffix == ".csv" else None
+        if escritor:
+            escritor.writeheader()
+        for termo in dados:
+            registros = [dict(termo)]
+            if rng.random() < 0.1:
+                registros.append({**termo, "termo": termo["termo"].upper(), "sinonimos": [f"Sinônimo {rng.random():.6f}"]})
+            for registro in registros:
+                if escritor:
+                    escritor.writerow({**registro, "sinonimos": "; ".join(registro["sinonimos"]),
+                                       "relacionados": "; ".join(registro["relacionados"])})
+                else:
+                    arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+
+def benchmark_importacao(quantidade):
+    dados = gerar_glossario_sintetico(quantidade)
+    with tempfile.TemporaryDirectory() as pasta:
+        pasta = Path(pasta)
+
+        def importar(caminho, nome_banco):
+            banco = BancoGlossario(pasta / nome_banco)
+            banco.criar_esquema()
+            return banco, ImportadorGlossario(banco).importar([caminho])
+
+        print(f"[importação] dump com {quantidade} termos (+~10% repetidos)")
+        for formato in ("csv", "jsonl"):
+            caminho = pasta / f"dump.{formato}"
+            _gravar_dump(dados, caminho)
+            banco, relatorio = importar(caminho, f"{formato}.db")
+            print(f"  {formato.upper():6} {relatorio.resumo()}")
+        inicio = time.perf_counter()
+        exportar_glossario(banco, pasta / "glossario.json")
+        print(f"  {'exportar glossario.json':26} {time.perf_counter() - inicio:.2f}s")
+
+        # Memória constante: com arquivos maiores que um bloco, o pico não cresce com o arquivo
+        for parcela in (quantidade // 2, quantidade):
+            caminho = pasta / f"parcela-{parcela}.jsonl"
+            _gravar_dump(dados[:parcela], caminho)
+            _, pico = medir_memoria(lambda: importar(caminho, f"parcela-{parcela}.db"))
+            print(f"  {parcela:7} termos: pico de {pico / 1024:.1f} MB")
+
+
+def benchmark_versoes(quantidade):
+    dados = gerar_glossario_sintetico(quantidade)
+    with tempfile.TemporaryDirectory() as pasta:
+        pasta = Path(pasta)
+        origem = pasta / "glossario.json"
+        origem.write_text(json.dumps(dados, ensure_ascii=False), encoding="utf-8")
+        banco = BancoGlossario(pasta / "glossario.db")
+        banco.criar_esquema()
+
+        inicio = time.perf_counter()
+        versoes = GerenciadorVersoes(banco, origem=origem, pasta=pasta, intervalo=3600)
+        versao = versoes.atual()
+        indices = (versao.indice_aproximado, versao.indice_prefixos, versao.indice_termos, versao.estatisticas)
+        print(f"[versões] {quantidade} termos - primeira versão com índices em {time.perf_counter() - inicio:.2f}s")
+
+        # Edição típica: 10 definições alteradas e 10 termos novos
+        for termo in dados[:10]:
+            termo["definicao"] += " (revisada)"
+        dados.extend(gerar_glossario_sintetico(10, semente=7))
+        for i, termo in enumerate(dados[-10:]):
+            termo["termo"] += f" novo {i}"
+        origem.write_text(json.dumps(dados, ensure_ascii=False), encoding="utf-8")
+
+        inicio = time.perf_counter()
+        versoes._recarregar()
+        print(f"  {'recarga incremental':26} {time.perf_counter() - inicio:.2f}s "
+              f"(banco + snapshot + índices, versão {versoes.atual().versao})")
+        nova = versoes.atual().dados
+        inicio = time.perf_counter()
+        for classe in (IndiceTrigramas, IndicePrefixos, IndiceTermos, EstatisticasGlossario):
+            classe(nova)
+        print(f"  {'índices do zero (só eles)':26} {time.perf_counter() - inicio:.2f}s")
+        print(f"  {'versão anterior intacta':26} {len(versao.dados)} termos, "
+              f"{len(indices[2].por_nome)} no índice por nome")
+
+
+def benchmark_termo(quantidade):
+    # Memória dos registros como o app os materializa (lidos do snapshot,
+    # cada string um objeto próprio): dict por termo x Termo com __slots__
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / "glossario.snap"
+        compilar_snapshot(gerar_glossario_sintetico(quantidade), caminho)
+        print(f"[termo] {quantidade} termos materializados do snapshot")
+        for rotulo, snapshot in (("dict", SnapshotGlossario(caminho)),
+                                 ("Termo (__slots__)", SnapshotGlossario(caminho, Termo.de_dict))):
+            registros, memoria = medir_memoria(lambda: list(snapshot))
+            print(f"  {rotulo:26} {memoria / 1024:8.1f} MB  {memoria * 1024 / quantidade:6.0f} bytes/termo")
+            del registros
@@ -0,0 +1,180 @@
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+import requests
+
+from api import APIGlossario, criar_servidor
+from armazenamento import BancoGlossario
+from benchmarks.comum import AREAS, gerar_glossario_sintetico, medir
+from ingestao import IngestorNoticias
+from integracoes import ClienteHTTP, buscar_json, consultar_fontes
+from tests.servidores import FeedSimulado, ServidorSimulado
+from versoes import GerenciadorVersoes
+
+
+def benchmark_fontes_paralelas(repeticoes):
+    latencias = {"stf": 0.30, "stj": 0.10, "noticias": 0.20}
+    with ServidorSimulado() as servidor:
+        consultas = {fonte: (lambda f=fonte, a=atraso: buscar_json(f"{servidor.url}/{f}?atraso={a}"))
+                     for fonte, atraso in latencias.items()}
+
+        def sequencial():
+            for consulta in consultas.values():
+                consulta()
+
+        def paralelo():
+            list(consultar_fontes(consultas))
+
+        print(f"[fontes] latências simuladas: {latencias}")
+        for rotulo, funcao in (("sequencial (antes)", sequencial), ("paralelo", paralelo)):
+            resultado = medir(funcao, repeticoes)
+            print(f"  {rotulo:26} p50={resultado['p50_ms']:.0f}ms p95={resultado['p95_ms']:.0f}ms")
+
+        # Uma fonte travada não segura a página além do próprio prazo
+        consultas["stf"] = lambda: buscar_json(f"{servidor.url}/stf?atraso=5")
+        inicio = time.perf_counter()
+        erros = [fonte for fonte, _, erro in consultar_fontes(consultas, {"stf": 0.5}) if erro]
+        print(f"  {'STF travado (prazo 0,5s)':26} {(time.perf_counter() - inicio) * 1000:.0f}ms, "
+              f"sem resposta: {erros}")
+
+
+def benchmark_cliente_http(repeticoes):
+    with ServidorSimulado() as servidor:
+        url = f"{servidor.url}/stf"
+        cliente = ClienteHTTP(max_por_host=4)
+
+        # requests.get abre (e fecha) uma conexão TCP a cada chamada
+        resultado = medir(lambda: requests.get(url, timeout=3).json(), repeticoes)
+        print(f"[http] {'requests.get por chamada':26} p50={resultado['p50_ms']:.2f}ms p95={resultado['p95_ms']:.2f}ms")
+        resultado = medir(lambda: cliente.obter_json(url), repeticoes)
+        print(f"  {'cliente com pool':26} p50={resultado['p50_ms']:.2f}ms p95={resultado['p95_ms']:.2f}ms")
+
+        # 32 chamadas concorrentes: o pool limita as conexões simultâneas ao host
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            list(executor.map(lambda _: cliente.obter_json(f"{url}?atraso=0.05"), range(32)))
+        for host, dados in cliente.metricas()["hosts"].items():
+            print(f"  {host}: {dados['requisicoes']} requisições em {dados['conexoes_abertas']} conexões")
+
+        # 503 nas duas primeiras tentativas, sucesso na terceira
+        inicio = time.perf_counter()
+        cliente.obter_json(f"{servidor.url}/instavel?falhas=2")
+        print(f"  {'503 x2 e depois sucesso':26} {(time.perf_counter() - inicio) * 1000:.0f}ms com espera exponencial")
+
+
+def benchmark_ingestao(quantidade, repeticoes):
+    dados = gerar_glossario_sintetico(quantidade)
+    nomes = [termo["termo"] for termo in dados]
+    with tempfile.TemporaryDirectory() as pasta, ServidorSimulado(FeedSimulado) as servidor:
+        banco = BancoGlossario(Path(pasta) / "glossario.db")
+        banco.criar_esquema()
+        banco.salvar_termos(dados)
+        banco.salvar_noticias(nomes[0], [{"titulo": "Notícia inicial", "fonte": "Portal", "data": "2024-01-01"}])
+
+        # Feed lento (50ms por termo) e fila pequena: o agendador tem de esperar
+        ingestor = IngestorNoticias(banco, [f"{servidor.url}/rss?q={{termo}}&atraso=0.05"],
+                                    lambda: nomes, intervalo=3600, trabalhadores=2, tamanho_fila=10,
+                                    cliente=ClienteHTTP(max_por_host=2))
+        # Leituras da página antes e durante a ingestão
+        antes = medir(lambda: banco.noticias(nomes[0]), repeticoes)
+        inicio = time.perf_counter()
+        ingestor.iniciar()
+        time.sleep(0.2)
+        durante = medir(lambda: banco.noticias(nomes[0]), repeticoes)
+        time.sleep(max(0, 2 - (time.perf_counter() - inicio)))
+        ingestor.parar()
+        decorrido = time.perf_counter() - inicio
+
+        metricas = ingestor.metricas
+        print(f"[ingestão] {quantidade} termos, feed com 50ms por termo, fila de 10 - {decorrido:.1f}s")
+        print(f"  {'termos processados':26} {metricas['termos_processados']} "
+              f"({metricas['noticias_novas']} notícias novas, {metricas['erros']} erros)")
+        print(f"  {'maior fila observada':26} {metricas['maior_fila']} "
+              f"(agendador esperou {metricas['espera_fila_s']:.1f}s por vaga)")
+        print(f"  {'leitura da página (antes)':26} p50={antes['p50_ms']:.3f}ms p95={antes['p95_ms']:.3f}ms")
+        print(f"  {'leitura durante ingestão':26} p50={durante['p50_ms']:.3f}ms p95={durante['p95_ms']:.3f}ms")
+
+
+def _cliente_api(porta, caminhos, duracao, cabecalhos):
+    # Um cliente com conexão persistente; roda em outro processo para não
+    # disputar o GIL com o servidor
+    conexao = http.client.HTTPConnection("127.0.0.1", porta)
+    feitas = erros = 0
+    fim = time.perf_counter() + duracao
+    while time.perf_counter() < fim:
+        conexao.request("GET", caminhos[feitas % len(caminhos)], headers=cabecalhos)
+        resposta = conexao.getresponse()
+        resposta.read()
+        erros += resposta.status >= 400
+        feitas += 1
+    conexao.close()
+    return feitas, erros
+
+
+def benchmark_api(quantidade, duracao=3.0, clientes=4):
+    # Teste de carga da API JSON: servidor (um processo, uma CPU) x clientes
+    # em processos separados, todos com keep-alive
+    dados = gerar_glossario_sintetico(quantidade)
+    with tempfile.TemporaryDirectory() as pasta:
+        pasta = Path(pasta)
+        origem = pasta / "glossario.json"
+        origem.write_text(json.dumps(dados, ensure_ascii=False), encoding="utf-8")
+        banco = BancoGlossario(pasta / "glossario.db")
+        banco.criar_esquema()
+        versoes = GerenciadorVersoes(banco, origem=origem, pasta=pasta, intervalo=3600)
+        versao = versoes.atual()
+        # Índices montados antes: a carga mede as respostas, não a construção
+        (versao.indice_relevancia, versao.indice_apelidos, versao.indice_termos, versao.estatisticas)
+        api = APIGlossario(versoes)
+
+        rng = random.Random(3)
+        amostra = rng.sample(dados, 200)
+        caminhos = [f"/termos/{quote(termo['termo'])}" for termo in amostra]
+        caminhos += [f"/termos/{quote(termo['termo'])}/relacionados" for termo in amostra[:50]]
+        caminhos += [f"/termos?busca={quote(termo['termo'].split()[2])}" for termo in amostra[:50]]
+        caminhos += ["/areas"] + [f"/areas/{quote(area)}" for area in AREAS]
+
+        # Custo da primeira resposta de cada URL (montagem + JSON + gzip), sem HTTP
+        cabecalhos = {"Accept-Encoding": "gzip"}
+        for rotulo, lote in (("busca", [c for c in caminhos if "busca=" in c]),
+                             ("termo por nome", caminhos[:200])):
+            inicio = time.perf_counter()
+            for caminho in lote:
+                api.responder("GET", *caminho.partition("?")[::2], cabecalhos)
+            print(f"[api] {quantidade} termos - 1ª resposta ({rotulo}): "
+                  f"{(time.perf_counter() - inicio) / len(lote) * 1000:.2f}ms")
+        for caminho in caminhos:
+            api.responder("GET", *caminho.partition("?")[::2], cabecalhos)
+        etag = dict(api.responder("GET", "/areas", "", cabecalhos)[1])["ETag"]
+
+        servidor = criar_servidor(api, porta=0)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        porta = servidor.server_address[1]
+        with ProcessPoolExecutor(clientes, mp_context=multiprocessing.get_context("spawn")) as executor:
+            list(executor.map(abs, range(clientes)))  # processos já criados antes de medir
+            # Servidor preso a uma CPU (os clientes já existem e não herdam isso)
+            cpus = os.sched_getaffinity(0) if hasattr(os, "sched_setaffinity") else None
+            if cpus:
+                os.sched_setaffinity(0, {min(cpus)})
+            try:
+                for rotulo, extras in (("200 (JSON gzip em cache)", {}),
+                                       ("304 (If-None-Match)", {"If-None-Match": etag})):
+                    futuros = [executor.submit(_cliente_api, porta, caminhos if not extras else ["/areas"],
+                                               duracao, {**cabecalhos, **extras}) for _ in range(clientes)]
+                    resultados = [futuro.result() for futuro in futuros]
+                    feitas = sum(r[0] for r in resultados)
+                    erros = sum(r[1] for r in resultados)
+                    print(f"  {rotulo:26} {feitas / duracao:8.0f} req/s  ({clientes} clientes, {erros} erros)")
+            finally:
+                if cpus:
+                    os.sched_setaffinity(0, cpus)
+        servidor.shutdown()
+        servidor.server_close()
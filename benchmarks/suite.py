@@ -0,0 +1,133 @@
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.comum import AREAS, gerar_glossario_sintetico, importar_apps, medir, medir_memoria
+from benchmarks.paginas import serializar_grafico
+from busca import IndiceApelidos, IndiceRelevancia, IndiceSubstring, IndiceTermos
+from estatisticas import EstatisticasGlossario
+from modelos import Termo
+from snapshot import SnapshotGlossario, compilar_snapshot
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def executar_suite(tamanhos, repeticoes):
+    # Mede os caminhos quentes das páginas para cada tamanho de glossário:
+    # latência (p50/p95/p99/max) e pico de memória Python por chamada
+    app, app_pandas = importar_apps()
+    resultados = []
+    for tamanho in tamanhos:
+        # Menos repetições nos corpora grandes, para a suíte terminar em minutos
+        vezes = max(5, min(repeticoes, 2_000_000 // tamanho))
+        dados = gerar_glossario_sintetico(tamanho)
+        nome = dados[tamanho // 2]["termo"]
+        busca = nome.split()[2].lower()
+        sinonimo = dados[tamanho // 2]["sinonimos"][0].upper()
+        area = AREAS[0]
+        print(f"[suíte] {tamanho} termos, {vezes} repetições")
+
+        with tempfile.TemporaryDirectory() as pasta:
+            compilar_snapshot(dados, Path(pasta) / "glossario.snap")
+            snapshot = SnapshotGlossario(Path(pasta) / "glossario.snap", Termo.de_dict)
+
+            # Estruturas montadas na carga (uma vez por processo)
+            termos, memoria_termos = medir_memoria(lambda: list(snapshot))
+            indice, memoria_indice = medir_memoria(lambda: IndiceTermos(snapshot))
+            relevancia, memoria_relevancia = medir_memoria(lambda: IndiceRelevancia(snapshot))
+            apelidos, memoria_apelidos = medir_memoria(lambda: IndiceApelidos(snapshot))
+            trechos, memoria_trechos = medir_memoria(lambda: IndiceSubstring(snapshot))
+            estatisticas, memoria_estatisticas = medir_memoria(lambda: EstatisticasGlossario(snapshot))
+            # Colunas Arrow ficam fora do alocador do Python: memória medida pelo pandas
+            df, listas = app_pandas.montar_tabelas(dados)
+            memoria_df = sum(tabela.memory_usage(deep=True).sum() for tabela in (df, *listas.values())) / 1024
+            indice_df, memoria_indice_df = medir_memoria(lambda: IndiceTermos(df.to_dict("records")))
+            spec = app_pandas.criar_grafico_areas(estatisticas).to_json()
+            carga = {
+                "streamlit_app: registros Termo": memoria_termos,
+                "streamlit_app: IndiceTermos": memoria_indice,
+                "streamlit_app: IndiceRelevancia": memoria_relevancia,
+                "streamlit_app: IndiceApelidos": memoria_apelidos,
+                "streamlit_app: IndiceSubstring": memoria_trechos,
+                "streamlit_app: EstatisticasGlossario": memoria_estatisticas,
+                "main: DataFrame": memoria_df,
+                "main: IndiceTermos": memoria_indice_df,
+            }
+            for rotulo, memoria in carga.items():
+                resultados.append({"tamanho": tamanho, "caminho": f"carga {rotulo}", "memoria_kb": memoria})
+
+            caminhos = {
+                "streamlit_app: busca por substring":
+                    lambda: (trechos._cache.clear(), trechos._cache_fragmentos.clear(), trechos.buscar_ids(busca)),
+                "streamlit_app: busca por substring + área":
+                    lambda: (trechos._cache.clear(), trechos._cache_fragmentos.clear(), trechos.buscar_ids(busca, area)),
+                "streamlit_app: busca por relevância":
+                    lambda: (relevancia._cache.clear(), relevancia.ranquear(busca)),
+                "streamlit_app: busca por relevância + área":
+                    lambda: (relevancia._cache.clear(), relevancia.ranquear(busca, area)),
+                "streamlit_app: filtrar_por_area": lambda: app.filtrar_por_area(termos, area),
+                "streamlit_app: áreas únicas": estatisticas.areas,
+                "streamlit_app: métricas da página inicial": lambda: (
+                    estatisticas.total, estatisticas.quantidade_areas,
+                    estatisticas.quantidade_fontes, estatisticas.data_mais_recente),
+                "streamlit_app: apelido exato": lambda: apelidos.resolver(sinonimo),
+                "streamlit_app: página do termo":
+                    lambda: (indice.obter(nome), indice.obter_relacionados(nome)),
+                "main: filtro pandas": lambda: app_pandas.filtrar_termos(df, area, "Todas", busca),
+                "main: página do termo": lambda: indice_df.obter(nome),
+                "main: gráfico de áreas (spec em cache)": lambda: serializar_grafico(app_pandas.figura_do_spec(spec)),
+            }
+            for rotulo, funcao in caminhos.items():
+                tempos = medir(funcao, vezes)
+                _, memoria = medir_memoria(funcao)
+                resultados.append({"tamanho": tamanho, "caminho": rotulo, "repeticoes": vezes,
+                                   **tempos, "memoria_kb": memoria})
+                print(f"  {rotulo:46} p50={tempos['p50_ms']:8.3f}ms p95={tempos['p95_ms']:8.3f}ms "
+                      f"memória={memoria:9.1f}KB")
+
+    return {
+        "meta": {
+            "commit": _commit_atual(),
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "pandas": pd.__version__,
+        },
+        "resultados": resultados,
+    }
+
+
+# Diferenças absolutas abaixo disto são ruído de medição, não regressão
+RUIDO_MINIMO = {"p50_ms": 0.05, "memoria_kb": 16}
+
+
+def comparar_resultados(anterior, atual, tolerancia=1.2):
+    # Compara p50 e memória com uma execução anterior (ex.: outro commit)
+    base = {(r["tamanho"], r["caminho"]): r for r in anterior["resultados"]}
+    print(f"[comparação] {anterior['meta'].get('commit')} -> {atual['meta'].get('commit')}")
+    regressoes = 0
+    for resultado in atual["resultados"]:
+        antigo = base.get((resultado["tamanho"], resultado["caminho"]))
+        if antigo is None:
+            continue
+        for chave in ("p50_ms", "memoria_kb"):
+            if chave not in resultado or not antigo.get(chave):
+                continue
+            razao = resultado[chave] / antigo[chave]
+            if razao > tolerancia and resultado[chave] - antigo[chave] > RUIDO_MINIMO[chave]:
+                regressoes += 1
+                print(f"  REGRESSÃO {resultado['tamanho']:>8} {resultado['caminho']:46} "
+                      f"{chave}: {antigo[chave]:.3f} -> {resultado[chave]:.3f} ({razao:.2f}x)")
+    print(f"  {regressoes} regressão(ões) acima de {tolerancia:.1f}x")
+    return regressoes
@@ -0,0 +1,662 @@
+import math
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from itertools import chain
+
+# Tokens são sequências alfanuméricas do texto já normalizado
+PADRAO_TOKEN = re.compile(r"\w+")
+
+# Campos considerados pela busca por substring (os mesmos do filtro do banco)
+CAMPOS_BUSCA = ("termo", "definicao")
+
+# Pesos dos campos no ranqueamento por relevância (BM25F): casar no nome ou
+# num sinônimo vale mais do que casar no texto da definição ou do exemplo
+PESOS_RELEVANCIA = {"termo": 4.0, "sinonimos": 3.0, "definicao": 1.5, "exemplo": 0.75, "jurisprudencia": 0.5}
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Tokens da consulta com ao menos este tamanho também casam como prefixo ("recurso" -> "recursos")
+TAMANHO_MINIMO_PREFIXO = 3
+
+
+class _TabelaSemAcentos(dict):
+    # Tabela do str.translate que remove marcas combinantes (acentos),
+    # preenchida sob demanda: cada caractere é classificado uma única vez
+    def __missing__(self, codigo):
+        valor = self[codigo] = None if unicodedata.combining(chr(codigo)) else codigo
+        return valor
+
+
+_SEM_ACENTOS = _TabelaSemAcentos()
+
+
+def normalizar(texto):
+    # Remove acentos e diferença de caixa: "Ação" -> "acao"
+    decomposto = unicodedata.normalize("NFKD", texto)
+    if not decomposto.isascii():
+        decomposto = decomposto.translate(_SEM_ACENTOS)
+    return decomposto.casefold()
+
+
+def tokenizar(texto):
+    return PADRAO_TOKEN.findall(normalizar(texto))
+
+
+def trigramas(texto):
+    # Trigramas com bordas marcadas, para valorizar início e fim das palavras
+    texto = f"  {texto} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def distancia_edicao(a, b, limite):
+    # Levenshtein com corte: só calcula a faixa de largura 2*limite+1 em torno
+    # da diagonal e devolve limite + 1 assim que a distância o ultrapassa
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+    fora = limite + 1
+    anterior = [j if j <= limite else fora for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        inicio = max(1, i - limite)
+        fim = min(len(b), i + limite)
+        atual = [fora] * (len(b) + 1)
+        atual[0] = i if i <= limite else fora
+        menor = atual[0]
+        for j in range(inicio, fim + 1):
+            valor = min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (ca != b[j - 1]))
+            atual[j] = valor
+            if valor < menor:
+                menor = valor
+        if menor > limite:
+            return fora
+        anterior = atual
+    return min(anterior[-1], fora)
+
+
+class IndiceTrigramas:
+    # Busca tolerante a erros de digitação sobre nomes e sinônimos.
+    # Os trigramas selecionam poucos candidatos; só eles passam pelo
+    # cálculo de distância de edição.
+
+    def __init__(self, dados):
+        self.dados = dados
+        self.entradas = []
+        postings = {}
+        for doc_id, termo in enumerate(dados):
+            nomes = [termo["termo"], *termo.get("sinonimos", [])]
+            for nome in dict.fromkeys(normalizar(n) for n in nomes):
+                entrada_id = len(self.entradas)
+                self.entradas.append((nome, doc_id))
+                for trigrama in trigramas(nome):
+                    postings.setdefault(trigrama, []).append(entrada_id)
+        self.postings = postings
+        self.removidas = 0
+
+    def atualizado(self, dados, alterados):
+        # Nova versão do índice para "dados", reindexando só os doc_ids
+        # alterados ou novos. Entradas antigas desses documentos viram lápides
+        # (None); listas de postings são copiadas apenas quando tocadas, então
+        # a versão anterior continua válida para quem ainda a usa.
+        alterados = set(alterados)
+        entradas = [None if entrada is not None and entrada[1] in alterados else entrada
+                    for entrada in self.entradas]
+        removidas = self.removidas + sum(1 for a, b in zip(self.entradas, entradas) if a is not b)
+        if removidas > len(entradas) // 4:
+            return IndiceTrigramas(dados)
+
+        novo = object.__new__(IndiceTrigramas)
+        novo.dados = dados
+        novo.entradas = entradas
+        novo.postings = dict(self.postings)
+        novo.removidas = removidas
+        copiadas = set()
+        for doc_id in sorted(alterados):
+            termo = dados[doc_id]
+            for nome in dict.fromkeys(normalizar(n) for n in [termo["termo"], *termo.get("sinonimos", [])]):
+                entrada_id = len(entradas)
+                entradas.append((nome, doc_id))
+                for trigrama in trigramas(nome):
+                    if trigrama not in copiadas:
+                        copiadas.add(trigrama)
+                        novo.postings[trigrama] = list(novo.postings.get(trigrama, ()))
+                    novo.postings[trigrama].append(entrada_id)
+        return novo
+
+    def sugerir(self, busca, limite=10, max_candidatos=200):
+        consulta = normalizar(busca).strip()
+        if not consulta:
+            return []
+        max_distancia = min(3, max(1, len(consulta) // 5))
+
+        # Cada edição destrói no máximo três trigramas da consulta: um nome
+        # próximo compartilha ao menos len(grams) - 3k deles. Trigramas muito
+        # comuns são ignorados na contagem e descontados do mínimo exigido.
+        grams = trigramas(consulta)
+        minimo = len(grams) - 3 * max_distancia
+        comum = max(1000, len(self.entradas) // 20)
+        listas = sorted((self.postings.get(g, ()) for g in grams), key=len)
+        while listas and len(listas[-1]) > comum and minimo > 1:
+            listas.pop()
+            minimo -= 1
+        contagem = Counter(chain.from_iterable(listas))
+        minimo = max(1, minimo)
+        candidatos = [e for e, n in contagem.items() if n >= minimo]
+        candidatos.sort(key=lambda e: (-contagem[e], e))
+
+        melhores = {}
+        verificados = 0
+        for entrada_id in candidatos:
+            entrada = self.entradas[entrada_id]
+            if entrada is None:
+                continue
+            nome, doc_id = entrada
+            if abs(len(nome) - len(consulta)) > max_distancia:
+                continue
+            verificados += 1
+            if verificados > max_candidatos:
+                break
+            distancia = distancia_edicao(consulta, nome, max_distancia)
+            if distancia <= max_distancia and distancia < melhores.get(doc_id, max_distancia + 1):
+                melhores[doc_id] = distancia
+
+        ordenados = sorted(melhores, key=lambda d: (melhores[d], d))
+        return [(self.dados[doc_id], melhores[doc_id]) for doc_id in ordenados[:limite]]
+
+
+class IndicePrefixos:
+    # Autocompletar por prefixo: nomes e sinônimos normalizados em um vetor
+    # ordenado, consultado com busca binária (sem varrer o glossário)
+
+    def __init__(self, dados):
+        self.dados = dados
+        entradas = set()
+        for doc_id, termo in enumerate(dados):
+            for nome in [termo["termo"], *termo.get("sinonimos", [])]:
+                entradas.add((normalizar(nome), doc_id))
+        entradas = sorted(entradas)
+        self.chaves = [chave for chave, _ in entradas]
+        self.doc_ids = [doc_id for _, doc_id in entradas]
+
+    def atualizado(self, dados, alterados):
+        # Nova versão: descarta as entradas dos doc_ids alterados e intercala
+        # as novas (o sort é linear sobre as duas sequências já ordenadas)
+        alterados = set(alterados)
+        entradas = [(chave, doc_id) for chave, doc_id in zip(self.chaves, self.doc_ids)
+                    if doc_id not in alterados]
+        novas = set()
+        for doc_id in alterados:
+            for nome in [dados[doc_id]["termo"], *dados[doc_id].get("sinonimos", [])]:
+                novas.add((normalizar(nome), doc_id))
+        entradas.extend(sorted(novas))
+        entradas.sort()
+        novo = object.__new__(IndicePrefixos)
+        novo.dados = dados
+        novo.chaves = [chave for chave, _ in entradas]
+        novo.doc_ids = [doc_id for _, doc_id in entradas]
+        return novo
+
+    def completar(self, prefixo, limite=5):
+        prefixo = normalizar(prefixo).strip()
+        if not prefixo:
+            return []
+        resultado = []
+        vistos = set()
+        posicao = bisect_left(self.chaves, prefixo)
+        while posicao < len(self.chaves) and self.chaves[posicao].startswith(prefixo):
+            doc_id = self.doc_ids[posicao]
+            if doc_id not in vistos:
+                vistos.add(doc_id)
+                resultado.append(self.dados[doc_id])
+                if len(resultado) == limite:
+                    break
+            posicao += 1
+        return resultado
+
+
+class IndiceTermos:
+    # Acesso direto por nome e grafo de relacionados resolvido na carga.
+    # Relacionados que não existem no glossário ficam marcados como pendentes.
+
+    def __init__(self, dados):
+        self.por_nome = {}
+        for termo in dados:
+            self.por_nome.setdefault(termo["termo"], termo)
+
+        self.relacionados = {}
+        self.pendentes = {}
+        for nome in self.por_nome:
+            self._resolver(nome)
+
+    def _resolver(self, nome):
+        links = tuple((rel, rel in self.por_nome) for rel in self.por_nome[nome].get("relacionados", []))
+        self.relacionados[nome] = links
+        faltando = [rel for rel, existe in links if not existe]
+        if faltando:
+            self.pendentes[nome] = faltando
+        else:
+            self.pendentes.pop(nome, None)
+
+    def atualizado(self, dados, alterados):
+        # Nova versão: substitui os termos alterados e resolve de novo os
+        # links que apontavam para nomes que passaram a existir
+        novo = object.__new__(IndiceTermos)
+        novo.por_nome = dict(self.por_nome)
+        novo.relacionados = dict(self.relacionados)
+        novo.pendentes = dict(self.pendentes)
+        nomes = []
+        for doc_id in alterados:
+            termo = dados[doc_id]
+            novo.por_nome[termo["termo"]] = termo
+            nomes.append(termo["termo"])
+        chegaram = set(nomes) - set(self.por_nome)
+        if chegaram:
+            nomes += [nome for nome, faltando in self.pendentes.items() if chegaram.intersection(faltando)]
+        for nome in nomes:
+            novo._resolver(nome)
+        return novo
+
+    def obter(self, nome):
+        return self.por_nome.get(nome)
+
+    def obter_relacionados(self, nome):
+        # Lista de (nome_relacionado, existe_no_glossario)
+        return self.relacionados.get(nome, ())
+
+
+class IndiceApelidos:
+    # Nome, sinônimos e abreviações normalizados -> doc_ids dos termos
+    # canônicos ("hc" -> Habeas Corpus, "ms" -> Mandado de Segurança).
+    # A consulta exata é um único acesso ao dict, sem percorrer as listas.
+
+    def __init__(self, dados):
+        self.dados = dados
+        self.por_apelido = {}
+        for doc_id, termo in enumerate(dados):
+            self._incluir(doc_id, termo)
+
+    @staticmethod
+    def _chaves(termo):
+        return dict.fromkeys(normalizar(nome).strip() for nome in [termo["termo"], *termo.get("sinonimos", [])])
+
+    def _incluir(self, doc_id, termo):
+        for chave in self._chaves(termo):
+            if chave:
+                self.por_apelido[chave] = self.por_apelido.get(chave, ()) + (doc_id,)
+
+    def atualizado(self, dados, alterados):
+        # Nova versão: refaz só as tuplas dos apelidos que os doc_ids
+        # alterados tinham ou passaram a ter, em ordem de doc_id como na
+        # montagem; as tuplas são trocadas, nunca modificadas
+        alterados = set(alterados)
+        novas = {}
+        for doc_id in sorted(alterados):
+            for chave in self._chaves(dados[doc_id]):
+                novas.setdefault(chave, []).append(doc_id)
+        tocadas = set(novas)
+        for doc_id in alterados:
+            if doc_id < len(self.dados):
+                tocadas.update(self._chaves(self.dados[doc_id]))
+        tocadas.discard("")
+
+        novo = object.__new__(IndiceApelidos)
+        novo.dados = dados
+        novo.por_apelido = dict(self.por_apelido)
+        for chave in tocadas:
+            ids = sorted([d for d in self.por_apelido.get(chave, ()) if d not in alterados] + novas.get(chave, []))
+            if ids:
+                novo.por_apelido[chave] = tuple(ids)
+            else:
+                novo.por_apelido.pop(chave, None)
+        return novo
+
+    def resolver_ids(self, busca):
+        return self.por_apelido.get(normalizar(busca).strip(), ())
+
+    def resolver(self, busca):
+        return [self.dados[doc_id] for doc_id in self.resolver_ids(busca)]
+
+
+class IndiceRelevancia:
+    # Ranqueamento BM25F sobre nome, sinônimos, definição, exemplo e
+    # jurisprudência. Frequências e tamanhos de cada campo são combinados
+    # na carga, e o peso final de cada (token, documento) já fica pronto nos
+    # postings: a consulta só soma pesos dos documentos que têm todos os tokens.
+
+    def __init__(self, dados, pesos=PESOS_RELEVANCIA):
+        self.dados = dados
+        self.pesos = pesos
+        self.areas = []
+        campos = tuple(pesos)
+
+        # 1ª passada: contagem de tokens e tamanho de cada campo
+        contagens = []
+        totais = [0] * len(campos)
+        for termo in dados:
+            self.areas.append(termo.get("area"))
+            por_campo = []
+            for i, campo in enumerate(campos):
+                valor = termo.get(campo) or ""
+                if isinstance(valor, (list, tuple)):
+                    valor = " ".join(valor)
+                tokens = tokenizar(valor)
+                totais[i] += len(tokens)
+                por_campo.append((len(tokens), Counter(tokens)))
+            contagens.append(por_campo)
+        quantidade = len(contagens)
+        medias = [max(1.0, total / quantidade) if quantidade else 1.0 for total in totais]
+        self.tamanho_medio = dict(zip(campos, medias))
+
+        # 2ª passada: frequência ponderada por campo, normalizada pelo tamanho
+        postings = {}
+        for doc_id, por_campo in enumerate(contagens):
+            frequencias = {}
+            for (tamanho, contagem), peso, media in zip(por_campo, pesos.values(), medias):
+                fator = peso / (1 - BM25_B + BM25_B * tamanho / media)
+                for token, vezes in contagem.items():
+                    frequencias[token] = frequencias.get(token, 0.0) + vezes * fator
+            for token, frequencia in frequencias.items():
+                lista = postings.get(token)
+                if lista is None:
+                    lista = postings[token] = (array("I"), array("f"))
+                lista[0].append(doc_id)
+                lista[1].append(frequencia)
+            contagens[doc_id] = None
+
+        # Peso final: idf * saturação da frequência
+        for ids, valores in postings.values():
+            idf = math.log(1 + (quantidade - len(ids) + 0.5) / (len(ids) + 0.5))
+            for i, frequencia in enumerate(valores):
+                valores[i] = idf * frequencia * (BM25_K1 + 1) / (BM25_K1 + frequencia)
+
+        self.postings = postings
+        self.vocabulario = sorted(postings)
+        self._por_area = {}
+        self._cache = {}
+
+    def atualizado(self, dados, alterados):
+        # Reconstrução completa, não incremental: idf e tamanhos médios são
+        # globais e qualquer alteração muda o peso de todos os documentos.
+        # Roda na recarga em segundo plano (VersaoGlossario); até a troca, as
+        # consultas seguem na versão anterior.
+        return IndiceRelevancia(dados, self.pesos)
+
+    def _variantes(self, token):
+        # O próprio token e, se longo o bastante, os que começam com ele
+        if len(token) < TAMANHO_MINIMO_PREFIXO:
+            return [token] if token in self.postings else []
+        inicio = bisect_left(self.vocabulario, token)
+        fim = bisect_left(self.vocabulario, token + "\uffff", inicio)
+        return self.vocabulario[inicio:fim]
+
+    def _docs_da_area(self, area):
+        docs = self._por_area.get(area)
+        if docs is None:
+            docs = self._por_area[area] = frozenset(doc_id for doc_id, valor in enumerate(self.areas) if valor == area)
+        return docs
+
+    def _melhores(self, token):
+        # doc_id -> peso do token; entre as variantes vale a de maior peso.
+        # Cada variante vira dict em C (zip); só os documentos que aparecem
+        # em mais de uma passam pela comparação em Python.
+        melhores = {}
+        for variante in sorted(self._variantes(token), key=lambda v: len(self.postings[v][0]), reverse=True):
+            ids, valores = self.postings[variante]
+            novos = dict(zip(ids, valores))
+            if melhores:
+                for doc_id in melhores.keys() & novos.keys():
+                    if melhores[doc_id] > novos[doc_id]:
+                        novos[doc_id] = melhores[doc_id]
+                melhores.update(novos)
+            else:
+                melhores = novos
+        return melhores
+
+    def ranquear(self, busca, area=None):
+        # doc_ids com todos os tokens da busca, do mais para o menos relevante
+        tokens = list(dict.fromkeys(tokenizar(busca)))
+        if not tokens:
+            return ()
+        chave = (" ".join(tokens), area)
+        if chave in self._cache:
+            return self._cache[chave]
+
+        por_token = []
+        for token in tokens:
+            melhores = self._melhores(token)
+            if not melhores:
+                por_token = []
+                break
+            por_token.append(melhores)
+
+        pontuacoes = {}
+        if len(por_token) == 1 and area is None:
+            pontuacoes = por_token[0]
+        elif por_token:
+            # Interseções em C (conjuntos de chaves); em Python só a soma
+            # dos pesos dos documentos que restaram
+            por_token.sort(key=len)
+            candidatos = por_token[0].keys()
+            for melhores in por_token[1:]:
+                candidatos = candidatos & melhores.keys()
+            if area is not None:
+                candidatos = candidatos & self._docs_da_area(area)
+            primeiro = por_token[0]
+            pontuacoes = {doc_id: primeiro[doc_id] for doc_id in candidatos}
+            for melhores in por_token[1:]:
+                for doc_id in pontuacoes:
+                    pontuacoes[doc_id] += melhores[doc_id]
+        # Empates ficam na ordem do glossário (sort estável, sem tuplas por item)
+        resultado = sorted(pontuacoes)
+        resultado.sort(key=pontuacoes.__getitem__, reverse=True)
+
+        if len(self._cache) > 256:
+            self._cache.clear()
+        # Tupla: o mesmo resultado é devolvido a todas as sessões
+        resultado = self._cache[chave] = tuple(resultado)
+        return resultado
+
+
+class IndiceSubstring:
+    # Busca literal (substring, sem acentos e caixa) em nome ou definição,
+    # a mesma semântica do filtro por busca do banco. Índice invertido por
+    # token (token -> doc_ids) e, sobre o vocabulário, trigramas -> tokens:
+    # cada token da consulta vira os tokens do vocabulário que o contêm, e a
+    # interseção dos postings dá os candidatos. Só eles são conferidos com
+    # str.find no texto normalizado (frases, pontuação, espaços).
+
+    def __init__(self, dados, campos=CAMPOS_BUSCA):
+        self.campos = campos
+        self.areas = []
+        postings = defaultdict(list)
+        partes = []
+        # Trecho [inicio, fim) de cada documento no texto concatenado
+        self._inicios = array("I")
+        self._fins = array("I")
+        posicao = 0
+        for doc_id, termo in enumerate(dados):
+            self.areas.append(termo.get("area"))
+            texto = self._texto_do(termo)
+            self._inicios.append(posicao)
+            self._fins.append(posicao + len(texto))
+            partes.append(texto)
+            posicao += len(texto) + 1
+            for token in set(PADRAO_TOKEN.findall(texto)):
+                postings[token].append(doc_id)
+        # Listas viram arrays de 4 bytes por doc_id depois de montadas
+        self.postings = {token: array("I", ids) for token, ids in postings.items()}
+        # "\0" separa documentos e "\x1f" campos: uma busca nunca casa por cima deles
+        self._texto = "\0".join(partes) + "\0"
+        self.vocabulario = list(self.postings)
+        self.trigramas = {}
+        for token_id, token in enumerate(self.vocabulario):
+            self._indexar_token(self.trigramas, token_id, token)
+        self.descartados = 0
+        self._cache = {}
+        self._cache_fragmentos = {}
+
+    def _texto_do(self, termo):
+        return "\x1f".join(normalizar(termo[campo] or "") for campo in self.campos)
+
+    @staticmethod
+    def _trigramas_token(token):
+        return {token[i:i + 3] for i in range(len(token) - 2)}
+
+    @classmethod
+    def _indexar_token(cls, trigramas_vocabulario, token_id, token, copiadas=None):
+        for trigrama in cls._trigramas_token(token):
+            lista = trigramas_vocabulario.get(trigrama)
+            if lista is None:
+                lista = trigramas_vocabulario[trigrama] = array("I")
+            elif copiadas is not None and trigrama not in copiadas:
+                lista = trigramas_vocabulario[trigrama] = array("I", lista)
+            if copiadas is not None:
+                copiadas.add(trigrama)
+            lista.append(token_id)
+
+    def atualizado(self, dados, alterados):
+        # Nova versão reindexando só os doc_ids alterados ou novos: o texto
+        # deles vai para o fim do texto concatenado (o trecho antigo fica
+        # morto) e só os postings dos tokens que entraram ou saíram desses
+        # documentos são copiados, então a versão anterior segue válida.
+        # Com muito texto morto, monta do zero.
+        alterados = sorted(set(alterados))
+        mortos = self.descartados + sum(self._fins[d] - self._inicios[d] + 1
+                                        for d in alterados if d < len(self._inicios))
+        if mortos > len(self._texto) // 4:
+            return IndiceSubstring(dados, self.campos)
+
+        novo = object.__new__(IndiceSubstring)
+        novo.campos = self.campos
+        novo.areas = list(self.areas)
+        novo.postings = dict(self.postings)
+        novo._inicios = array("I", self._inicios)
+        novo._fins = array("I", self._fins)
+        novo.vocabulario = list(self.vocabulario)
+        novo.trigramas = dict(self.trigramas)
+        novo.descartados = mortos
+        novo._cache = {}
+        novo._cache_fragmentos = {}
+
+        copiados = set()
+        trigramas_copiados = set()
+
+        def postings_de(token):
+            lista = novo.postings.get(token)
+            if lista is None:
+                lista = novo.postings[token] = array("I")
+                novo._indexar_token(novo.trigramas, len(novo.vocabulario), token, trigramas_copiados)
+                novo.vocabulario.append(token)
+            elif token not in copiados:
+                lista = novo.postings[token] = array("I", lista)
+            copiados.add(token)
+            return lista
+
+        partes = [self._texto]
+        posicao = len(self._texto)
+        for doc_id in alterados:
+            termo = dados[doc_id]
+            texto = novo._texto_do(termo)
+            tokens = set(PADRAO_TOKEN.findall(texto))
+            if doc_id < len(self._inicios):
+                antigos = set(PADRAO_TOKEN.findall(self._texto[self._inicios[doc_id]:self._fins[doc_id]]))
+                for token in antigos - tokens:
+                    postings_de(token).remove(doc_id)
+                for token in tokens - antigos:
+                    insort(postings_de(token), doc_id)
+                novo.areas[doc_id] = termo.get("area")
+                novo._inicios[doc_id] = posicao
+                novo._fins[doc_id] = posicao + len(texto)
+            else:
+                # Acrescentados chegam em ordem: o doc_id vai para o fim das listas
+                for token in tokens:
+                    postings_de(token).append(doc_id)
+                novo.areas.append(termo.get("area"))
+                novo._inicios.append(posicao)
+                novo._fins.append(posicao + len(texto))
+            partes.append(texto + "\0")
+            posicao += len(texto) + 1
+        novo._texto = "".join(partes)
+        return novo
+
+    def _tokens_com(self, fragmento, no_inicio, no_fim):
+        # Tokens do vocabulário que contêm o fragmento (no_inicio/no_fim: o
+        # token precisa começar/terminar com ele) e o total dos seus postings
+        chave = (fragmento, no_inicio, no_fim)
+        encontrado = self._cache_fragmentos.get(chave)
+        if encontrado is not None:
+            return encontrado
+        if no_inicio and no_fim:
+            tokens = [fragmento] if fragmento in self.postings else []
+        else:
+            if len(fragmento) < 3:
+                # Sem trigrama: confere o vocabulário (só para consultas curtas)
+                universo = self.vocabulario
+            else:
+                listas = [self.trigramas.get(g, ()) for g in self._trigramas_token(fragmento)]
+                universo = map(self.vocabulario.__getitem__, min(listas, key=len))
+            if no_inicio:
+                tokens = [token for token in universo if token.startswith(fragmento)]
+            elif no_fim:
+                tokens = [token for token in universo if token.endswith(fragmento)]
+            else:
+                tokens = [token for token in universo if fragmento in token]
+        if len(self._cache_fragmentos) > 1024:
+            self._cache_fragmentos.clear()
+        encontrado = self._cache_fragmentos[chave] = (tokens, sum(len(self.postings[t]) for t in tokens))
+        return encontrado
+
+    def buscar_ids(self, busca, area=None):
+        # doc_ids em ordem do glossário
+        consulta = normalizar(busca).strip().replace("\0", "").replace("\x1f", "")
+        chave = (consulta, area)
+        if chave in self._cache:
+            return self._cache[chave]
+
+        texto, inicios, fins = self._texto, self._inicios, self._fins
+        achados = list(PADRAO_TOKEN.finditer(consulta))
+        if not consulta:
+            ids = []
+        elif not achados:
+            # Só pontuação: não há token para consultar o índice
+            ids = [doc_id for doc_id in range(len(inicios))
+                   if texto.find(consulta, inicios[doc_id], fins[doc_id]) != -1]
+        else:
+            # Na frase, o token que vem depois de pontuação ou espaço começa
+            # um token do documento, o que vem antes termina um: "acao rec"
+            # casa tokens terminados em "acao" e começados por "rec"
+            partes = []
+            for achado in achados:
+                no_inicio, no_fim = achado.start() > 0, achado.end() < len(consulta)
+                # Fragmentos curtos soltos casam com boa parte do vocabulário
+                if len(achado.group()) >= 3 or (no_inicio and no_fim) or len(achados) == 1:
+                    partes.append(self._tokens_com(achado.group(), no_inicio, no_fim))
+            if not partes:
+                partes = [self._tokens_com(a.group(), a.start() > 0, a.end() < len(consulta)) for a in achados]
+            partes.sort(key=lambda parte: parte[1])
+            candidatos = set()
+            for token in partes[0][0]:
+                candidatos.update(self.postings[token])
+            # Interseção só com os postings que não são muito maiores que os
+            # candidatos; o resto fica para a conferência com str.find
+            for tokens, total in partes[1:]:
+                if total > 4 * len(candidatos):
+                    break
+                outros = set()
+                for token in tokens:
+                    outros.update(self.postings[token])
+                candidatos &= outros
+            # Um único token já é garantido pelo índice; frases e pontuação
+            # exigem conferir a substring contígua nos candidatos
+            if len(achados) > 1 or achados[0].group() != consulta:
+                candidatos = [doc_id for doc_id in candidatos
+                              if texto.find(consulta, inicios[doc_id], fins[doc_id]) != -1]
+            ids = sorted(candidatos)
+        if area is not None:
+            ids = [doc_id for doc_id in ids if self.areas[doc_id] == area]
+
+        if len(self._cache) > 256:
+            self._cache.clear()
+        resultado = self._cache[chave] = tuple(ids)
+        return resultado
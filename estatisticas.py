@@ -0,0 +1,116 @@
+from collections import Counter
+
+
+class EstatisticasGlossario:
+    # Agregados do glossário (total, contagem por área e por fonte, data mais
+    # recente) calculados uma vez por versão e mantidos termo a termo.
+    # As leituras não percorrem os dados: são O(1) ou listas já prontas.
+
+    def __init__(self, dados=()):
+        self._valores = []  # (area, fonte, data) por doc_id; None se removido
+        self.total = 0
+        self.por_area = Counter()
+        self.por_fonte = Counter()
+        self._datas = Counter()
+        self._data_mais_recente = None
+        self._listas = {}
+        for termo in dados:
+            self.adicionar(termo)
+
+    @classmethod
+    def de_valores(cls, valores):
+        # A partir de tuplas (area, fonte, data), ex.: colunas de um DataFrame
+        estatisticas = cls()
+        for area, fonte, data in valores:
+            estatisticas._incluir((area, fonte, data or ""))
+        return estatisticas
+
+    def _incluir(self, valores):
+        self._valores.append(valores)
+        self._contar(valores, 1)
+        return len(self._valores) - 1
+
+    def _contar(self, valores, sinal):
+        area, fonte, data = valores
+        self.total += sinal
+        # Listas prontas só são refeitas quando o conjunto de chaves muda
+        for lista, contador, chave in (("areas", self.por_area, area), ("fontes", self.por_fonte, fonte),
+                                       (None, self._datas, data)):
+            contador[chave] += sinal
+            if contador[chave] <= 0:
+                del contador[chave]
+                self._listas.pop(lista, None)
+            elif sinal > 0 and contador[chave] == 1:
+                self._listas.pop(lista, None)
+        self._listas.pop("contagem_areas", None)
+
+        if data and sinal > 0 and (self._data_mais_recente is None or data > self._data_mais_recente):
+            self._data_mais_recente = data
+        elif data and sinal < 0 and data == self._data_mais_recente and data not in self._datas:
+            # Saiu o último termo da data mais recente: procura entre as datas distintas
+            self._data_mais_recente = max((d for d in self._datas if d), default=None)
+
+    # Escrita (por doc_id, na mesma numeração dos índices de busca)
+    def adicionar(self, termo):
+        return self._incluir((termo["area"], termo["fonte"], termo.get("data") or ""))
+
+    def substituir(self, doc_id, termo):
+        self.remover(doc_id)
+        valores = (termo["area"], termo["fonte"], termo.get("data") or "")
+        self._valores[doc_id] = valores
+        self._contar(valores, 1)
+
+    def remover(self, doc_id):
+        valores = self._valores[doc_id]
+        if valores is not None:
+            self._valores[doc_id] = None
+            self._contar(valores, -1)
+
+    def atualizado(self, dados, alterados):
+        # Nova versão com os doc_ids alterados ou novos aplicados; esta
+        # continua válida para quem ainda a usa
+        novo = object.__new__(EstatisticasGlossario)
+        novo._valores = list(self._valores)
+        novo.total = self.total
+        novo.por_area = Counter(self.por_area)
+        novo.por_fonte = Counter(self.por_fonte)
+        novo._datas = Counter(self._datas)
+        novo._data_mais_recente = self._data_mais_recente
+        novo._listas = {}
+        for doc_id in alterados:
+            if doc_id < len(novo._valores):
+                novo.substituir(doc_id, dados[doc_id])
+            else:
+                novo.adicionar(dados[doc_id])
+        return novo
+
+    # Leitura
+    def _lista(self, nome, calcular):
+        lista = self._listas.get(nome)
+        if lista is None:
+            # Tupla: a mesma lista é devolvida a todas as sessões
+            lista = self._listas[nome] = tuple(calcular())
+        return lista
+
+    @property
+    def quantidade_areas(self):
+        return len(self.por_area)
+
+    @property
+    def quantidade_fontes(self):
+        return len(self.por_fonte)
+
+    @property
+    def data_mais_recente(self):
+        return self._data_mais_recente
+
+    def areas(self):
+        return self._lista("areas", lambda: sorted(self.por_area))
+
+    def fontes(self):
+        return self._lista("fontes", lambda: sorted(self.por_fonte))
+
+    def contagem_areas(self):
+        # [(area, quantidade)] da maior para a menor, como value_counts()
+        return self._lista("contagem_areas",
+                           lambda: sorted(self.por_area.items(), key=lambda item: (-item[1], item[0])))
@@ -0,0 +1,309 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+from armazenamento import CAMINHO_GLOSSARIO, abrir_banco, linha_para_termo
+from busca import normalizar
+from modelos import CAMPOS_TERMO
+
+# Registros validados e gravados por vez: a memória depende disto, não do arquivo
+TAMANHO_BLOCO = 5_000
+# Campos exigidos pela tabela "termos" (NOT NULL sem valor padrão)
+CAMPOS_OBRIGATORIOS = ("termo", "definicao", "fonte", "area")
+CAMPOS_LISTA = ("sinonimos", "relacionados")
+TAMANHO_MAXIMO_TERMO = 200
+# Exemplos de registros inválidos guardados no relatório (o total é sempre contado)
+ERROS_NO_RELATORIO = 20
+
+
+class RegistroInvalido(ValueError):
+    pass
+
+
+class RelatorioImportacao:
+    def __init__(self):
+        self.lidos = 0
+        self.invalidos = 0
+        self.duplicados = 0    # mesmo termo (normalizado) repetido na importação
+        self.inseridos = 0
+        self.atualizados = 0
+        self.inalterados = 0
+        self.erros = []        # (arquivo, linha, mensagem)
+        self.inicio = time.perf_counter()
+        self.segundos = 0.0
+
+    def registrar_erro(self, arquivo, linha, mensagem):
+        self.invalidos += 1
+        if len(self.erros) < ERROS_NO_RELATORIO:
+            self.erros.append((str(arquivo), linha, mensagem))
+
+    def taxa(self):
+        return self.lidos / self.segundos if self.segundos else 0.0
+
+    def resumo(self):
+        return (f"{self.lidos} lidos, {self.invalidos} inválidos, {self.duplicados} duplicados, "
+                f"{self.inseridos} novos, {self.atualizados} atualizados, {self.inalterados} sem mudança "
+                f"- {self.segundos:.1f}s ({self.taxa():.0f} registros/s)")
+
+
+def chave_termo(nome):
+    # "Habeas  corpus" e "HABEAS CORPUS" são o mesmo termo
+    return " ".join(normalizar(nome).split())
+
+
+# Leitura
+def _lista(valor):
+    # CSV: '["HC", "Remédio"]' ou "HC; Remédio" (também "|"); JSONL: lista
+    if valor is None:
+        return []
+    if isinstance(valor, str):
+        texto = valor.strip()
+        if texto.startswith("["):
+            try:
+                valor = json.loads(texto)
+            except json.JSONDecodeError:
+                raise RegistroInvalido(f"lista malformada: {texto[:40]}") from None
+        else:
+            return [parte.strip() for parte in texto.replace("|", ";").split(";")]
+    if not isinstance(valor, list) or not all(isinstance(item, str) for item in valor):
+        raise RegistroInvalido("sinônimos e relacionados devem ser listas de textos")
+    return [item.strip() for item in valor]
+
+
+def _sem_repetidos(nomes, excluir):
+    vistos = {excluir}
+    unicos = []
+    for nome in nomes:
+        chave = chave_termo(nome)
+        if chave and chave not in vistos:
+            vistos.add(chave)
+            unicos.append(nome)
+    return unicos
+
+
+def validar_registro(bruto):
+    # Devolve o registro no formato do glossário (CAMPOS_TERMO) ou levanta RegistroInvalido
+    if not isinstance(bruto, dict):
+        raise RegistroInvalido("registro não é um objeto")
+    registro = {}
+    for campo in CAMPOS_TERMO:
+        if campo in CAMPOS_LISTA:
+            continue
+        valor = bruto.get(campo)
+        if valor is None:
+            valor = ""
+        if not isinstance(valor, str):
+            raise RegistroInvalido(f"campo '{campo}' deve ser texto")
+        registro[campo] = " ".join(valor.split()) if campo == "termo" else valor.strip()
+    faltando = [campo for campo in CAMPOS_OBRIGATORIOS if not registro[campo]]
+    if faltando:
+        raise RegistroInvalido("campos obrigatórios vazios: " + ", ".join(faltando))
+    if len(registro["termo"]) > TAMANHO_MAXIMO_TERMO:
+        raise RegistroInvalido(f"termo com mais de {TAMANHO_MAXIMO_TERMO} caracteres")
+    if registro["data"]:
+        try:
+            datetime.strptime(registro["data"], "%Y-%m-%d")
+        except ValueError:
+            raise RegistroInvalido(f"data fora do formato AAAA-MM-DD: {registro['data']}") from None
+
+    chave = chave_termo(registro["termo"])
+    for campo in CAMPOS_LISTA:
+        registro[campo] = _sem_repetidos(_lista(bruto.get(campo)), chave)
+    return registro
+
+
+def ler_csv(caminho, encoding):
+    with open(caminho, encoding=encoding, newline="") as arquivo:
+        # A linha 1 é o cabeçalho
+        for linha, bruto in enumerate(csv.DictReader(arquivo), start=2):
+            yield linha, bruto
+
+
+def ler_jsonl(caminho, encoding):
+    with open(caminho, encoding=encoding) as arquivo:
+        for linha, texto in enumerate(arquivo, start=1):
+            if not texto.strip():
+                continue
+            try:
+                yield linha, json.loads(texto)
+            except json.JSONDecodeError as erro:
+                yield linha, RegistroInvalido(f"JSON inválido: {erro.msg}")
+
+
+LEITORES = {".csv": ler_csv, ".jsonl": ler_jsonl, ".ndjson": ler_jsonl}
+
+
+def ler_registros(caminho, formato=None, encoding="utf-8-sig"):
+    # Gera (linha, registro bruto) sem carregar o arquivo inteiro
+    formato = formato or Path(caminho).suffix.lower()
+    leitor = LEITORES.get(formato if formato.startswith(".") else "." + formato)
+    if leitor is None:
+        raise ValueError(f"Formato não suportado: {formato} (use CSV ou JSONL)")
+    return leitor(caminho, encoding)
+
+
+# Gravação
+def mesclar_termos(atual, novo):
+    # O registro importado atualiza os textos que trouxer; o nome gravado,
+    # os sinônimos e os relacionados já existentes são mantidos (unidos aos novos)
+    mesclado = dict(atual)
+    for campo in CAMPOS_TERMO:
+        if campo == "termo":
+            continue
+        if campo in CAMPOS_LISTA:
+            mesclado[campo] = _sem_repetidos([*atual.get(campo, ()), *novo[campo]], chave_termo(atual["termo"]))
+        elif novo[campo]:
+            mesclado[campo] = novo[campo]
+    return mesclado
+
+
+class ImportadorGlossario:
+    # Importa dumps grandes (CSV/JSONL) para o banco em blocos de tamanho
+    # fixo: valida, junta repetições pelo nome normalizado (unindo sinônimos
+    # e relacionados) e grava tudo numa única transação. As chaves já vistas
+    # ficam numa tabela temporária do SQLite, não em memória Python.
+    # Depois exporta o glossario.json (a origem das versões do app).
+
+    def __init__(self, banco, tamanho_bloco=TAMANHO_BLOCO, ao_progredir=None):
+        self.banco = banco
+        self.tamanho_bloco = tamanho_bloco
+        self.ao_progredir = ao_progredir
+
+    def importar(self, caminhos, formato=None, encoding="utf-8-sig", data=None):
+        relatorio = RelatorioImportacao()
+        data = data or datetime.now().strftime("%Y-%m-%d")
+        conexao = self.banco.conexao()
+        with conexao:
+            self._preparar_chaves(conexao)
+            for caminho in caminhos:
+                registros = ler_registros(caminho, formato, encoding)
+                while True:
+                    bloco = list(islice(registros, self.tamanho_bloco))
+                    if not bloco:
+                        break
+                    self._gravar_bloco(conexao, caminho, bloco, data, relatorio)
+                    relatorio.segundos = time.perf_counter() - relatorio.inicio
+                    if self.ao_progredir:
+                        self.ao_progredir(relatorio)
+            conexao.execute("DROP TABLE chaves_importacao")
+        relatorio.segundos = time.perf_counter() - relatorio.inicio
+        return relatorio
+
+    @staticmethod
+    def _preparar_chaves(conexao):
+        # chave normalizada -> id do termo; "importado" marca os gravados nesta importação
+        conexao.create_function("chave_termo", 1, chave_termo, deterministic=True)
+        conexao.execute("DROP TABLE IF EXISTS temp.chaves_importacao")
+        conexao.execute("""CREATE TEMP TABLE chaves_importacao (
+            chave TEXT PRIMARY KEY, id INTEGER NOT NULL, importado INTEGER NOT NULL DEFAULT 0)""")
+        conexao.execute("INSERT OR IGNORE INTO chaves_importacao (chave, id) "
+                        "SELECT chave_termo(termo), id FROM termos ORDER BY id")
+
+    def _gravar_bloco(self, conexao, caminho, bloco, data, relatorio):
+        por_chave = {}
+        for linha, bruto in bloco:
+            relatorio.lidos += 1
+            try:
+                if isinstance(bruto, RegistroInvalido):
+                    raise bruto
+                registro = validar_registro(bruto)
+            except RegistroInvalido as erro:
+                relatorio.registrar_erro(caminho, linha, str(erro))
+                continue
+            chave = chave_termo(registro["termo"])
+            if chave in por_chave:
+                relatorio.duplicados += 1
+                registro = mesclar_termos(por_chave[chave], registro)
+            por_chave[chave] = registro
+        if not por_chave:
+            return
+
+        marcadores = ", ".join("?" * len(por_chave))
+        existentes = conexao.execute(f"""
+            SELECT c.chave, c.importado, t.* FROM chaves_importacao c JOIN termos t ON t.id = c.id
+            WHERE c.chave IN ({marcadores})""", list(por_chave)).fetchall()
+        alterados, novos = [], []
+        for linha in existentes:
+            atual = {campo: list(valor) if campo in CAMPOS_LISTA else valor
+                     for campo, valor in linha_para_termo(linha).items()}
+            mesclado = mesclar_termos(atual, por_chave.pop(linha["chave"]))
+            if linha["importado"]:
+                relatorio.duplicados += 1
+            elif mesclado == atual:
+                relatorio.inalterados += 1
+                continue
+            else:
+                relatorio.atualizados += 1
+            alterados.append(mesclado)
+        for registro in por_chave.values():
+            relatorio.inseridos += 1
+            novos.append(registro)
+
+        # Mesma escrita do restante do app (upsert pelo nome, sem reescrever linhas iguais)
+        self.banco.gravar_termos(conexao, alterados + novos, data)
+        conexao.executemany("""
+            INSERT INTO chaves_importacao (chave, id, importado)
+            SELECT ?, id, 1 FROM termos WHERE termo = ?
+            ON CONFLICT(chave) DO UPDATE SET importado = 1""",
+                            [(chave_termo(r["termo"]), r["termo"]) for r in alterados + novos])
+
+
+def exportar_glossario(banco, destino=CAMINHO_GLOSSARIO):
+    # Regrava o glossario.json a partir do banco, termo a termo (mesmo
+    # formato de json.dump(..., indent=4)), e registra no banco a versão do
+    # arquivo novo: o GerenciadorVersoes vê o banco já sincronizado e só
+    # compila o snapshot. Devolve a versão (mesmo hash de versoes.hash_conteudo).
+    destino = Path(destino)
+    temporario = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+    resumo = hashlib.sha256()
+    with open(temporario, "wb") as arquivo:
+        def escrever(texto):
+            dados = texto.encode("utf-8")
+            resumo.update(dados)
+            arquivo.write(dados)
+
+        escrever("[")
+        separador = "\n"
+        for linha in banco.conexao().execute("SELECT * FROM termos ORDER BY id"):
+            escrever(separador + json.dumps([dict(linha_para_termo(linha))], ensure_ascii=False, indent=4)[2:-2])
+            separador = ",\n"
+        escrever("\n]" if separador != "\n" else "]")
+    versao = resumo.hexdigest()[:16]
+    banco.registrar_versao_termos(versao)
+    # Troca atômica: o app nunca lê um arquivo pela metade
+    temporario.replace(destino)
+    return versao
+
+
+if __name__ == "__main__":
+    # python importacao.py dump.csv [outro.jsonl ...] [--bloco 5000]
+    parser = argparse.ArgumentParser(description="Importa termos em massa (CSV ou JSONL) para o glossário")
+    parser.add_argument("arquivos", nargs="+", type=Path)
+    parser.add_argument("--formato", choices=["csv", "jsonl"], help="padrão: pela extensão do arquivo")
+    parser.add_argument("--encoding", default="utf-8-sig")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="registros gravados por vez")
+    parser.add_argument("--banco", help="banco SQLite (padrão: dados/glossario.db)")
+    parser.add_argument("--destino", type=Path, default=CAMINHO_GLOSSARIO,
+                        help="glossário JSON regravado ao final (padrão: dados/glossario.json)")
+    args = parser.parse_args()
+
+    banco = abrir_banco(args.banco) if args.banco else abrir_banco()
+    importador = ImportadorGlossario(banco, args.bloco,
+                                     ao_progredir=lambda r: print(r.resumo(), file=sys.stderr, flush=True))
+    relatorio = importador.importar(args.arquivos, args.formato, args.encoding)
+    for arquivo, linha, mensagem in relatorio.erros:
+        print(f"{arquivo}:{linha}: {mensagem}", file=sys.stderr)
+    if relatorio.invalidos > len(relatorio.erros):
+        print(f"... e mais {relatorio.invalidos - len(relatorio.erros)} registros inválidos", file=sys.stderr)
+    print(relatorio.resumo())
+    # Sempre regrava o glossário: ele é a origem do GerenciadorVersoes, que
+    # apagaria do banco os termos importados que não estivessem no arquivo
+    versao = exportar_glossario(banco, args.destino)
+    print(f"{args.destino} regravado com {banco.contar()} termos (versão {versao})")
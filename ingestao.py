@@ -0,0 +1,166 @@
+import logging
+import queue
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote
+
+from integracoes import CLIENTE_HTTP
+
+# Intervalo entre ciclos completos de coleta (segundos)
+INTERVALO_PADRAO = 30 * 60
+
+LOG = logging.getLogger(__name__)
+
+
+def _data_iso(valor):
+    # Aceita datas RFC 822 (RSS) ou ISO 8601 e devolve AAAA-MM-DD
+    if not valor:
+        return datetime.now().strftime("%Y-%m-%d")
+    try:
+        return parsedate_to_datetime(valor).strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(valor.replace("Z", "+00:00")).strftime("%Y-%m-%d")
+    except ValueError:
+        return valor[:10]
+
+
+def normalizar_itens(resposta):
+    # Converte a resposta de um feed (RSS ou JSON) para o formato do glossário
+    tipo = resposta.headers.get("Content-Type", "")
+    if "json" in tipo:
+        dados = resposta.json()
+        itens = dados.get("items", dados.get("noticias", [])) if isinstance(dados, dict) else dados
+        brutos = [{
+            "titulo": item.get("titulo") or item.get("title"),
+            "fonte": item.get("fonte") or item.get("source"),
+            "data": item.get("data") or item.get("published"),
+            "resumo": item.get("resumo") or item.get("summary") or "",
+            "url": item.get("url") or item.get("link") or "#",
+        } for item in itens]
+    else:
+        raiz = ET.fromstring(resposta.content)
+        brutos = [{
+            "titulo": item.findtext("title"),
+            "fonte": item.findtext("source") or raiz.findtext("channel/title"),
+            "data": item.findtext("pubDate"),
+            "resumo": item.findtext("description") or "",
+            "url": item.findtext("link") or "#",
+        } for item in raiz.iter("item")]
+
+    noticias = []
+    for item in brutos:
+        if not item["titulo"]:
+            continue
+        noticias.append({
+            "titulo": item["titulo"].strip(),
+            "fonte": (item["fonte"] or "Portal de notícias").strip(),
+            "data": _data_iso(item["data"]),
+            "resumo": item["resumo"].strip(),
+            "url": item["url"],
+        })
+    return noticias
+
+
+class IngestorNoticias:
+    # Coleta notícias em segundo plano e grava no banco, termo a termo.
+    # As páginas só leem o que já foi gravado; nenhuma renderização espera
+    # por um feed. A fila limitada dá a contrapressão: se os feeds ficam
+    # lentos, o agendador espera vaga em vez de acumular trabalho.
+
+    def __init__(self, banco, fontes, obter_termos, intervalo=INTERVALO_PADRAO,
+                 trabalhadores=2, tamanho_fila=50, cliente=CLIENTE_HTTP, ao_atualizar=None):
+        self.banco = banco
+        self.fontes = fontes  # modelos de URL com {termo}
+        self.obter_termos = obter_termos
+        self.intervalo = intervalo
+        self.cliente = cliente
+        self.ao_atualizar = ao_atualizar
+        self.fila = queue.Queue(maxsize=tamanho_fila)
+        self._parar = threading.Event()
+        self._trava = threading.Lock()
+        self._threads = [threading.Thread(target=self._agendar, name="ingestao-agendador", daemon=True)]
+        self._threads += [threading.Thread(target=self._trabalhar, name=f"ingestao-{i}", daemon=True)
+                          for i in range(trabalhadores)]
+        self.metricas = {
+            "ciclos": 0,
+            "termos_processados": 0,
+            "noticias_novas": 0,
+            "erros": 0,
+            "espera_fila_s": 0.0,
+            "maior_fila": 0,
+        }
+
+    def iniciar(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def parar(self, tempo_limite=5):
+        self._parar.set()
+        for thread in self._threads:
+            thread.join(tempo_limite)
+
+    def _somar(self, chave, valor=1):
+        with self._trava:
+            self.metricas[chave] += valor
+
+    def _agendar(self):
+        while not self._parar.is_set():
+            try:
+                termos = self.obter_termos()
+            except Exception:
+                # Sem a lista de termos não há o que agendar: tenta no próximo
+                # ciclo em vez de encerrar a thread (e a coleta) de vez
+                LOG.exception("Falha ao obter os termos para a coleta de notícias")
+                self._somar("erros")
+                self._parar.wait(self.intervalo)
+                continue
+            for termo in termos:
+                inicio = time.monotonic()
+                # put bloqueante, mas acordando para checar o pedido de parada
+                while not self._parar.is_set():
+                    try:
+                        self.fila.put(termo, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                self._somar("espera_fila_s", time.monotonic() - inicio)
+                with self._trava:
+                    self.metricas["maior_fila"] = max(self.metricas["maior_fila"], self.fila.qsize())
+                if self._parar.is_set():
+                    return
+            self._somar("ciclos")
+            self._parar.wait(self.intervalo)
+
+    def _trabalhar(self):
+        while not self._parar.is_set():
+            try:
+                termo = self.fila.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self.coletar(termo)
+            except Exception:
+                # Feed fora do ar, resposta malformada ou falha no banco: o
+                # termo fica para o próximo ciclo e o trabalhador segue
+                LOG.exception("Falha ao coletar notícias de %r", termo)
+                self._somar("erros")
+            finally:
+                self.fila.task_done()
+
+    def coletar(self, termo):
+        noticias = []
+        for fonte in self.fontes:
+            resposta = self.cliente.obter(fonte.format(termo=quote(termo)))
+            noticias.extend(normalizar_itens(resposta))
+        novas = self.banco.salvar_noticias(termo, noticias) if noticias else 0
+        self._somar("termos_processados")
+        self._somar("noticias_novas", novas)
+        if novas and self.ao_atualizar:
+            self.ao_atualizar(termo)
+        return novas
@@ -0,0 +1,164 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import streamlit as st
+
+# Limites superiores dos buckets dos histogramas (segundos)
+LIMITES_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# GLOSSARIO_METRICAS=caminho.prom (texto Prometheus) ou caminho.json
+CAMINHO_METRICAS = os.environ.get("GLOSSARIO_METRICAS")
+INTERVALO_EXPORTACAO = 5.0
+# GLOSSARIO_DEPURACAO=1 mostra na barra lateral o tempo de cada etapa da execução atual
+DEPURACAO = os.environ.get("GLOSSARIO_DEPURACAO", "") not in ("", "0")
+
+
+class Histograma:
+    def __init__(self):
+        self.buckets = [0] * len(LIMITES_BUCKETS)
+        self.contagem = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def registrar(self, segundos):
+        for i, limite in enumerate(LIMITES_BUCKETS):
+            if segundos <= limite:
+                self.buckets[i] += 1
+                break
+        self.contagem += 1
+        self.soma += segundos
+        self.maximo = max(self.maximo, segundos)
+
+    def acumulados(self):
+        total = 0
+        for quantidade in self.buckets:
+            total += quantidade
+            yield total
+
+    def percentil(self, fracao):
+        # Estimativa pelo limite do bucket (mesma precisão do histogram_quantile)
+        alvo = fracao * self.contagem
+        for limite, acumulado in zip(LIMITES_BUCKETS, self.acumulados()):
+            if acumulado >= alvo:
+                return limite
+        return self.maximo
+
+
+class Metricas:
+    # Histogramas por etapa, agregados no processo inteiro (todas as sessões)
+
+    def __init__(self):
+        self._histogramas = {}
+        self._trava = threading.Lock()
+        self._ultima_exportacao = 0.0
+
+    def registrar(self, nome, segundos):
+        with self._trava:
+            histograma = self._histogramas.get(nome)
+            if histograma is None:
+                histograma = self._histogramas[nome] = Histograma()
+            histograma.registrar(segundos)
+
+    def exportar_prometheus(self):
+        linhas = [
+            "# HELP glossario_etapa_segundos Duração das etapas de renderização do glossário",
+            "# TYPE glossario_etapa_segundos histogram",
+        ]
+        with self._trava:
+            for nome, histograma in sorted(self._histogramas.items()):
+                for limite, acumulado in zip(LIMITES_BUCKETS, histograma.acumulados()):
+                    linhas.append(f'glossario_etapa_segundos_bucket{{etapa="{nome}",le="{limite}"}} {acumulado}')
+                linhas.append(f'glossario_etapa_segundos_bucket{{etapa="{nome}",le="+Inf"}} {histograma.contagem}')
+                linhas.append(f'glossario_etapa_segundos_sum{{etapa="{nome}"}} {histograma.soma:.6f}')
+                linhas.append(f'glossario_etapa_segundos_count{{etapa="{nome}"}} {histograma.contagem}')
+        return "\n".join(linhas) + "\n"
+
+    def exportar_json(self):
+        with self._trava:
+            return {
+                nome: {
+                    "contagem": h.contagem,
+                    "soma_s": h.soma,
+                    "media_ms": h.soma / h.contagem * 1000 if h.contagem else 0.0,
+                    "p50_ms": h.percentil(0.5) * 1000,
+                    "p95_ms": h.percentil(0.95) * 1000,
+                    "max_ms": h.maximo * 1000,
+                    "buckets": dict(zip([str(l) for l in LIMITES_BUCKETS], h.acumulados())),
+                }
+                for nome, h in sorted(self._histogramas.items())
+            }
+
+    def gravar(self, caminho):
+        caminho = Path(caminho)
+        if caminho.suffix == ".json":
+            conteudo = json.dumps(self.exportar_json(), ensure_ascii=False, indent=2)
+        else:
+            conteudo = self.exportar_prometheus()
+        # Troca atômica: o coletor nunca lê um arquivo pela metade
+        temporario = caminho.with_name(f"{caminho.name}.{os.getpid()}.tmp")
+        temporario.write_text(conteudo, encoding="utf-8")
+        temporario.replace(caminho)
+
+    def exportar_periodicamente(self, caminho=CAMINHO_METRICAS):
+        # Grava no máximo a cada INTERVALO_EXPORTACAO segundos
+        if not caminho:
+            return
+        agora = time.monotonic()
+        with self._trava:
+            if agora - self._ultima_exportacao < INTERVALO_EXPORTACAO:
+                return
+            self._ultima_exportacao = agora
+        self.gravar(caminho)
+
+    def limpar(self):
+        with self._trava:
+            self._histogramas.clear()
+
+
+# Instância única por processo
+METRICAS = Metricas()
+
+# Etapas da execução atual; cada sessão do Streamlit roda o script na própria thread
+_execucao = threading.local()
+
+
+def iniciar_execucao():
+    _execucao.etapas = []
+    _execucao.profundidade = 0
+
+
+def etapas_execucao():
+    # Lista de (nome, profundidade, ms) na ordem em que as etapas começaram
+    return [tuple(etapa) for etapa in getattr(_execucao, "etapas", [])]
+
+
+@contextmanager
+def etapa(nome):
+    # Cronometra um trecho; serve como "with etapa(...)" ou como decorador
+    etapas = getattr(_execucao, "etapas", None)
+    profundidade = getattr(_execucao, "profundidade", 0)
+    registro = [nome, profundidade, 0.0]
+    if etapas is not None:
+        etapas.append(registro)
+    _execucao.profundidade = profundidade + 1
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao = time.perf_counter() - inicio
+        _execucao.profundidade = profundidade
+        registro[2] = duracao * 1000
+        METRICAS.registrar(nome, duracao)
+
+
+def finalizar_execucao():
+    METRICAS.exportar_periodicamente()
+    if DEPURACAO:
+        linhas = [f"{'  ' * profundidade}{nome:<{32 - 2 * profundidade}} {ms:8.1f} ms"
+                  for nome, profundidade, ms in etapas_execucao()]
+        with st.sidebar.expander("⏱️ Tempo desta execução", expanded=True):
+            st.code("\n".join(linhas) or "Nenhuma etapa registrada", language=None)
@@ -0,0 +1,285 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+LOG = logging.getLogger(__name__)
+
+# Tempo máximo de espera por fonte (segundos); fontes lentas não seguram a página
+TEMPO_LIMITE_PADRAO = 3.0
+TEMPOS_LIMITE = {
+    "stf": 2.0,
+    "stj": 2.0,
+    "noticias": 3.0,
+}
+
+# Pool compartilhado pelo processo: as consultas de uma página rodam em paralelo
+_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="integracoes")
+
+# Prazo (time.monotonic) da fonte que a thread está consultando; o
+# ClienteHTTP não espera resposta nem tenta de novo além dele
+_PRAZO = threading.local()
+
+
+class FonteIndisponivel(Exception):
+    pass
+
+
+def consultar_fontes(consultas, tempos_limite=None):
+    # Dispara todas as consultas ao mesmo tempo e devolve (nome, resultado, erro)
+    # na ordem em que terminam. A fonte que estoura o próprio prazo é entregue
+    # com erro FonteIndisponivel, sem atrasar as demais.
+    tempos_limite = {**TEMPOS_LIMITE, **(tempos_limite or {})}
+    inicio = time.monotonic()
+    prazos = {nome: inicio + tempos_limite.get(nome, TEMPO_LIMITE_PADRAO) for nome in consultas}
+    futuros = {_EXECUTOR.submit(_com_prazo, funcao, prazos[nome]): nome for nome, funcao in consultas.items()}
+    pendentes = set(futuros)
+
+    while pendentes:
+        agora = time.monotonic()
+        for futuro in [f for f in pendentes if prazos[futuros[f]] <= agora and not f.done()]:
+            pendentes.discard(futuro)
+            # cancel() só evita consultas que ainda não começaram; a que já
+            # está em andamento segura o trabalhador até a requisição HTTP
+            # voltar, e por isso o ClienteHTTP usa o mesmo prazo como timeout
+            futuro.cancel()
+            nome = futuros[futuro]
+            yield nome, None, FonteIndisponivel(f"{nome}: tempo limite excedido")
+        if not pendentes:
+            break
+
+        proximo_prazo = min(prazos[futuros[f]] for f in pendentes)
+        concluidos, _ = wait(pendentes, timeout=max(0, proximo_prazo - time.monotonic()),
+                             return_when=FIRST_COMPLETED)
+        for futuro in concluidos:
+            pendentes.discard(futuro)
+            try:
+                yield futuros[futuro], futuro.result(), None
+            except Exception as erro:
+                yield futuros[futuro], None, erro
+
+
+def _com_prazo(funcao, prazo):
+    _PRAZO.valor = prazo
+    try:
+        return funcao()
+    finally:
+        _PRAZO.valor = None
+
+
+def _tempo_restante():
+    prazo = getattr(_PRAZO, "valor", None)
+    return None if prazo is None else prazo - time.monotonic()
+
+
+class _NovasTentativas(Retry):
+    # Não tenta de novo depois do prazo da fonte: o trabalhador do _EXECUTOR
+    # fica livre quando consultar_fontes desiste dela
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        restante = _tempo_restante()
+        if restante is not None and restante <= 0:
+            raise MaxRetryError(_pool, url, error)
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+class ClienteHTTP:
+    # Cliente HTTP compartilhado pelas integrações (tribunais e notícias):
+    # - conexões keep-alive reaproveitadas entre reruns e sessões
+    # - no máximo "max_por_host" requisições simultâneas por servidor
+    # - novas tentativas com espera exponencial para falhas temporárias
+    # - respostas comprimidas (gzip/deflate)
+
+    def __init__(self, max_por_host=4, tentativas=3, espera_base=0.2, tempo_limite=TEMPO_LIMITE_PADRAO):
+        self.tempo_limite = tempo_limite
+        novas_tentativas = _NovasTentativas(
+            total=tentativas,
+            backoff_factor=espera_base,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+        )
+        # pool_block faz a requisição esperar por uma conexão livre em vez de abrir outra
+        self._adaptador = HTTPAdapter(pool_connections=32, pool_maxsize=max_por_host,
+                                      pool_block=True, max_retries=novas_tentativas)
+        self._sessao = requests.Session()
+        self._sessao.mount("http://", self._adaptador)
+        self._sessao.mount("https://", self._adaptador)
+        self._sessao.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": "GlossarioJuridico/1.0",
+        })
+        self._trava = threading.Lock()
+        self._latencias = deque(maxlen=1000)
+        self.requisicoes = 0
+        self.erros = 0
+
+    def obter(self, url, parametros=None, tempo_limite=None):
+        inicio = time.perf_counter()
+        tempo_limite = tempo_limite or self.tempo_limite
+        restante = _tempo_restante()
+        if restante is not None:
+            # Dentro de consultar_fontes: o timeout da requisição é o que resta
+            # do prazo da fonte, para a thread não continuar presa a ela
+            tempo_limite = max(min(tempo_limite, restante), 0.001)
+        try:
+            resposta = self._sessao.get(url, params=parametros, timeout=tempo_limite)
+            resposta.raise_for_status()
+            return resposta
+        except requests.RequestException:
+            with self._trava:
+                self.erros += 1
+            raise
+        finally:
+            with self._trava:
+                self.requisicoes += 1
+                self._latencias.append(time.perf_counter() - inicio)
+
+    def obter_json(self, url, parametros=None, tempo_limite=None):
+        return self.obter(url, parametros, tempo_limite).json()
+
+    def metricas(self):
+        # Conexões abertas x requisições feitas mostra o reaproveitamento do pool
+        pools = self._adaptador.poolmanager.pools
+        por_host = {}
+        for chave in list(pools.keys()):
+            pool = pools.get(chave)
+            if pool is not None:
+                por_host[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    "conexoes_abertas": pool.num_connections,
+                    "requisicoes": pool.num_requests,
+                }
+        with self._trava:
+            latencias = sorted(self._latencias)
+            return {
+                "requisicoes": self.requisicoes,
+                "erros": self.erros,
+                "latencia_p50_ms": latencias[len(latencias) // 2] * 1000 if latencias else 0.0,
+                "latencia_p95_ms": latencias[int(len(latencias) * 0.95) - 1] * 1000 if latencias else 0.0,
+                "hosts": por_host,
+            }
+
+
+# Instância única por processo (o módulo é importado uma vez, mesmo com reruns)
+CLIENTE_HTTP = ClienteHTTP()
+
+
+def buscar_json(url, tempo_limite=TEMPO_LIMITE_PADRAO, parametros=None):
+    return CLIENTE_HTTP.obter_json(url, parametros, tempo_limite)
+
+
+class _Carregamento:
+    # Carga em andamento de uma chave ausente: quem pede a mesma chave
+    # enquanto ela roda espera este resultado em vez de carregar de novo
+    def __init__(self):
+        self.pronto = threading.Event()
+        self.valor = None
+        self.erro = None
+
+
+class CacheTTL:
+    # Cache limitado (LRU) com validade (TTL) e stale-while-revalidate:
+    # vencido o TTL, o valor antigo ainda é servido por mais "tempo_obsoleto"
+    # segundos enquanto uma atualização roda em segundo plano.
+
+    def __init__(self, capacidade=1024, ttl=600, tempo_obsoleto=3600, relogio=time.monotonic):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self.tempo_obsoleto = tempo_obsoleto
+        self._relogio = relogio
+        self._itens = OrderedDict()
+        self._atualizando = set()
+        self._carregando = {}
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.esperas = 0
+        self.obsoletos = 0
+        self.remocoes = 0
+
+    def obter(self, chave, carregar):
+        agora = self._relogio()
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is not None:
+                valor, criado_em = item
+                idade = agora - criado_em
+                if idade < self.ttl:
+                    self._itens.move_to_end(chave)
+                    self.acertos += 1
+                    return valor
+                if idade < self.ttl + self.tempo_obsoleto:
+                    self._itens.move_to_end(chave)
+                    self.obsoletos += 1
+                    if chave not in self._atualizando:
+                        self._atualizando.add(chave)
+                        _EXECUTOR.submit(self._revalidar, chave, carregar)
+                    return valor
+            self.falhas += 1
+            carregamento = self._carregando.get(chave)
+            dono = carregamento is None
+            if dono:
+                carregamento = self._carregando[chave] = _Carregamento()
+            else:
+                self.esperas += 1
+
+        if not dono:
+            # Outra thread já está carregando a chave: uma consulta só à origem
+            carregamento.pronto.wait()
+            if carregamento.erro is not None:
+                raise carregamento.erro
+            return carregamento.valor
+        try:
+            carregamento.valor = carregar()
+            self._guardar(chave, carregamento.valor)
+            return carregamento.valor
+        except BaseException as erro:
+            carregamento.erro = erro
+            raise
+        finally:
+            with self._trava:
+                del self._carregando[chave]
+            carregamento.pronto.set()
+
+    def _revalidar(self, chave, carregar):
+        try:
+            self._guardar(chave, carregar())
+        except Exception:
+            # O valor obsoleto continua valendo até a próxima tentativa
+            LOG.exception("Falha ao revalidar %r no cache", chave)
+        finally:
+            with self._trava:
+                self._atualizando.discard(chave)
+
+    def _guardar(self, chave, valor):
+        with self._trava:
+            self._itens[chave] = (valor, self._relogio())
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+                self.remocoes += 1
+
+    def invalidar(self, chave=None):
+        with self._trava:
+            if chave is None:
+                self._itens.clear()
+            else:
+                self._itens.pop(chave, None)
+
+    def estatisticas(self):
+        with self._trava:
+            consultas = self.acertos + self.obsoletos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "capacidade": self.capacidade,
+                "acertos": self.acertos,
+                "obsoletos": self.obsoletos,
+                "falhas": self.falhas,
+                "esperas": self.esperas,
+                "remocoes": self.remocoes,
+                "taxa_acerto": (self.acertos + self.obsoletos) / consultas if consultas else 0.0,
+            }
@@ -1,9 +1,25 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import requests
+import json
+import os
 from datetime import datetime
+from types import MappingProxyType
+
+from armazenamento import PASTA_DADOS
+from busca import IndiceApelidos, IndiceTermos, normalizar
+from estatisticas import EstatisticasGlossario
+from instrumentacao import etapa, finalizar_execucao, iniciar_execucao
+from integracoes import TEMPOS_LIMITE, buscar_json, consultar_fontes
+from snapshot import abrir_snapshot
+from versoes import hash_conteudo
+
+# Copy-on-write: vistas e recortes de um DataFrame nunca escrevem no
+# original. As tabelas do glossário são compartilhadas por todas as sessões
+# do processo; uma sessão que altere a sua vista copia só a coluna alterada.
+pd.set_option("mode.copy_on_write", True)
 
 # Configuração da página
 st.set_page_config(
@@ -59,47 +75,88 @@ st.markdown("""
 if 'termo_selecionado' not in st.session_state:
     st.session_state.termo_selecionado = None
 
-# Dados completos do glossário
-@st.cache_data
+# Tipos das colunas: textos em Arrow (sem um objeto Python por célula),
+# área e fonte categóricas, data como datetime
+COLUNAS_TEXTO = ["termo", "definicao", "exemplo", "detalhes"]
+COLUNAS_CATEGORIAS = ["area", "fonte"]
+COLUNAS_LISTAS = ["sinonimos", "relacionados"]
+
+def montar_tabelas(registros, versao=None):
+    # Devolve (df, listas): o DataFrame colunar dos termos e, para cada coluna
+    # de lista, uma tabela "explodida" com uma linha por (termo, valor).
+    # "versao" identifica o conteúdo e separa os filtros em cache por versão.
+    bruto = pd.DataFrame(registros).reindex(columns=COLUNAS_TEXTO + COLUNAS_CATEGORIAS + ["data"] + COLUNAS_LISTAS)
+    df = pd.DataFrame({coluna: bruto[coluna].fillna("").astype("string[pyarrow]") for coluna in COLUNAS_TEXTO})
+    for coluna in COLUNAS_CATEGORIAS:
+        df[coluna] = bruto[coluna].astype("category")
+    df["data"] = pd.to_datetime(bruto["data"], errors="coerce")
+    # Nome sem acentos e caixa, calculado uma vez para a busca literal
+    df["termo_normalizado"] = df["termo"].map(normalizar).astype("string[pyarrow]")
+    df.attrs["versao"] = versao
+    listas = {
+        coluna: bruto[["termo", coluna]].explode(coluna).dropna()
+                .rename(columns={coluna: "valor"})
+                .astype("string[pyarrow]")
+                .reset_index(drop=True)
+        for coluna in COLUNAS_LISTAS
+    }
+    return df, listas
+
+def formatar_data(data):
+    return "N/A" if pd.isna(data) else data.strftime("%Y-%m-%d")
+
+# Dados completos do glossário (snapshot binário compilado de dados/juridicos.json),
+# uma única cópia por processo. cache_data devolveria a cada chamada uma cópia
+# nova (pickle) do df e das listas, em toda execução de toda sessão.
+@st.cache_resource
+def tabelas_compartilhadas():
+    origem = PASTA_DADOS / "juridicos.json"
+    termos = abrir_snapshot(PASTA_DADOS / "juridicos.snap", origem)
+    return montar_tabelas(termos, versao=hash_conteudo(origem.read_bytes()))
+
+@etapa("carregar_dados_juridicos")
 def carregar_dados_juridicos():
-    termos = [
-        {
-            "termo": "Habeas Corpus", "definicao": "Remédio constitucional que visa proteger o direito de locomoção do indivíduo, evitando ou cessando violência ou coação em sua liberdade de ir e vir.", "area": "Direito Constitucional", "fonte": "STF", "data": "2024-01-15", "exemplo": "O Habeas Corpus foi concedido para um preso que estava encarcerado sem mandado judicial válido.", "sinonimos": ["HC", "Remédio Constitucional"], "relacionados": ["Mandado de Segurança", "Mandado de Injunção", "Habeas Data"], "detalhes": "Previsto no art. 5º, LXVIII da Constituição Federal"
-        },
-        {
-            "termo": "Ação Rescisória", "definicao": "Ação judicial que tem por objeto desconstituir sentença transitada em julgado, por vícios que a tornam nula ou inexistente.", "area": "Direito Processual Civil", "fonte": "STJ", "data": "2024-01-12", "exemplo": "A parte ajuizou ação rescisória para anular sentença proferida com base em documento falso.", "sinonimos": ["Rescisão da Sentença"], "relacionados": ["Coisa Julgada", "Recurso", "Sentença"], "detalhes": "Disciplinada nos arts. 966 a 976 do CPC"
-        },
-        {
-            "termo": "Usucapião", "definicao": "Modo de aquisição da propriedade móvel ou imóvel pela posse prolongada, contínua e incontestada, atendidos os requisitos legais.", "area": "Direito Civil", "fonte": "Câmara dos Deputados", "data": "2024-01-10", "exemplo": "O proprietário adquiriu o imóvel por usucapião após 15 anos de posse mansa e pacífica.", "sinonimos": ["Prescrição Aquisitiva"], "relacionados": ["Propriedade", "Posse", "Direitos Reais"], "detalhes": "Regulada pelos arts. 1.238 a 1.244 do Código Civil"
-        },
-        {
-            "termo": "Crime Culposo", "definicao": "Conduta voluntária que produz resultado ilícito não desejado, decorrente de imprudência, negligência ou imperícia.", "area": "Direito Penal", "fonte": "Planalto", "data": "2024-01-08", "exemplo": "O motorista foi condenado por crime culposo de homicídio após causar acidente por excesso de velocidade.", "sinonimos": ["Culpa", "Delito Culposo"], "relacionados": ["Crime Doloso", "Culpa", "Dolo"], "detalhes": "Definido no art. 18, II do Código Penal"
-        },
-        {
-            "termo": "Princípio da Isonomia", "definicao": "Princípio constitucional que estabelece a igualdade de todos perante a lei, sem distinção de qualquer natureza.", "area": "Direito Constitucional", "fonte": "STF", "data": "2024-01-05", "exemplo": "O princípio da isonomia foi invocado para garantir tratamento igualitário a homens e mulheres em concurso público.", "sinonimos": ["Igualdade", "Isonomia"], "relacionados": ["Princípios Constitucionais", "Direitos Fundamentais"], "detalhes": "Previsto no caput do art. 5º da Constituição Federal"
-        },
-        {
-            "termo": "Desconsideração da Personalidade Jurídica", "definicao": "Instrumento que permite ultrapassar a autonomia patrimonial da pessoa jurídica para atingir bens particulares de seus sócios.", "area": "Direito Empresarial", "fonte": "STJ", "data": "2024-01-03", "exemplo": "A desconsideração foi aplicada para cobrar dívidas da empresa diretamente dos sócios.", "sinonimos": ["Desconsideração", "Disregard Doctrine"], "relacionados": ["Pessoa Jurídica", "Responsabilidade"], "detalhes": "Prevista no art. 50 do Código Civil e art. 28 do CDC"
-        },
-        {
-            "termo": "Mandado de Segurança", "definicao": "Remédio constitucional para proteger direito líquido e certo não amparado por habeas corpus ou habeas data.", "area": "Direito Constitucional", "fonte": "STF", "data": "2023-12-28", "exemplo": "Concedido mandado de segurança para assegurar vaga em concurso público.", "sinonimos": ["MS"], "relacionados": ["Habeas Corpus", "Direito Líquido e Certo"], "detalhes": "Previsto no art. 5º, LXIX da CF"
-        },
-        {
-            "termo": "Coisa Julgada", "definicao": "Qualidade da sentença que não mais admite recurso, tornando-se imutável.", "area": "Direito Processual Civil", "fonte": "STJ", "data": "2023-12-25", "exemplo": "A sentença transitou em julgado após esgotados todos os recursos.", "sinonimos": ["Res Judicata"], "relacionados": ["Sentença", "Recurso"], "detalhes": "Disciplinada no art. 502 do CPC"
-        },
-        {
-            "termo": "Agravo de Instrumento", "definicao": "Recurso cabível contra decisão interlocutória que causa lesão grave e de difícil reparação.", "area": "Direito Processual Civil", "fonte": "STJ", "data": "2023-12-20", "exemplo": "O agravo foi interposto contra decisão que indeferiu prova pericial.", "sinonimos": ["Agravo"], "relacionados": ["Recurso", "Decisão Interlocutória"], "detalhes": "Disciplinado nos arts. 1.015 a 1.020 do CPC"
-        },
-        {
-            "termo": "Jus Postulandi", "definicao": "Capacidade de postular em juízo, ou seja, de propor ações e defender-se perante o Poder Judiciário.", "area": "Direito Processual", "fonte": "STJ", "data": "2023-12-15", "exemplo": "A defensoria pública exerce o jus postulandi em favor dos necessitados.", "sinonimos": ["Capacidade Postulatória"], "relacionados": ["Legitimidade", "Capacidade Processual"], "detalhes": "Em regra, exercido por advogados (art. 1º da Lei 8.906/94)"
-        }
-    ]
-    return pd.DataFrame(termos)
+    # Vistas rasas (sem copiar os dados) das tabelas compartilhadas
+    df, listas = tabelas_compartilhadas()
+    return df.copy(deep=False), {coluna: tabela.copy(deep=False) for coluna, tabela in listas.items()}
+
+# Índice por nome compartilhado entre sessões (evita a máscara booleana por termo);
+# cada registro é somente leitura, com sinônimos e relacionados em tuplas
+@st.cache_resource
+def obter_indice_termos():
+    df, listas = carregar_dados_juridicos()
+    registros = df.to_dict("records")
+    for coluna, tabela in listas.items():
+        por_termo = tabela.groupby("termo", sort=False)["valor"].agg(tuple)
+        for registro in registros:
+            registro[coluna] = por_termo.get(registro["termo"], ())
+    return IndiceTermos([MappingProxyType(registro) for registro in registros])
+
+# Nome, sinônimos e abreviações ("HC", "MS") -> posições dos termos no df,
+# montado uma vez por versão a partir da tabela de sinônimos
+@st.cache_resource
+def obter_indice_apelidos(versao):
+    df, listas = carregar_dados_juridicos()
+    sinonimos = listas["sinonimos"].groupby("termo", sort=False)["valor"].agg(list)
+    return IndiceApelidos([{"termo": termo, "sinonimos": sinonimos.get(termo, [])} for termo in df["termo"]])
+
+# Agregados da página inicial e dos filtros, calculados uma vez por versão dos dados
+@st.cache_resource
+def obter_estatisticas(versao):
+    df, _ = carregar_dados_juridicos()
+    datas = df['data'].dt.strftime("%Y-%m-%d").fillna("")
+    return EstatisticasGlossario.de_valores(zip(df['area'], df['fonte'], datas))
+
+# Endpoints reais dos tribunais (opcionais); sem eles as consultas usam dados simulados
+URL_STF = os.environ.get("GLOSSARIO_URL_STF")
+URL_STJ = os.environ.get("GLOSSARIO_URL_STJ")
 
 # Funções para APIs (simuladas)
 class APIServicosJuridicos:
     @staticmethod
     def buscar_stf(termo):
+        if URL_STF:
+            return buscar_json(URL_STF, TEMPOS_LIMITE["stf"], parametros={"termo": termo})
         stf_data = {
             "Habeas Corpus": {
                 "definicao": "Remédio constitucional que visa proteger o direito de locomoção do indivíduo, conforme art. 5º, LXVIII da CF.",
@@ -116,6 +173,8 @@ class APIServicosJuridicos:
 
     @staticmethod
     def buscar_stj(termo):
+        if URL_STJ:
+            return buscar_json(URL_STJ, TEMPOS_LIMITE["stj"], parametros={"termo": termo})
         stj_data = {
             "Ação Rescisória": {
                 "definicao": "Ação para desconstituir sentença transitada em julgado por vícios.",
@@ -131,16 +190,36 @@ class APIServicosJuridicos:
         return stj_data.get(termo, {})
 
 # Funções de visualização
-def criar_grafico_areas(df):
-    contagem_areas = df['area'].value_counts().reset_index()
-    contagem_areas.columns = ['Área', 'Quantidade']
+TITULO_GRAFICO_AREAS = '📊 Distribuição por Área do Direito'
+
+@etapa("criar_grafico_areas")
+def criar_grafico_areas(estatisticas, titulo=TITULO_GRAFICO_AREAS, altura=450):
+    contagem_areas = pd.DataFrame(estatisticas.contagem_areas(), columns=['Área', 'Quantidade'])
     fig = px.pie(contagem_areas, values='Quantidade', names='Área', 
-                 title='📊 Distribuição por Área do Direito',
+                 title=titulo,
                  color_discrete_sequence=px.colors.qualitative.Set3)
     fig.update_traces(textposition='inside', textinfo='percent+label')
-    fig.update_layout(height=450)
+    fig.update_layout(height=altura)
     return fig
 
+# Spec JSON da figura já montada e validada, por (versão, título, altura),
+# compartilhado entre sessões como texto imutável. Entradas de versões antigas
+# saem pelo max_entries; as estatísticas não entram na chave (_estatisticas)
+@st.cache_resource(max_entries=8, show_spinner=False)
+def grafico_areas_em_cache(versao, titulo, altura, _estatisticas):
+    return criar_grafico_areas(_estatisticas, titulo, altura).to_json()
+
+def figura_do_spec(spec):
+    # Figura própria da execução a partir do spec em cache; ele veio de uma
+    # figura validada, então o st.plotly_chart só precisa serializá-la
+    return go.Figure(json.loads(spec), _validate=False)
+
+def obter_grafico_areas(versao, estatisticas, titulo=TITULO_GRAFICO_AREAS, altura=450):
+    if versao is None:
+        return criar_grafico_areas(estatisticas, titulo, altura)
+    return figura_do_spec(grafico_areas_em_cache(versao, titulo, altura, estatisticas))
+
+@etapa("buscar_noticias")
 def buscar_noticias(termo):
     noticias_base = {
         "Habeas Corpus": [
@@ -154,65 +233,118 @@ def buscar_noticias(termo):
     return noticias_base.get(termo, [{"titulo": f"Notícias sobre {termo}", "fonte": "Glossário Jurídico", "data": "2024-01-01", "resumo": "Em breve mais notícias sobre este termo."}])
 
 # Páginas do aplicativo
+@etapa("exibir_pagina_inicial")
 def exibir_pagina_inicial(df):
     st.markdown("### 🎯 Bem-vindo ao Glossário Jurídico Digital")
     st.write("Site desenvolvido para **descomplicar o Direito** com definições claras e acessíveis.")
     
     # Métricas
+    estatisticas = obter_estatisticas(df.attrs.get("versao"))
     col1, col2, col3, col4 = st.columns(4)
-    with col1: st.metric("Termos", len(df))
-    with col2: st.metric("Áreas", df['area'].nunique())
-    with col3: st.metric("Fontes", df['fonte'].nunique())
-    with col4: st.metric("Atualização", df['data'].max())
+    with col1: st.metric("Termos", estatisticas.total)
+    with col2: st.metric("Áreas", estatisticas.quantidade_areas)
+    with col3: st.metric("Fontes", estatisticas.quantidade_fontes)
+    with col4: st.metric("Atualização", estatisticas.data_mais_recente or "N/A")
     
     # Gráficos
     col1, col2 = st.columns(2)
-    with col1: st.plotly_chart(criar_grafico_areas(df), use_container_width=True)
+    with col1: st.plotly_chart(obter_grafico_areas(df.attrs.get("versao"), estatisticas), use_container_width=True)
     
     # Termos recentes
     st.markdown("### 🔄 Termos Recentes")
-    termos_recentes = df.sort_values('data', ascending=False).head(4)
-    for _, termo in termos_recentes.iterrows():
+    termos_recentes = df.nlargest(4, 'data')
+    for termo in termos_recentes.itertuples(index=False):
         with st.container():
             st.markdown(f'<div class="term-card">', unsafe_allow_html=True)
-            st.markdown(f"#### {termo['termo']}")
-            st.write(termo['definicao'][:120] + "...")
-            st.caption(f"**Área:** {termo['area']} | **Fonte:** {termo['fonte']}")
-            if st.button("Ver detalhes", key=f"home_{termo['termo']}"):
-                st.session_state.termo_selecionado = termo['termo']
+            st.markdown(f"#### {termo.termo}")
+            st.write(termo.definicao[:120] + "...")
+            st.caption(f"**Área:** {termo.area} | **Fonte:** {termo.fonte}")
+            if st.button("Ver detalhes", key=f"home_{termo.termo}"):
+                st.session_state.termo_selecionado = termo.termo
                 st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
 
+def calcular_filtro(df, area_selecionada, fonte_selecionada, termo_busca, exatos=()):
+    # Uma única máscara booleana para os três filtros. A busca é literal
+    # (sem regex: "(" ou "." valem como texto) sobre o nome normalizado.
+    # "exatos" são as posições cujo nome ou apelido é a própria busca:
+    # entram mesmo sem casar com o nome e ficam no topo.
+    mascara = np.ones(len(df), dtype=bool)
+    if area_selecionada != "Todas": mascara &= (df['area'] == area_selecionada).to_numpy()
+    if fonte_selecionada != "Todas": mascara &= (df['fonte'] == fonte_selecionada).to_numpy()
+    if termo_busca:
+        contem = df['termo_normalizado'].str.contains(normalizar(termo_busca), regex=False)
+        contem = contem.to_numpy(dtype=bool, na_value=False)
+        contem[list(exatos)] = True
+        mascara &= contem
+    posicoes = np.flatnonzero(mascara)
+    if exatos:
+        primeiro = np.isin(posicoes, exatos)
+        posicoes = np.concatenate([posicoes[primeiro], posicoes[~primeiro]])
+    return posicoes
+
+# Posições resultantes por (versão, área, fonte, busca); o df não entra na chave (_df)
+@st.cache_data(max_entries=512, show_spinner=False)
+def posicoes_em_cache(versao, area_selecionada, fonte_selecionada, termo_busca, exatos, _df):
+    return calcular_filtro(_df, area_selecionada, fonte_selecionada, termo_busca, exatos)
+
+@etapa("filtrar_termos")
+def filtrar_termos(df, area_selecionada, fonte_selecionada, termo_busca):
+    # Sem filtros devolve o próprio df; com filtros, só as linhas encontradas
+    if area_selecionada == "Todas" and fonte_selecionada == "Todas" and not termo_busca:
+        return df
+    versao = df.attrs.get("versao")
+    if versao is None:
+        posicoes = calcular_filtro(df, area_selecionada, fonte_selecionada, termo_busca)
+    else:
+        exatos = obter_indice_apelidos(versao).resolver_ids(termo_busca) if termo_busca else ()
+        posicoes = posicoes_em_cache(versao, area_selecionada, fonte_selecionada, termo_busca, exatos, df)
+    return df.iloc[posicoes]
+
+def abrir_termo_por_apelido(df, busca):
+    # Busca que é exatamente o nome ou um apelido de um único termo abre a
+    # página dele; só uma vez por busca, para o "Voltar" não reabrir
+    versao = df.attrs.get("versao")
+    if not busca or versao is None or st.session_state.get("apelido_aberto") == busca:
+        return
+    st.session_state.apelido_aberto = busca
+    posicoes = obter_indice_apelidos(versao).resolver_ids(busca)
+    if len(posicoes) == 1:
+        st.session_state.termo_selecionado = df['termo'].iloc[posicoes[0]]
+
+@etapa("exibir_explorar_termos")
 def exibir_explorar_termos(df, area_selecionada, fonte_selecionada, termo_busca):
     st.markdown("### 📚 Explorar Termos Jurídicos")
     
     # Aplicar filtros
-    df_filtrado = df.copy()
-    if area_selecionada != "Todas": df_filtrado = df_filtrado[df_filtrado['area'] == area_selecionada]
-    if fonte_selecionada != "Todas": df_filtrado = df_filtrado[df_filtrado['fonte'] == fonte_selecionada]
-    if termo_busca: df_filtrado = df_filtrado[df_filtrado['termo'].str.contains(termo_busca, case=False)]
+    df_filtrado = filtrar_termos(df, area_selecionada, fonte_selecionada, termo_busca)
     
     # Resultados
     if len(df_filtrado) > 0:
         st.success(f"**{len(df_filtrado)}** termo(s) encontrado(s)")
-        for _, termo in df_filtrado.iterrows():
+        # Só as colunas exibidas, lidas por tupla (sem montar uma Series por linha)
+        for termo in df_filtrado[['termo', 'definicao', 'area', 'fonte']].itertuples(index=False):
             with st.container():
                 st.markdown(f'<div class="term-card">', unsafe_allow_html=True)
                 col1, col2 = st.columns([3, 1])
                 with col1:
-                    st.markdown(f"#### {termo['termo']}")
-                    st.write(termo['definicao'])
-                    st.caption(f"**Área:** {termo['area']} | **Fonte:** {termo['fonte']}")
+                    st.markdown(f"#### {termo.termo}")
+                    st.write(termo.definicao)
+                    st.caption(f"**Área:** {termo.area} | **Fonte:** {termo.fonte}")
                 with col2:
-                    if st.button("🔍 Detalhes", key=f"exp_{termo['termo']}"):
-                        st.session_state.termo_selecionado = termo['termo']
+                    if st.button("🔍 Detalhes", key=f"exp_{termo.termo}"):
+                        st.session_state.termo_selecionado = termo.termo
                         st.rerun()
                 st.markdown('</div>', unsafe_allow_html=True)
     else:
         st.warning("Nenhum termo encontrado. Tente outros filtros.")
 
+@etapa("exibir_pagina_termo")
 def exibir_pagina_termo(df, termo_nome):
-    termo_data = df[df['termo'] == termo_nome].iloc[0]
+    termo_data = obter_indice_termos().obter(termo_nome)
+    if termo_data is None:
+        st.error("Termo não encontrado")
+        return
     
     st.markdown(f'<div class="definition-card">', unsafe_allow_html=True)
     
@@ -220,7 +352,7 @@ def exibir_pagina_termo(df, termo_nome):
     col1, col2 = st.columns([4, 1])
     with col1:
         st.markdown(f"# {termo_data['termo']}")
-        st.markdown(f"**Área:** {termo_data['area']} | **Fonte:** {termo_data['fonte']} | **Data:** {termo_data['data']}")
+        st.markdown(f"**Área:** {termo_data['area']} | **Fonte:** {termo_data['fonte']} | **Data:** {formatar_data(termo_data['data'])}")
     with col2:
         if st.button("← Voltar"): st.session_state.termo_selecionado = None; st.rerun()
     
@@ -240,17 +372,17 @@ def exibir_pagina_termo(df, termo_nome):
             st.markdown("### 📋 Detalhes Legais")
             st.write(termo_data['detalhes'])
         
-        # APIs
+        # APIs: os espaços são reservados agora e preenchidos quando cada fonte responde
         st.markdown("### ⚖️ Consulta aos Tribunais")
         col_api1, col_api2 = st.columns(2)
         with col_api1:
             with st.expander("🔍 STF - Supremo Tribunal Federal"):
-                dados_stf = APIServicosJuridicos.buscar_stf(termo_nome)
-                if dados_stf: st.write(dados_stf.get('definicao', 'Consulta simulada'))
+                espaco_stf = st.empty()
+                espaco_stf.caption("Consultando...")
         with col_api2:
             with st.expander("🔍 STJ - Superior Tribunal de Justiça"):
-                dados_stj = APIServicosJuridicos.buscar_stj(termo_nome)
-                if dados_stj: st.write(dados_stj.get('definicao', 'Consulta simulada'))
+                espaco_stj = st.empty()
+                espaco_stj.caption("Consultando...")
     
     with col2:
         st.markdown("### 🏷️ Informações")
@@ -265,15 +397,42 @@ def exibir_pagina_termo(df, termo_nome):
     
     # Notícias
     st.markdown("### 📰 Notícias Recentes")
-    noticias = buscar_noticias(termo_nome)
-    for noticia in noticias:
-        with st.container():
-            st.markdown(f'<div class="news-card">', unsafe_allow_html=True)
-            st.markdown(f"#### {noticia['titulo']}")
-            st.write(noticia['resumo'])
-            st.caption(f"Fonte: {noticia['fonte']} | Data: {noticia['data']}")
-            st.markdown('</div>', unsafe_allow_html=True)
+    espaco_noticias = st.empty()
+    espaco_noticias.caption("Buscando notícias...")
+    
+    # STF, STJ e notícias em paralelo: a página espera pela fonte mais lenta,
+    # não pela soma das três, e cada uma tem seu próprio tempo limite
+    consultas = {
+        "stf": lambda: APIServicosJuridicos.buscar_stf(termo_nome),
+        "stj": lambda: APIServicosJuridicos.buscar_stj(termo_nome),
+        "noticias": lambda: buscar_noticias(termo_nome),
+    }
+    for fonte, resultado, erro in consultar_fontes(consultas):
+        if fonte == "noticias":
+            exibir_noticias_termo(espaco_noticias, resultado, erro)
+        else:
+            espaco = espaco_stf if fonte == "stf" else espaco_stj
+            if erro:
+                espaco.warning("Tribunal indisponível no momento. Tente novamente mais tarde.")
+            elif resultado:
+                espaco.write(resultado.get('definicao', 'Consulta simulada'))
+            else:
+                espaco.empty()
+
+def exibir_noticias_termo(espaco, noticias, erro):
+    if erro:
+        espaco.warning("Não foi possível carregar as notícias agora.")
+        return
+    with espaco.container():
+        for noticia in noticias:
+            with st.container():
+                st.markdown(f'<div class="news-card">', unsafe_allow_html=True)
+                st.markdown(f"#### {noticia['titulo']}")
+                st.write(noticia['resumo'])
+                st.caption(f"Fonte: {noticia['fonte']} | Data: {noticia['data']}")
+                st.markdown('</div>', unsafe_allow_html=True)
 
+@etapa("exibir_pagina_noticias")
 def exibir_pagina_noticias(df):
     st.markdown("### 📰 Últimas Notícias Jurídicas")
     st.info("Em desenvolvimento: integração com Google News API")
@@ -288,6 +447,7 @@ def exibir_pagina_noticias(df):
                 st.write(noticia['resumo'])
                 st.markdown("---")
 
+@etapa("exibir_pagina_sobre")
 def exibir_pagina_sobre():
     st.markdown("### ℹ️ Sobre o Projeto")
     st.write("""
@@ -316,11 +476,12 @@ def exibir_pagina_sobre():
     """)
 
 # App principal
+@etapa("main")
 def main():
     st.markdown('<h1 class="main-header">⚖️ Glossário Jurídico</h1>', unsafe_allow_html=True)
     st.markdown("### Descomplicando o Direito para estudantes e leigos")
     
-    df = carregar_dados_juridicos()
+    df, _ = carregar_dados_juridicos()
     
     # Sidebar
     with st.sidebar:
@@ -329,10 +490,12 @@ def main():
         
         st.subheader("Buscar Termo")
         termo_busca = st.text_input("Digite o termo jurídico:")
+        abrir_termo_por_apelido(df, termo_busca)
         
         st.subheader("🎯 Filtros")
-        area_selecionada = st.selectbox("Área do Direito", ["Todas"] + list(df['area'].unique()))
-        fonte_selecionada = st.selectbox("Fonte", ["Todas"] + list(df['fonte'].unique()))
+        estatisticas = obter_estatisticas(df.attrs.get("versao"))
+        area_selecionada = st.selectbox("Área do Direito", ["Todas", *estatisticas.areas()])
+        fonte_selecionada = st.selectbox("Fonte", ["Todas", *estatisticas.fontes()])
         
         st.subheader("🔥 Termos Populares")
         for termo in df['termo'].head(6):
@@ -354,4 +517,10 @@ def main():
         with tab4: exibir_pagina_sobre()
 
 if __name__ == "__main__":
-    main()
+    iniciar_execucao()
+    try:
+        main()
+    finally:
+        # st.rerun() e st.stop() interrompem a execução com exceção: a
+        # medição da execução é fechada mesmo assim
+        finalizar_execucao()
@@ -0,0 +1,58 @@
+import sys
+from collections.abc import Mapping
+
+# Campos de um termo do glossário, na ordem das colunas da tabela "termos"
+CAMPOS_TERMO = ("termo", "definicao", "fonte", "jurisprudencia", "area",
+                "exemplo", "sinonimos", "relacionados", "data")
+
+
+class Termo(Mapping):
+    # Registro de um termo com __slots__: sem dicionário por instância.
+    # Área, fonte e data se repetem em milhares de termos e são internadas
+    # (um único objeto str por valor); sinônimos e relacionados viram tuplas.
+    # Continua aceitando termo["campo"] e termo.get(...) como um dict.
+    # Imutável: os mesmos objetos são compartilhados por todas as sessões.
+
+    __slots__ = CAMPOS_TERMO
+
+    def __init__(self, termo, definicao, fonte, jurisprudencia="", area="",
+                 exemplo="", sinonimos=(), relacionados=(), data=""):
+        definir = object.__setattr__
+        definir(self, "termo", termo)
+        definir(self, "definicao", definicao)
+        definir(self, "fonte", sys.intern(fonte))
+        definir(self, "jurisprudencia", jurisprudencia or "")
+        definir(self, "area", sys.intern(area))
+        definir(self, "exemplo", exemplo or "")
+        definir(self, "sinonimos", tuple(sinonimos or ()))
+        definir(self, "relacionados", tuple(relacionados or ()))
+        definir(self, "data", sys.intern(data or ""))
+
+    def __setattr__(self, campo, valor):
+        raise AttributeError(f"Termo é somente leitura (campo '{campo}')")
+
+    def __delattr__(self, campo):
+        raise AttributeError(f"Termo é somente leitura (campo '{campo}')")
+
+    def __reduce__(self):
+        # pickle/copy recriam pelo construtor (o padrão usaria setattr)
+        return Termo, tuple(getattr(self, campo) for campo in CAMPOS_TERMO)
+
+    @classmethod
+    def de_dict(cls, dados):
+        # Campos fora de CAMPOS_TERMO são ignorados
+        return cls(**{campo: dados[campo] for campo in CAMPOS_TERMO if campo in dados})
+
+    def __getitem__(self, campo):
+        if campo not in CAMPOS_TERMO:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __iter__(self):
+        return iter(CAMPOS_TERMO)
+
+    def __len__(self):
+        return len(CAMPOS_TERMO)
+
+    def __repr__(self):
+        return f"Termo({self.termo!r}, area={self.area!r}, fonte={self.fonte!r})"
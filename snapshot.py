@@ -0,0 +1,199 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from armazenamento import PASTA_DADOS, abrir_banco
+
+CAMINHO_SNAPSHOT = PASTA_DADOS / "glossario.snap"
+
+# Cabeçalho: assinatura + 11 inteiros de 32 bits (posições das seções)
+ASSINATURA = b"GLJ1"
+CABECALHO = struct.Struct("<4s11I")
+# Formato 2: sem a seção de ids ordenados por nome do formato 1. Arquivos
+# de outro formato são recusados (SnapshotInvalido) e compilados de novo
+VERSAO_FORMATO = 2
+SEPARADOR_LISTA = "\x1f"
+
+
+class SnapshotInvalido(Exception):
+    pass
+
+
+def _alinhar(buffer):
+    # Seções de inteiros começam em múltiplos de 4 bytes
+    buffer.extend(b"\0" * (-len(buffer) % 4))
+
+
+def compilar_snapshot(registros, caminho=CAMINHO_SNAPSHOT, versao=None):
+    # Compila os registros em um arquivo binário compacto:
+    # tabela de strings (sem repetição), offsets por campo e índices prontos.
+    # "versao" identifica o conteúdo de origem (hash) e fica gravada nos metadados.
+    registros = list(registros)
+    campos = list(registros[0]) if registros else []
+    listas = [c for c in campos if registros and isinstance(registros[0][c], (list, tuple))]
+
+    strings = bytearray()
+    posicoes = {}
+
+    def referencia(texto):
+        # Strings repetidas (área, fonte, data) são gravadas uma única vez
+        if texto not in posicoes:
+            dados = texto.encode("utf-8")
+            posicoes[texto] = (len(strings), len(dados))
+            strings.extend(dados)
+        return posicoes[texto]
+
+    tabela = array("I")
+    for registro in registros:
+        for campo in campos:
+            valor = registro.get(campo, "")
+            if campo in listas:
+                valor = SEPARADOR_LISTA.join(valor or [])
+            tabela.extend(referencia("" if valor is None else str(valor)))
+
+    por_area = {}
+    for i, registro in enumerate(registros):
+        por_area.setdefault(registro.get("area", ""), []).append(i)
+    areas = array("I")
+    ids_area = array("I")
+    for area in sorted(por_area):
+        areas.extend(referencia(area))
+        areas.extend((len(ids_area), len(por_area[area])))
+        ids_area.extend(por_area[area])
+
+    meta = json.dumps({"campos": campos, "listas": listas, "ordem_bytes": sys.byteorder, "versao": versao},
+                      ensure_ascii=False).encode("utf-8")
+
+    corpo = bytearray(b"\0" * CABECALHO.size)
+    secoes = []
+    for bloco in (meta, tabela.tobytes(), areas.tobytes(), ids_area.tobytes(), bytes(strings)):
+        _alinhar(corpo)
+        secoes.append((len(corpo), len(bloco)))
+        corpo.extend(bloco)
+
+    (off_meta, len_meta), (off_tabela, _), (off_areas, _), (off_ids_area, _), (off_strings, len_strings) = secoes
+    corpo[:CABECALHO.size] = CABECALHO.pack(
+        ASSINATURA, VERSAO_FORMATO, len(registros), len(campos), off_meta, len_meta,
+        off_tabela, off_areas, len(por_area), off_ids_area, off_strings, len_strings)
+
+    # Grava em arquivo temporário e troca de forma atômica
+    caminho = Path(caminho)
+    temporario = caminho.with_name(f"{caminho.name}.{os.getpid()}.tmp")
+    temporario.write_bytes(corpo)
+    temporario.replace(caminho)
+    return caminho
+
+
+class SnapshotGlossario:
+    # Leitura do snapshot via mmap: nada é copiado para objetos Python até
+    # que um registro seja acessado, e processos diferentes compartilham as
+    # mesmas páginas de memória do arquivo.
+
+    def __init__(self, caminho=CAMINHO_SNAPSHOT, registro=None):
+        self.caminho = Path(caminho)
+        # Construtor dos registros a partir do dict de campos (ex.: Termo.de_dict)
+        self._registro = registro
+        with open(self.caminho, "rb") as arquivo:
+            self._mmap = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+
+        if len(buffer) < CABECALHO.size:
+            raise SnapshotInvalido(f"Arquivo truncado: {self.caminho}")
+        (assinatura, versao, self._total, n_campos, off_meta, len_meta, off_tabela,
+         off_areas, n_areas, off_ids_area, off_strings, len_strings) = CABECALHO.unpack_from(buffer)
+        if assinatura != ASSINATURA or versao != VERSAO_FORMATO:
+            raise SnapshotInvalido(f"Formato de snapshot desconhecido: {self.caminho}")
+
+        meta = json.loads(bytes(buffer[off_meta:off_meta + len_meta]))
+        if meta["ordem_bytes"] != sys.byteorder:
+            raise SnapshotInvalido("Snapshot gerado em máquina com outra ordem de bytes")
+        self.campos = meta["campos"]
+        self.versao = meta.get("versao")
+        self._posicao_campo = {campo: i for i, campo in enumerate(self.campos)}
+        self._listas = set(meta["listas"])
+        self._n_campos = n_campos
+
+        def inteiros(inicio, quantidade):
+            return buffer[inicio:inicio + quantidade * 4].cast("I")
+
+        self._tabela = inteiros(off_tabela, self._total * n_campos * 2)
+        self._areas = inteiros(off_areas, n_areas * 4)
+        self._ids_area = inteiros(off_ids_area, self._total)
+        self._strings = buffer[off_strings:off_strings + len_strings]
+
+    def _texto(self, posicao, tamanho):
+        return str(self._strings[posicao:posicao + tamanho], "utf-8")
+
+    def campo(self, indice, campo):
+        base = (indice * self._n_campos + self._posicao_campo[campo]) * 2
+        valor = self._texto(self._tabela[base], self._tabela[base + 1])
+        if campo in self._listas:
+            return valor.split(SEPARADOR_LISTA) if valor else []
+        return valor
+
+    def campos_brutos(self, indice):
+        # Bytes de todos os campos de um registro, sem decodificar (comparações rápidas)
+        base = indice * self._n_campos * 2
+        tabela, strings = self._tabela, self._strings
+        return [bytes(strings[tabela[j]:tabela[j] + tabela[j + 1]])
+                for j in range(base, base + self._n_campos * 2, 2)]
+
+    def __len__(self):
+        return self._total
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(self._total))]
+        if indice < 0:
+            indice += self._total
+        if not 0 <= indice < self._total:
+            raise IndexError(indice)
+        campos = {campo: self.campo(indice, campo) for campo in self.campos}
+        return campos if self._registro is None else self._registro(campos)
+
+    def __iter__(self):
+        for indice in range(self._total):
+            yield self[indice]
+
+    def ids_por_area(self, area):
+        for i in range(0, len(self._areas), 4):
+            if self._texto(self._areas[i], self._areas[i + 1]) == area:
+                inicio, quantidade = self._areas[i + 2], self._areas[i + 3]
+                return self._ids_area[inicio:inicio + quantidade].tolist()
+        return []
+
+
+def abrir_snapshot(caminho=CAMINHO_SNAPSHOT, origem=None):
+    # Recompila quando o snapshot não existe, é mais antigo que a origem ou
+    # foi gravado em outro formato
+    caminho = Path(caminho)
+    if origem is None:
+        origem = abrir_banco().caminho
+    if not caminho.exists() or Path(origem).stat().st_mtime > caminho.stat().st_mtime:
+        compilar_snapshot(_ler_origem(origem), caminho)
+    try:
+        return SnapshotGlossario(caminho)
+    except SnapshotInvalido:
+        compilar_snapshot(_ler_origem(origem), caminho)
+        return SnapshotGlossario(caminho)
+
+
+def _ler_origem(origem):
+    origem = Path(origem)
+    if origem.suffix == ".json":
+        with open(origem, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    return abrir_banco(origem).buscar()
+
+
+if __name__ == "__main__":
+    # Etapa de build: python snapshot.py [origem.db|origem.json] [destino.snap]
+    origem = Path(sys.argv[1]) if len(sys.argv) > 1 else abrir_banco().caminho
+    destino = Path(sys.argv[2]) if len(sys.argv) > 2 else CAMINHO_SNAPSHOT
+    compilar_snapshot(_ler_origem(origem), destino)
+    snapshot = SnapshotGlossario(destino)
+    print(f"Snapshot gerado em {destino}: {len(snapshot)} termos, {destino.stat().st_size} bytes")
@@ -10,9 +10,17 @@ st.set_page_config(
 st.config.set_option('server.fileWatcherType', 'none')
 
 # Seu código continua aqui...
+import os
+import random
 import streamlit as st
 from datetime import datetime
-import random
+
+from armazenamento import abrir_banco
+from busca import normalizar
+from ingestao import IngestorNoticias
+from instrumentacao import etapa, finalizar_execucao, iniciar_execucao
+from integracoes import CacheTTL
+from versoes import GerenciadorVersoes
 
 # Configuração da página - SIMPLIFICADA para evitar erros
 st.set_page_config(
@@ -69,453 +77,170 @@ st.markdown("""
 if 'termo_selecionado' not in st.session_state:
     st.session_state.termo_selecionado = None
 
-# Dados completos do glossário (41 TERMOS)
-GLOSSARIO_DADOS = [
-    {
-        "termo": "Habeas Corpus",
-        "definicao": "Remédio constitucional que visa proteger o direito de locomoção do indivíduo, conforme art. 5º, LXVIII da CF/88.",
-        "fonte": "STF - Supremo Tribunal Federal",
-        "jurisprudencia": "HC 184.246/SP - Concedido para trancamento de ação penal por ausência de justa causa.",
-        "area": "Direito Constitucional",
-        "exemplo": "O Habeas Corpus foi concedido para um preso que estava encarcerado sem mandado judicial válido.",
-        "sinonimos": ["HC", "Remédio Constitucional"],
-        "relacionados": ["Mandado de Segurança", "Liberdade", "Prisão"]
-    },
-    {
-        "termo": "Mandado de Segurança",
-        "definicao": "Ação constitucional para proteção de direito líquido e certo não amparado por HC ou HD.",
-        "fonte": "STF - Supremo Tribunal Federal", 
-        "jurisprudencia": "MS 34.567 - Concedido para assegurar direito a cargo público.",
-        "area": "Direito Constitucional",
-        "exemplo": "Concedido mandado de segurança para assegurar vaga em concurso público.",
-        "sinonimos": ["MS", "Proteção Judicial"],
-        "relacionados": ["Habeas Corpus", "Direito Líquido", "Ação"]
-    },
-    {
-        "termo": "Recurso Extraordinário",
-        "definicao": "Recurso cabível quando a decisão contraria a Constituição Federal.",
-        "fonte": "STF - Supremo Tribunal Federal",
-        "jurisprudencia": "RE 1.234.567 - Julgado procedente por ofensa à Constituição.",
-        "area": "Direito Constitucional",
-        "exemplo": "O recurso extraordinário foi interposto para questionar decisão que violou a Constituição Federal.",
-        "sinonimos": ["RE"],
-        "relacionados": ["STF", "Constituição"]
-    },
-    {
-        "termo": "Ação Rescisória",
-        "definicao": "Meio processual para desconstituir sentença transitada em julgado por vícios legais.",
-        "fonte": "STJ - Superior Tribunal de Justiça",
-        "jurisprudencia": "AR 5.432/DF - Admitida rescisão por documento novo.",
-        "area": "Direito Processual Civil",
-        "exemplo": "A parte ajuizou ação rescisória para anular sentença proferida com base em documento falso.",
-        "sinonimos": ["Rescisão da Sentença"],
-        "relacionados": ["Coisa Julgada", "Recurso", "Sentença"]
-    },
-    {
-        "termo": "Usucapião",
-        "definicao": "Modo aquisitivo da propriedade pela posse prolongada nos termos legais.",
-        "fonte": "STJ - Superior Tribunal de Justiça",
-        "jurisprudencia": "REsp 987.654/RS - Reconhecida usucapião extraordinária urbana.",
-        "area": "Direito Civil",
-        "exemplo": "O proprietário adquiriu o imóvel por usucapião após 15 anos de posse mansa e pacífica.",
-        "sinonimos": ["Prescrição Aquisitiva"],
-        "relacionados": ["Propriedade", "Posse", "Direito Real"]
-    },
-    {
-        "termo": "Princípio da Isonomia",
-        "definicao": "Princípio constitucional da igualdade de todos perante a lei (art. 5º, caput, CF/88).",
-        "fonte": "Câmara dos Deputados",
-        "jurisprudencia": "Constituição Federal, Artigo 5º",
-        "area": "Direito Constitucional",
-        "exemplo": "O princípio da isonomia foi invocado para garantir tratamento igualitário a homens e mulheres em concurso público.",
-        "sinonimos": ["Igualdade", "Isonomia"],
-        "relacionados": ["Direitos Fundamentais", "Constituição"]
-    },
-    {
-        "termo": "Crime Culposo",
-        "definicao": "Conduta voluntária com resultado ilícito não desejado por imprudência, negligência ou imperícia.",
-        "fonte": "Câmara dos Deputados", 
-        "jurisprudencia": "Código Penal, Artigo 18, II",
-        "area": "Direito Penal",
-        "exemplo": "O motorista foi condenado por crime culposo de homicídio após causar acidente por excesso de velocidade.",
-        "sinonimos": ["Delito Culposo", "Culpa"],
-        "relacionados": ["Crime Doloso", "Culpa", "Dolo"]
-    },
-    {
-        "termo": "Ação Civil Pública",
-        "definicao": "Instrumento processual para defesa de interesses transindividuais.",
-        "fonte": "Câmara dos Deputados",
-        "jurisprudencia": "Lei 7.347/85 - Disciplina a ação civil pública.",
-        "area": "Direito Processual Coletivo",
-        "exemplo": "O Ministério Público ajuizou ação civil pública para proteger o meio ambiente.",
-        "sinonimos": ["ACP"],
-        "relacionados": ["Interesses Coletivos", "Meio Ambiente"]
-    },
-    {
-        "termo": "Prescrição",
-        "definicao": "Perda do direito de ação pelo decurso do tempo.",
-        "fonte": "Base de Dados do Planalto",
-        "jurisprudencia": "Aplicada para extinguir punibilidade no direito penal.",
-        "area": "Direito Civil",
-        "exemplo": "O direito de ação prescreveu após decorrido o prazo legal sem exercício.",
-        "sinonimos": ["Decadência", "Perda do direito"],
-        "relacionados": ["Prazo", "Direito Civil"]
-    },
-    {
-        "termo": "Sentença",
-        "definicao": "Decisão do juiz que põe fim à fase cognitiva do processo.",
-        "fonte": "Base de Dados do Planalto",
-        "jurisprudencia": "Pode ser terminativa ou definitiva conforme o CPC.",
-        "area": "Direito Processual Civil",
-        "exemplo": "O juiz proferiu sentença condenatória após análise das provas.",
-        "sinonimos": ["Decisão", "Julgamento"],
-        "relacionados": ["Processo", "Recurso"]
-    },
-    {
-        "termo": "Coisa Julgada",
-        "definicao": "Qualidade da sentença que não mais admite recurso, tornando-se imutável.",
-        "fonte": "STJ - Superior Tribunal de Justiça",
-        "jurisprudencia": "Disciplinada no art. 502 do CPC",
-        "area": "Direito Processual Civil",
-        "exemplo": "A sentença transitou em julgado após esgotados todos os recursos.",
-        "sinonimos": ["Res Judicata"],
-        "relacionados": ["Sentença", "Recurso", "Processo"]
-    },
-    {
-        "termo": "Liminar",
-        "definicao": "Decisão judicial provisória para evitar dano irreparável.",
-        "fonte": "Câmara dos Deputados",
-        "jurisprudencia": "Concedida para suspender efeitos de ato administrativo.",
-        "area": "Direito Processual",
-        "exemplo": "O juiz concedeu liminar para suspender efeitos de ato administrativo.",
-        "sinonimos": ["Medida Cautelar", "Decisão Provisória"],
-        "relacionados": ["Tutela de Urgência", "Processo"]
-    },
-    {
-        "termo": "Prisão Preventiva",
-        "definicao": "Medida cautelar de privação de liberdade durante o processo.",
-        "fonte": "Base de Dados do Planalto",
-        "jurisprudencia": "Cabível nos casos do art. 312 do CPP.",
-        "area": "Direito Processual Penal",
-        "exemplo": "O juiz decretou prisão preventiva para garantir a ordem pública.",
-        "sinonimos": ["Prisão Cautelar"],
-        "relacionados": ["Prisão", "Processo Penal"]
-    },
-    {
-        "termo": "Desconsideração da Personalidade Jurídica",
-        "definicao": "Instrumento para ultrapassar autonomia patrimonial da pessoa jurídica.",
-        "fonte": "STJ - Superior Tribunal de Justiça",
-        "jurisprudencia": "REsp 1.111.222/SP - Aplicada para responsabilizar sócios.",
-        "area": "Direito Empresarial",
-        "exemplo": "A desconsideração foi aplicada para cobrar dívidas da empresa diretamente dos sócios.",
-        "sinonimos": ["Desconsideração"],
-        "relacionados": ["Pessoa Jurídica", "Sócios"]
-    },
-    {
-        "termo": "Embargos de Declaração",
-        "definicao": "Recurso para corrigir omissão, contradição ou obscuridade na decisão.",
-        "fonte": "STJ - Superior Tribunal de Justiça",
-        "jurisprudencia": "EDcl no REsp 1.500.000 - Admitidos para esclarecer omissão.",
-        "area": "Direito Processual Civil",
-        "exemplo": "Foram opostos embargos de declaração para esclarecer ponto obscuro na sentença.",
-        "sinonimos": ["EDcl"],
-        "relacionados": ["Recurso", "Decisão"]
-    }
-    # ... (os outros 26 termos seguem o mesmo padrão, mantendo a estrutura)
-]
-
-# Adicionando mais termos para completar 41
-TERMOS_ADICIONAIS = [
-    {
-        "termo": "Agravo de Instrumento",
-        "definicao": "Recurso contra decisão interlocutória que causa lesão grave.",
-        "fonte": "STJ - Superior Tribunal de Justiça",
-        "jurisprudencia": "AgInt no REsp 2.222.333 - Admitido para rediscutir prova.",
-        "area": "Direito Processual Civil",
-        "exemplo": "O agravo foi interposto contra decisão que indeferiu prova pericial.",
-        "sinonimos": ["Agravo"],
-        "relacionados": ["Recurso", "Decisão Interlocutória"]
-    },
-    {
-        "termo": "Jus Postulandi",
-        "definicao": "Capacidade de postular em juízo perante o Poder Judiciário.",
-        "fonte": "STJ - Superior Tribunal de Justiça",
-        "jurisprudencia": "Em regra, exercido por advogados (art. 1º da Lei 8.906/94)",
-        "area": "Direito Processual",
-        "exemplo": "A defensoria pública exerce o jus postulandi em favor dos necessitados.",
-        "sinonimos": ["Capacidade Postulatória"],
-        "relacionados": ["Legitimidade", "Capacidade Processual"]
-    },
-    {
-        "termo": "Recurso Especial",
-        "definicao": "Recurso cabível quando a decisão contraria lei federal.",
-        "fonte": "STJ - Superior Tribunal de Justiça",
-        "jurisprudencia": "REsp 2.000.000/SP - Julgado por violação a lei federal.",
-        "area": "Direito Processual Civil",
-        "exemplo": "O recurso especial foi interposto por violação a lei federal.",
-        "sinonimos": ["REsp"],
-        "relacionados": ["STJ", "Lei Federal"]
-    },
-    {
-        "termo": "Arguição de Descumprimento de Preceito Fundamental",
-        "definicao": "Ação para evitar ou reparar lesão a preceito fundamental.",
-        "fonte": "STF - Supremo Tribunal Federal",
-        "jurisprudencia": "ADPF 100 - Julgada procedente para proteger direito fundamental.",
-        "area": "Direito Constitucional",
-        "exemplo": "A ADPF foi ajuizada para questionar lei que violava preceito fundamental.",
-        "sinonimos": ["ADPF"],
-        "relacionados": ["Controle de Constitucionalidade"]
-    },
-    {
-        "termo": "Súmula Vinculante",
-        "definicao": "Enunciado aprovado pelo STF com efeito vinculante.",
-        "fonte": "STF - Supremo Tribunal Federal",
-        "jurisprudencia": "Súmula 10 - Viola dispositivo de lei federal a decisão que...",
-        "area": "Direito Constitucional",
-        "exemplo": "A súmula vinculante foi aplicada para uniformizar jurisprudência.",
-        "sinonimos": ["Súmula"],
-        "relacionados": ["STF", "Jurisprudência"]
-    },
-    {
-        "termo": "Mandado de Injunção",
-        "definicao": "Remédio constitucional para viabilizar exercício de direito não regulamentado.",
-        "fonte": "Câmara dos Deputados",
-        "jurisprudencia": "Previsto no art. 5º, LXXI da CF/88",
-        "area": "Direito Constitucional",
-        "exemplo": "Concedido mandado de injunção para regulamentar direito previsto na Constituição.",
-        "sinonimos": ["MI"],
-        "relacionados": ["Remédio Constitucional"]
-    },
-    {
-        "termo": "Habeas Data",
-        "definicao": "Remédio constitucional para assegurar conhecimento de informações pessoais.",
-        "fonte": "Câmara dos Deputados",
-        "jurisprudencia": "Previsto no art. 5º, LXXII da CF/88",
-        "area": "Direito Constitucional",
-        "exemplo": "Concedido habeas data para acesso a informações pessoais em banco de dados.",
-        "sinonimos": ["HD"],
-        "relacionados": ["Remédio Constitucional"]
-    },
-    {
-        "termo": "Ação Popular",
-        "definicao": "Instrumento para anular ato lesivo ao patrimônio público.",
-        "fonte": "Câmara dos Deputados",
-        "jurisprudencia": "Lei 4.717/65 - Regulamenta a ação popular.",
-        "area": "Direito Administrativo",
-        "exemplo": "O cidadão ajuizou ação popular para anular ato da prefeitura.",
-        "sinonimos": ["AP"],
-        "relacionados": ["Controle", "Administração Pública"]
-    }
-]
-
-# Combinar todos os termos
-GLOSSARIO_DADOS.extend(TERMOS_ADICIONAIS)
-
-# Notícias para TODOS os termos
-NOTICIAS_BASE = {
-    "Habeas Corpus": [
-        {
-            "titulo": "STF concede habeas corpus e solta réu por falta de provas",
-            "fonte": "Consultor Jurídico",
-            "data": "2024-01-15",
-            "resumo": "O Supremo Tribunal Federal concedeu habeas corpus para trancar ação penal contra acusado por insuficiência de provas.",
-            "url": "#"
-        }
-    ],
-    "Mandado de Segurança": [
-        {
-            "titulo": "STJ define novos parâmetros para mandado de segurança",
-            "fonte": "Migalhas",
-            "data": "2024-01-12",
-            "resumo": "Superior Tribunal de Justiça estabelece entendimento sobre direito líquido e certo.",
-            "url": "#"
-        }
-    ],
-    "Recurso Extraordinário": [
-        {
-            "titulo": "STF analisa recurso extraordinário sobre liberdade de expressão",
-            "fonte": "Supremo Tribunal Federal",
-            "data": "2024-01-18",
-            "resumo": "Caso discute limites constitucionais da liberdade de imprensa.",
-            "url": "#"
-        }
-    ],
-    "Ação Rescisória": [
-        {
-            "titulo": "STJ admite ação rescisória por documento novo descoberto",
-            "fonte": "ConJur",
-            "data": "2024-01-08",
-            "resumo": "Decisão inédita permite revisão de sentença com base em nova prova.",
-            "url": "#"
-        }
-    ],
-    "Usucapião": [
-        {
-            "titulo": "TJSP reconhece usucapião familiar em caso emblemático",
-            "fonte": "Tribunal de Justiça SP",
-            "data": "2024-01-05",
-            "resumo": "Decisão inédita reconhece direito de propriedade por usucapião familiar urbana.",
-            "url": "#"
-        }
-    ],
-    "Princípio da Isonomia": [
-        {
-            "titulo": "STF aplica princípio da isonomia em caso de servidores públicos",
-            "fonte": "Consultor Jurídico",
-            "data": "2024-01-19",
-            "resumo": "Decisão garante igualdade de tratamento entre categorias funcionais.",
-            "url": "#"
-        }
-    ],
-    "Crime Culposo": [
-        {
-            "titulo": "TJMG define parâmetros para caracterização de crime culposo",
-            "fonte": "Tribunal de Justiça MG",
-            "data": "2024-01-20",
-            "resumo": "Decisão estabelece elementos necessários para configuração de culpa.",
-            "url": "#"
-        }
-    ],
-    "Ação Civil Pública": [
-        {
-            "titulo": "MPF ajuíza ação civil pública por danos ambientais",
-            "fonte": "Ministério Público Federal",
-            "data": "2024-01-21",
-            "resumo": "Ação busca reparação por desmatamento ilegal na Amazônia.",
-            "url": "#"
-        }
-    ],
-    "Prescrição": [
-        {
-            "titulo": "STJ uniformiza entendimento sobre prescrição intercorrente",
-            "fonte": "STJ Notícias",
-            "data": "2024-01-26",
-            "resumo": "Nova orientação sobre contagem de prazos prescricionais.",
-            "url": "#"
-        }
-    ],
-    "Sentença": [
-        {
-            "titulo": "TJMG anula sentença por vício na fundamentação",
-            "fonte": "Tribunal de Justiça MG",
-            "data": "2024-01-29",
-            "resumo": "Decisão destaca importância da motivação adequada das sentenças.",
-            "url": "#"
-        }
-    ],
-    "Coisa Julgada": [
-        {
-            "titulo": "STF discute limites da coisa julgada em ações coletivas",
-            "fonte": "Supremo Tribunal Federal",
-            "data": "2024-01-14",
-            "resumo": "Julgamento define alcance da coisa julgada em demandas de grande impacto.",
-            "url": "#"
-        }
-    ],
-    "Liminar": [
-        {
-            "titulo": "STF concede liminar em ação sobre direitos fundamentais",
-            "fonte": "Supremo Tribunal Federal",
-            "data": "2024-01-25",
-            "resumo": "Decisão liminar garante proteção imediata a direito ameaçado.",
-            "url": "#"
-        }
-    ],
-    "Prisão Preventiva": [
-        {
-            "titulo": "STJ revisa critérios para prisão preventiva",
-            "fonte": "STJ Notícias",
-            "data": "2024-02-10",
-            "resumo": "Novo entendimento sobre requisitos da prisão cautelar.",
-            "url": "#"
-        }
-    ],
-    "Desconsideração da Personalidade Jurídica": [
-        {
-            "titulo": "Empresários respondem por dívidas após desconsideração da personalidade jurídica",
-            "fonte": "Jornal do Comércio",
-            "data": "2024-01-07",
-            "resumo": "Tribunal aplica teoria para responsabilizar sócios por obrigações da empresa.",
-            "url": "#"
-        }
-    ],
-    "Embargos de Declaração": [
-        {
-            "titulo": "Novo entendimento sobre embargos de declaração no TJRJ",
-            "fonte": "Tribunal de Justiça RJ",
-            "data": "2024-01-11",
-            "resumo": "Decisão estabelece parâmetros para embargos declaratórios.",
-            "url": "#"
-        }
-    ]
-}
+# Banco SQLite com o glossário e as notícias (gerado a partir de dados/*.json)
+@st.cache_resource
+def obter_banco():
+    return abrir_banco()
+
+# Cache de notícias do processo, compartilhado entre sessões (por termo normalizado)
+@st.cache_resource
+def obter_cache_noticias():
+    return CacheTTL(capacidade=2048, ttl=15 * 60, tempo_obsoleto=60 * 60)
+
+# Feeds de notícias para a coleta em segundo plano: modelos de URL com {termo},
+# separados por vírgula (ex.: https://news.google.com/rss/search?q={termo}&hl=pt-BR)
+FEEDS_NOTICIAS = [url for url in os.environ.get("GLOSSARIO_FEEDS_NOTICIAS", "").split(",") if url]
+
+@st.cache_resource
+def iniciar_ingestao_noticias():
+    # Um coletor por processo; as páginas apenas leem o que ele já gravou
+    if not FEEDS_NOTICIAS:
+        return None
+    cache = obter_cache_noticias()
+    versoes = obter_versoes()
+    # O agendador roda fora de qualquer execução da página: sem versão
+    # fixada na thread dele, fixada() devolve a atual a cada ciclo
+    return IngestorNoticias(
+        obter_banco(),
+        FEEDS_NOTICIAS,
+        lambda: versoes.fixada().nomes(),
+        ao_atualizar=lambda termo: cache.invalidar(normalizar(termo).strip()),
+    ).iniciar()
 
 # Classe para Notícias
 class GoogleNewsIntegracao:
+    @etapa("buscar_noticias")
     def buscar_noticias(self, termo):
-        noticias_termo = NOTICIAS_BASE.get(termo, [])
+        # O cache e o banco usam o nome canônico: "habeas corpus" e "HC"
+        # encontram (e compartilham) as notícias de "Habeas Corpus"
+        nome = self._resolver_termo(termo)
+        banco = obter_banco()
+        noticias_termo = obter_cache_noticias().obter(normalizar(nome).strip(), lambda: banco.noticias(nome))
         
-        # Se não encontrou notícias específicas, cria uma notícia genérica
+        # Se não encontrou notícias específicas, mostra uma notícia genérica (fora do cache)
         if not noticias_termo:
             noticias_termo = [{
-                "titulo": f"Notícias sobre {termo} - Em atualização",
+                "titulo": f"Notícias sobre {nome} - Em atualização",
                 "fonte": "Glossário Jurídico",
                 "data": datetime.now().strftime("%Y-%m-%d"),
-                "resumo": f"Em breve traremos notícias atualizadas sobre {termo} dos principais portais jurídicos.",
+                "resumo": f"Em breve traremos notícias atualizadas sobre {nome} dos principais portais jurídicos.",
                 "url": "#"
             }]
         
         return noticias_termo
+    
+    def _resolver_termo(self, termo):
+        # Nome ou apelido de um único termo do glossário -> nome gravado no banco
+        versao = obter_versao_glossario()
+        ids = versao.indice_apelidos.resolver_ids(termo)
+        return versao.dados[ids[0]].termo if len(ids) == 1 else termo.strip()
+
+# Glossário versionado: snapshot imutável (mmap) + índices, um por processo.
+# Quando dados/glossario.json muda, uma versão nova é montada em segundo plano
+# e trocada de uma vez; os índices são atualizados só nos termos alterados.
+@st.cache_resource
+def obter_versoes():
+    return GerenciadorVersoes(obter_banco())
 
-# Sistema de cache para dados
-@st.cache_data
+def obter_versao_glossario():
+    # Versão fixada no início da execução: a página inteira vê os mesmos dados
+    return obter_versoes().fixada()
+
+@etapa("carregar_dados_glossario")
 def carregar_dados_glossario():
-    # Adiciona data atual a todos os termos
-    for termo in GLOSSARIO_DADOS:
-        termo['data'] = datetime.now().strftime("%Y-%m-%d")
-    return GLOSSARIO_DADOS
+    return obter_versao_glossario().dados
+
+def obter_indice_aproximado():
+    return obter_versao_glossario().indice_aproximado
+
+def obter_indice_prefixos():
+    return obter_versao_glossario().indice_prefixos
+
+def obter_indice_termos():
+    return obter_versao_glossario().indice_termos
+
+def obter_indice_apelidos():
+    return obter_versao_glossario().indice_apelidos
+
+def obter_estatisticas():
+    return obter_versao_glossario().estatisticas
 
 # Funções auxiliares para filtros (SEM PANDAS)
 def filtrar_por_area(dados, area):
     if area == "Todas":
         return dados
-    return [termo for termo in dados if termo['area'] == area]
+    return [termo for termo in dados if termo.area == area]
 
-def filtrar_por_busca(dados, busca):
-    if not busca:
-        return dados
-    busca_lower = busca.lower()
-    return [termo for termo in dados 
-            if busca_lower in termo['termo'].lower() 
-            or busca_lower in termo['definicao'].lower()]
+@etapa("buscar_termos")
+def buscar_termos(busca, area="Todas"):
+    # doc_ids da versão atual: primeiro por relevância (BM25 sobre nome,
+    # sinônimos, definição, exemplo e jurisprudência, apelidos exatos no
+    # topo), depois os demais que contêm a busca no nome ou na definição
+    return obter_versao_glossario().buscar(busca, None if area == "Todas" else area)
+
+def abrir_termo_por_apelido(busca):
+    # Busca que é exatamente o nome ou um apelido de um único termo abre a
+    # página dele; só uma vez por busca, para o "Voltar" não reabrir
+    if not busca or st.session_state.get("apelido_aberto") == busca:
+        return
+    st.session_state.apelido_aberto = busca
+    termos = obter_indice_apelidos().resolver(busca)
+    if len(termos) == 1:
+        st.session_state.termo_selecionado = termos[0].termo
+
+def paginar_ranqueados(doc_ids, limite, deslocamento):
+    dados = carregar_dados_glossario()
+    return [dados[doc_id] for doc_id in doc_ids[deslocamento:deslocamento + limite]]
+
+def filtrar_por_busca_aproximada(busca):
+    # Usado quando a busca exata não encontra nada (erros de digitação)
+    return [termo for termo, _ in obter_indice_aproximado().sugerir(busca)]
 
-def obter_areas_unicas(dados):
-    areas = set(termo['area'] for termo in dados)
-    return sorted(list(areas))
+# Paginação da lista de termos: só a página visível é renderizada
+OPCOES_TERMOS_POR_PAGINA = [10, 20, 50]
+
+def controlar_paginacao(total, filtros):
+    # Volta para a primeira página sempre que a busca ou a área mudam
+    if st.session_state.get("filtros_explorar") != filtros:
+        st.session_state.filtros_explorar = filtros
+        st.session_state.pagina_explorar = 1
+    
+    col_pagina, col_tamanho = st.columns([3, 1])
+    with col_tamanho:
+        por_pagina = st.selectbox("Termos por página", OPCOES_TERMOS_POR_PAGINA, index=1, key="por_pagina_explorar")
+    total_paginas = max(1, -(-total // por_pagina))
+    if st.session_state.get("pagina_explorar", 1) > total_paginas:
+        st.session_state.pagina_explorar = total_paginas
+    with col_pagina:
+        pagina = st.number_input(f"Página (de {total_paginas})", min_value=1, max_value=total_paginas, step=1, key="pagina_explorar")
+    
+    return por_pagina, (pagina - 1) * por_pagina
 
 # Páginas do aplicativo
-def exibir_pagina_inicial(dados):
+@etapa("exibir_pagina_inicial")
+def exibir_pagina_inicial():
     st.markdown("### 🎯 Bem-vindo ao Glossário Jurídico Digital")
     st.markdown("**Descomplicando o Direito** através de definições claras e atualizadas.")
     
     st.markdown("### 📈 Estatísticas do Acervo")
     col1, col2, col3, col4 = st.columns(4)
     
+    # Agregados mantidos por versão do glossário (sem consultar o banco)
+    estatisticas = obter_estatisticas()
     with col1:
-        st.metric("Total de Termos", len(dados))
+        st.metric("Total de Termos", estatisticas.total)
     with col2:
-        st.metric("Áreas do Direito", len(obter_areas_unicas(dados)))
+        st.metric("Áreas do Direito", estatisticas.quantidade_areas)
     with col3:
-        fontes = set(termo['fonte'] for termo in dados)
-        st.metric("Fontes Oficiais", len(fontes))
+        st.metric("Fontes Oficiais", estatisticas.quantidade_fontes)
     with col4:
-        datas = [termo['data'] for termo in dados]
-        st.metric("Atualização", max(datas) if datas else "N/A")
+        st.metric("Atualização", estatisticas.data_mais_recente or "N/A")
     
     st.markdown("### 🔥 Termos em Destaque")
     
     # Selecionar alguns termos aleatórios para destaque
-    termos_destaque = random.sample(dados, min(4, len(dados)))
+    dados = carregar_dados_glossario()
+    termos_destaque = [dados[doc_id] for doc_id in random.sample(range(len(dados)), min(4, len(dados)))]
     
     cols = st.columns(2)
     for idx, termo in enumerate(termos_destaque):
@@ -523,19 +248,20 @@ def exibir_pagina_inicial(dados):
             with st.container():
                 st.markdown(f'<div class="term-card">', unsafe_allow_html=True)
                 
-                st.markdown(f"#### ⚖️ {termo['termo']}")
-                st.write(f"**{termo['area']}**")
-                st.write(termo['definicao'][:150] + "...")
+                st.markdown(f"#### ⚖️ {termo.termo}")
+                st.write(f"**{termo.area}**")
+                st.write(termo.definicao[:150] + "...")
                 
-                st.caption(f"📚 Fonte: {termo['fonte']}")
+                st.caption(f"📚 Fonte: {termo.fonte}")
                 
-                if st.button("🔍 Ver Detalhes", key=f"home_{termo['termo']}"):
-                    st.session_state.termo_selecionado = termo['termo']
+                if st.button("🔍 Ver Detalhes", key=f"home_{termo.termo}"):
+                    st.session_state.termo_selecionado = termo.termo
                     st.rerun()
                 
                 st.markdown('</div>', unsafe_allow_html=True)
 
-def exibir_explorar_termos(dados, area_selecionada, termo_busca):
+@etapa("exibir_explorar_termos")
+def exibir_explorar_termos(area_selecionada, termo_busca):
     st.markdown("### 📚 Explorar Termos Jurídicos")
     
     col_filtro1, col_filtro2 = st.columns(2)
@@ -544,15 +270,38 @@ def exibir_explorar_termos(dados, area_selecionada, termo_busca):
         busca_avancada = st.text_input("🔍 Buscar termo:", key="busca_avancada")
     
     with col_filtro2:
-        areas = ["Todas"] + obter_areas_unicas(dados)
+        areas = ["Todas", *obter_estatisticas().areas()]
         area_filtro = st.selectbox("🎯 Filtrar por área:", areas)
     
     # Aplicar filtros
-    dados_filtrados = filtrar_por_area(dados, area_filtro)
-    dados_filtrados = filtrar_por_busca(dados_filtrados, busca_avancada)
+    # A busca da página tem prioridade sobre a da barra lateral
+    busca = busca_avancada or termo_busca
+    
+    # Com busca, os resultados vêm por relevância e, depois deles, os que só
+    # contêm a busca como pedaço de palavra ("acao" em "Prisão")
+    # Sem busca, todos os termos (da área) na ordem do glossário
+    if busca:
+        encontrados = buscar_termos(busca, area_filtro)
+    elif area_filtro == "Todas":
+        encontrados = range(len(carregar_dados_glossario()))
+    else:
+        encontrados = carregar_dados_glossario().ids_por_area(area_filtro)
+    total = len(encontrados)
+    busca_aproximada = False
+    if total > 0:
+        st.success(f"🎉 **{total}** termo(s) encontrado(s)" + (" — ordenados por relevância" if busca else ""))
+        limite, deslocamento = controlar_paginacao(total, (busca, area_filtro))
+        dados_filtrados = paginar_ranqueados(encontrados, limite, deslocamento)
+    elif busca:
+        # Sugestões aproximadas são poucas (no máximo 10) e cabem em uma página
+        dados_filtrados = filtrar_por_area(filtrar_por_busca_aproximada(busca), area_filtro)
+        busca_aproximada = bool(dados_filtrados)
+    else:
+        dados_filtrados = []
     
     if len(dados_filtrados) > 0:
-        st.success(f"🎉 **{len(dados_filtrados)}** termo(s) encontrado(s)")
+        if busca_aproximada:
+            st.info(f"Nenhum resultado exato para **{busca}**. Você quis dizer:")
         
         for termo in dados_filtrados:
             with st.container():
@@ -561,32 +310,29 @@ def exibir_explorar_termos(dados, area_selecionada, termo_busca):
                 col_texto, col_acoes = st.columns([3, 1])
                 
                 with col_texto:
-                    st.markdown(f"##### ⚖️ {termo['termo']}")
-                    st.write(f"**{termo['area']}** | 📅 {termo['data']}")
-                    st.write(termo['definicao'])
+                    st.markdown(f"##### ⚖️ {termo.termo}")
+                    st.write(f"**{termo.area}** | 📅 {termo.data}")
+                    st.write(termo.definicao)
                     
-                    if termo['sinonimos']:
-                        st.caption(f"**Sinônimos:** {', '.join(termo['sinonimos'])}")
+                    if termo.sinonimos:
+                        st.caption(f"**Sinônimos:** {', '.join(termo.sinonimos)}")
                     
-                    st.caption(f"📚 **Fonte:** {termo['fonte']}")
+                    st.caption(f"📚 **Fonte:** {termo.fonte}")
                 
                 with col_acoes:
                     st.write("")
-                    if st.button("🔍 Detalhes", key=f"exp_{termo['termo']}", use_container_width=True):
-                        st.session_state.termo_selecionado = termo['termo']
+                    if st.button("🔍 Detalhes", key=f"exp_{termo.termo}", use_container_width=True):
+                        st.session_state.termo_selecionado = termo.termo
                         st.rerun()
                 
                 st.markdown('</div>', unsafe_allow_html=True)
     else:
         st.warning("Nenhum termo encontrado com os filtros aplicados.")
 
-def exibir_pagina_termo(dados, termo_nome):
-    # Encontrar o termo nos dados
-    termo_data = None
-    for termo in dados:
-        if termo['termo'] == termo_nome:
-            termo_data = termo
-            break
+@etapa("exibir_pagina_termo")
+def exibir_pagina_termo(termo_nome):
+    indice = obter_indice_termos()
+    termo_data = indice.obter(termo_nome)
     
     if not termo_data:
         st.error("Termo não encontrado")
@@ -599,8 +345,8 @@ def exibir_pagina_termo(dados, termo_nome):
     col_header, col_nav = st.columns([4, 1])
     
     with col_header:
-        st.markdown(f"# ⚖️ {termo_data['termo']}")
-        st.markdown(f"**Área:** {termo_data['area']} | **Fonte:** {termo_data['fonte']} | **Data:** {termo_data['data']}")
+        st.markdown(f"# ⚖️ {termo_data.termo}")
+        st.markdown(f"**Área:** {termo_data.area} | **Fonte:** {termo_data.fonte} | **Data:** {termo_data.data}")
     
     with col_nav:
         st.write("")
@@ -614,26 +360,25 @@ def exibir_pagina_termo(dados, termo_nome):
     
     with col_conteudo:
         st.markdown("### 📖 Definição Oficial")
-        st.info(termo_data['definicao'])
+        st.info(termo_data.definicao)
         
         st.markdown("### 💼 Exemplo Prático")
-        st.success(termo_data['exemplo'])
+        st.success(termo_data.exemplo)
         
         st.markdown("### ⚖️ Jurisprudência")
-        st.write(termo_data['jurisprudencia'])
+        st.write(termo_data.jurisprudencia)
     
     with col_lateral:
         st.markdown("### 🏷️ Informações")
         
-        if termo_data['sinonimos']:
+        if termo_data.sinonimos:
             st.markdown("**Sinônimos:**")
-            for sinonimo in termo_data['sinonimos']:
+            for sinonimo in termo_data.sinonimos:
                 st.write(f"• {sinonimo}")
         
         st.markdown("**Relacionados:**")
-        for relacionado in termo_data['relacionados']:
-            # Verificar se o termo relacionado existe nos dados
-            termo_existe = any(t['termo'] == relacionado for t in dados)
+        for relacionado, termo_existe in indice.obter_relacionados(termo_nome):
+            # A existência do relacionado já foi resolvida na carga
             if termo_existe:
                 if st.button(f"→ {relacionado}", key=f"rel_{relacionado}"):
                     st.session_state.termo_selecionado = relacionado
@@ -661,6 +406,7 @@ def exibir_pagina_termo(dados, termo_nome):
     else:
         st.info("Não foram encontradas notícias recentes para este termo.")
 
+@etapa("exibir_pagina_noticias")
 def exibir_pagina_noticias():
     st.markdown("### 📰 Notícias Jurídicas")
     
@@ -682,6 +428,7 @@ def exibir_pagina_noticias():
         else:
             st.warning("Nenhuma notícia encontrada.")
 
+@etapa("exibir_pagina_sobre")
 def exibir_pagina_sobre():
     st.markdown("### ℹ️ Sobre o Projeto")
     st.write("""
@@ -715,12 +462,14 @@ def exibir_pagina_sobre():
     """)
 
 # App principal
+@etapa("main")
 def main():
     st.markdown('<h1 class="main-header">⚖️ Glossário Jurídico</h1>', unsafe_allow_html=True)
     st.markdown("### Descomplicando o Direito para estudantes e leigos")
     
-    # Carregar dados
-    dados = carregar_dados_glossario()
+    # Carregar dados: todas as linhas exibidas vêm desta versão fixada
+    versao = obter_versoes().fixar()
+    iniciar_ingestao_noticias()
     
     # Sidebar
     with st.sidebar:
@@ -729,34 +478,48 @@ def main():
         
         st.subheader("Buscar Termo")
         termo_busca = st.text_input("Digite o termo jurídico:")
+        abrir_termo_por_apelido(termo_busca)
+        
+        # Sugestões enquanto digita, vindas do índice de prefixos
+        for sugestao in obter_indice_prefixos().completar(termo_busca):
+            if st.button(f"↳ {sugestao.termo}", key=f"auto_{sugestao.termo}"):
+                st.session_state.termo_selecionado = sugestao.termo
+                st.rerun()
         
         st.subheader("Filtros")
-        areas = ["Todas"] + obter_areas_unicas(dados)
+        areas = ["Todas", *obter_estatisticas().areas()]
         area_selecionada = st.selectbox("Área do Direito", areas)
         
         st.subheader("Termos Populares")
-        termos_populares = dados[:6]  # Primeiros 6 termos
+        termos_populares = versao.dados[:6]  # Primeiros 6 termos
         for termo in termos_populares:
-            if st.button(termo['termo'], key=f"side_{termo['termo']}"):
-                st.session_state.termo_selecionado = termo['termo']
+            if st.button(termo.termo, key=f"side_{termo.termo}"):
+                st.session_state.termo_selecionado = termo.termo
                 st.rerun()
         
         st.markdown("---")
-        st.metric("Total de Termos", len(dados))
+        st.metric("Total de Termos", obter_estatisticas().total)
+        st.caption(f"Versão dos dados: {versao.versao}")
     
     # Rotas
     if st.session_state.termo_selecionado:
-        exibir_pagina_termo(dados, st.session_state.termo_selecionado)
+        exibir_pagina_termo(st.session_state.termo_selecionado)
     else:
         tab1, tab2, tab3, tab4 = st.tabs(["🏠 Início", "📚 Explorar", "📰 Notícias", "ℹ️ Sobre"])
         with tab1:
-            exibir_pagina_inicial(dados)
+            exibir_pagina_inicial()
         with tab2:
-            exibir_explorar_termos(dados, area_selecionada, termo_busca)
+            exibir_explorar_termos(area_selecionada, termo_busca)
         with tab3:
             exibir_pagina_noticias()
         with tab4:
             exibir_pagina_sobre()
 
 if __name__ == "__main__":
-    main()
+    iniciar_execucao()
+    try:
+        main()
+    finally:
+        # st.rerun() e st.stop() interrompem a execução com exceção: a
+        # medição da execução é fechada mesmo assim
+        finalizar_execucao()
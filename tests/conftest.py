@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Os módulos do app ficam na raiz do repositório (sem pacote)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from servidores import FeedSimulado, RespostaComAtraso, ServidorSimulado  # noqa: E402
+
+
+@pytest.fixture
+def servidor():
+    # Substituto local de STF, STJ e portais (?atraso=<s>, ?falhas=<n>)
+    with ServidorSimulado(RespostaComAtraso) as servidor:
+        yield servidor
+
+
+@pytest.fixture
+def servidor_feed():
+    # Feed RSS local: /rss?q=<termo>&atraso=<s> devolve 5 itens do termo
+    with ServidorSimulado(FeedSimulado) as servidor:
+        yield servidor
@@ -0,0 +1,91 @@
+import gzip
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class RespostaComAtraso(BaseHTTPRequestHandler):
+    # Responde JSON depois de esperar ?atraso=<segundos>; ?falhas=N faz as
+    # N primeiras chamadas daquele caminho devolverem 503
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    falhas_por_caminho = {}
+    trava = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parametros = parse_qs(url.query)
+        time.sleep(float(parametros.get("atraso", ["0"])[0]))
+        with self.trava:
+            falhas = self.falhas_por_caminho.get(self.path, 0)
+            self.falhas_por_caminho[self.path] = falhas + 1
+        if falhas < int(parametros.get("falhas", ["0"])[0]):
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        corpo = json.dumps({"definicao": f"Resposta de {url.path}", "texto": "jurisprudência " * 200}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            corpo = gzip.compress(corpo)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class _ServidorHTTP(ThreadingHTTPServer):
+    def handle_error(self, requisicao, endereco):
+        # Cliente que desistiu pelo tempo limite (ex.: STF travado) fecha a
+        # conexão antes da resposta: esperado aqui, não é erro do servidor
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(requisicao, endereco)
+
+
+class ServidorSimulado:
+    # Servidor HTTP local que substitui STF, STJ e portais de notícias
+    def __init__(self, tratador=RespostaComAtraso):
+        self.servidor = _ServidorHTTP(("127.0.0.1", 0), tratador)
+        self.url = f"http://127.0.0.1:{self.servidor.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+class FeedSimulado(BaseHTTPRequestHandler):
+    # Feed RSS lento: /rss?q=<termo>&atraso=<segundos> devolve 5 itens do termo
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        parametros = parse_qs(urlparse(self.path).query)
+        termo = parametros.get("q", [""])[0]
+        time.sleep(float(parametros.get("atraso", ["0"])[0]))
+        itens = "".join(
+            f"<item><title>{termo}: decisão {i}</title><link>https://exemplo.jus.br/{i}</link>"
+            f"<pubDate>Mon, 0{i + 1} Jan 2024 10:00:00 GMT</pubDate>"
+            f"<description>Notícia simulada sobre {termo}</description></item>"
+            for i in range(5))
+        corpo = f"<rss><channel><title>Feed simulado</title>{itens}</channel></rss>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from anotador import AnotadorTermos
+from busca import normalizar
+
+PALAVRAS = ["ação", "acao", "penal", "Recurso", "especial", "habeas", "corpus", "HC", "data", "pública",
+            "civil", "ação civil", "rescisória", "mandado", "segurança", "de", "x"]
+SEPARADORES = [" ", " ", " ", ", ", ". ", " (", ") ", "-", "/"]
+
+
+def _forca_bruta(termos, texto):
+    # Todas as ocorrências em palavras inteiras, sem as contidas em outra maior.
+    # Só vale para textos em que a dobra preserva o tamanho (sem espaços repetidos).
+    dobrado = normalizar(texto)
+    assert len(dobrado) == len(texto)
+    ocorrencias = set()
+    for termo in termos:
+        for nome in [termo["termo"], *termo["sinonimos"]]:
+            padrao = " ".join(normalizar(nome).split())
+            inicio = dobrado.find(padrao)
+            while inicio != -1:
+                fim = inicio + len(padrao)
+                antes = dobrado[inicio - 1] if inicio else " "
+                depois = dobrado[fim] if fim < len(dobrado) else " "
+                if not antes.isalnum() and not depois.isalnum():
+                    ocorrencias.add((inicio, fim, termo["termo"]))
+                inicio = dobrado.find(padrao, inicio + 1)
+    return sorted(o for o in ocorrencias
+                  if not any(a <= o[0] and o[1] <= b and (a, b) != (o[0], o[1]) for a, b, _ in ocorrencias))
+
+
+def _glossario(rng):
+    termos = {}
+    for _ in range(rng.randint(3, 12)):
+        nome = " ".join(rng.sample(PALAVRAS, rng.randint(1, 3)))
+        termos[nome] = {"termo": nome, "sinonimos": [" ".join(rng.sample(PALAVRAS, rng.randint(1, 2)))
+                                                    for _ in range(rng.randint(0, 2))]}
+    return list(termos.values())
+
+
+def _texto(rng, tamanho):
+    partes = []
+    for _ in range(tamanho):
+        palavra = rng.choice(PALAVRAS)
+        partes.append(palavra.upper() if rng.random() < 0.2 else palavra)
+        partes.append(rng.choice(SEPARADORES))
+    return "".join(partes).replace("  ", " ")
+
+
+@pytest.mark.parametrize("semente", range(40))
+def test_anotador_igual_a_forca_bruta(semente):
+    rng = random.Random(semente)
+    termos = _glossario(rng)
+    anotador = AnotadorTermos(termos)
+    for _ in range(5):
+        texto = _texto(rng, rng.randint(1, 60))
+        esperado = _forca_bruta(termos, texto)
+        assert sorted(anotador.anotar(texto)) == esperado
+
+        # Em pedaços de qualquer tamanho o resultado é o mesmo, na ordem do texto
+        cortes = sorted(rng.sample(range(1, len(texto)), min(len(texto) - 1, rng.randint(0, 8))))
+        blocos = [texto[a:b] for a, b in zip([0, *cortes], [*cortes, len(texto)])]
+        emitidas = list(anotador.anotar_fluxo(blocos))
+        assert sorted(emitidas) == esperado
+        assert [inicio for inicio, _, _ in emitidas] == sorted(inicio for inicio, _, _ in emitidas)
+
+
+def test_offsets_do_texto_original():
+    anotador = AnotadorTermos([{"termo": "Habeas Corpus", "sinonimos": ["HC"]},
+                               {"termo": "Ação Civil Pública", "sinonimos": []}])
+    texto = "Impetrou  HABEAS\ncorpus; depois a ação   civil\tpública (hc)."
+    achados = anotador.anotar(texto)
+    assert [(texto[inicio:fim], termo) for inicio, fim, termo in achados] == [
+        ("HABEAS\ncorpus", "Habeas Corpus"),
+        ("ação   civil\tpública", "Ação Civil Pública"),
+        ("hc", "Habeas Corpus"),
+    ]
+
+
+def test_nao_casa_dentro_de_palavras():
+    anotador = AnotadorTermos([{"termo": "Dolo", "sinonimos": ["HC"]}])
+    texto = "Dolosamente, o HCX e o ZHC; sem dolo."
+    inicio = texto.rindex("dolo")
+    assert anotador.anotar(texto) == [(inicio, inicio + 4, "Dolo")]
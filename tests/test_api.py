@@ -0,0 +1,143 @@
+import gzip
+import json
+from urllib.parse import quote
+
+import pytest
+
+from api import LIMITE_MAXIMO, APIGlossario
+from armazenamento import BancoGlossario
+from versoes import GerenciadorVersoes
+
+TERMOS = [
+    {"termo": "Habeas Corpus", "definicao": "Ação contra prisão ilegal. " * 60, "fonte": "CF/88",
+     "area": "Direito Constitucional", "sinonimos": ["HC"], "relacionados": ["Mandado de Segurança", "Habeas Data"],
+     "data": "2024-01-15"},
+    {"termo": "Mandado de Segurança", "definicao": "Protege direito líquido e certo.", "fonte": "CF/88",
+     "area": "Direito Constitucional", "sinonimos": ["MS"], "data": "2024-01-10"},
+    {"termo": "Usucapião", "definicao": "Aquisição da propriedade pela posse prolongada.", "fonte": "CC",
+     "area": "Direito Civil", "data": "2024-01-05"},
+]
+
+
+@pytest.fixture
+def api(tmp_path):
+    origem = tmp_path / "glossario.json"
+    origem.write_text(json.dumps(TERMOS, ensure_ascii=False), encoding="utf-8")
+    banco = BancoGlossario(tmp_path / "glossario.db")
+    banco.criar_esquema()
+    return APIGlossario(GerenciadorVersoes(banco, origem=origem, pasta=tmp_path, intervalo=3600))
+
+
+def _chamar(api, caminho, metodo="GET", **cabecalhos):
+    # Chamada WSGI direta: devolve (status, cabeçalhos, corpo)
+    caminho, _, consulta = caminho.partition("?")
+    environ = {"REQUEST_METHOD": metodo, "PATH_INFO": caminho, "QUERY_STRING": consulta}
+    environ.update({"HTTP_" + nome.upper(): valor for nome, valor in cabecalhos.items()})
+    inicio = {}
+
+    def start_response(status, lista_cabecalhos):
+        inicio["status"], inicio["cabecalhos"] = int(status.split()[0]), dict(lista_cabecalhos)
+
+    corpo = b"".join(api(environ, start_response))
+    assert int(inicio["cabecalhos"]["Content-Length"]) == len(corpo) or metodo == "HEAD"
+    return inicio["status"], inicio["cabecalhos"], corpo
+
+
+def _json(api, caminho, **cabecalhos):
+    status, _, corpo = _chamar(api, caminho, **cabecalhos)
+    return status, json.loads(corpo)
+
+
+def test_rotas_de_termos_e_areas(api):
+    status, saude = _json(api, "/saude")
+    assert status == 200 and saude["termos"] == 3
+
+    _, pagina = _json(api, "/termos?limite=2&deslocamento=1")
+    assert (pagina["total"], pagina["limite"]) == (3, 2)
+    assert [termo["termo"] for termo in pagina["termos"]] == ["Mandado de Segurança", "Usucapião"]
+
+    _, pagina = _json(api, "/termos?busca=posse")
+    assert [termo["termo"] for termo in pagina["termos"]] == ["Usucapião"]
+    _, pagina = _json(api, f"/termos?area={quote('Direito Civil')}")
+    assert [termo["termo"] for termo in pagina["termos"]] == ["Usucapião"]
+
+    # Apelido de um único termo leva ao termo
+    _, termo = _json(api, "/termos/HC")
+    assert termo["termo"]["termo"] == "Habeas Corpus"
+    _, relacionados = _json(api, f"/termos/{quote('Habeas Corpus')}/relacionados")
+    assert relacionados["relacionados"] == [{"termo": "Mandado de Segurança", "existe": True},
+                                            {"termo": "Habeas Data", "existe": False}]
+
+    _, areas = _json(api, "/areas")
+    assert {area["area"]: area["quantidade"] for area in areas["areas"]} == {
+        "Direito Constitucional": 2, "Direito Civil": 1}
+    _, pagina = _json(api, f"/areas/{quote('Direito Constitucional')}")
+    assert pagina["total"] == 2
+
+
+@pytest.mark.parametrize("caminho, mensagem", [
+    ("/termos/Inexistente", "Termo não encontrado"),
+    (f"/areas/{quote('Direito Penal')}", "Área não encontrada"),
+    ("/nada", "Rota não encontrada"),
+    ("/termos/HC/outra", "Rota não encontrada"),
+])
+def test_nao_encontrado(api, caminho, mensagem):
+    status, cabecalhos, corpo = _chamar(api, caminho)
+    assert status == 404
+    assert "ETag" not in cabecalhos
+    assert mensagem in json.loads(corpo)["erro"]
+
+
+def test_parametros_invalidos_e_metodo(api):
+    assert _json(api, "/termos?limite=abc") == (400, {"erro": "Parâmetro 'limite' deve ser um número inteiro"})
+    assert _json(api, "/termos?deslocamento=-1")[0] == 400
+    assert _json(api, "/termos?limite=100000")[1]["limite"] == LIMITE_MAXIMO
+    status, cabecalhos, _ = _chamar(api, "/termos", metodo="POST")
+    assert status == 405 and cabecalhos["Allow"] == "GET, HEAD"
+
+
+def test_etag_e_304(api):
+    status, cabecalhos, corpo = _chamar(api, "/termos")
+    etag = cabecalhos["ETag"]
+    assert status == 200 and corpo
+
+    status, cabecalhos, corpo = _chamar(api, "/termos", if_none_match=etag)
+    assert (status, corpo, cabecalhos["ETag"]) == (304, b"", etag)
+    # Outra representação (gzip) tem outro ETag: o da identidade não vale para ela
+    status, cabecalhos, _ = _chamar(api, "/termos", if_none_match=etag, accept_encoding="gzip")
+    assert status == 200 and cabecalhos["ETag"] != etag
+    assert _chamar(api, "/termos", if_none_match='"outra-versao"')[0] == 200
+
+
+def test_gzip_so_quando_aceito_e_compensa(api):
+    _, cabecalhos, corpo = _chamar(api, "/termos", accept_encoding="gzip, deflate")
+    assert cabecalhos["Content-Encoding"] == "gzip" and cabecalhos["Vary"] == "Accept-Encoding"
+    _, _, identidade = _chamar(api, "/termos")
+    assert gzip.decompress(corpo) == identidade
+
+    # Sem Accept-Encoding ou com corpo pequeno, a resposta vai sem compressão
+    assert "Content-Encoding" not in _chamar(api, "/termos")[1]
+    _, cabecalhos, corpo = _chamar(api, "/saude", accept_encoding="gzip")
+    assert "Content-Encoding" not in cabecalhos and json.loads(corpo)["termos"] == 3
+
+
+def test_head_sem_corpo(api):
+    status, cabecalhos, corpo = _chamar(api, "/termos", metodo="HEAD")
+    assert status == 200 and corpo == b""
+    assert int(cabecalhos["Content-Length"]) == len(_chamar(api, "/termos")[2])
+
+
+def test_erro_inesperado_vira_500_em_json_fora_do_cache(api, monkeypatch, caplog):
+    def quebrado(*args):
+        raise RuntimeError("índice corrompido")
+
+    monkeypatch.setattr(api, "_rotear", quebrado)
+    with caplog.at_level("ERROR", logger="api"):
+        status, cabecalhos, corpo = _chamar(api, "/termos")
+    assert status == 500 and cabecalhos["Content-Type"].startswith("application/json")
+    assert json.loads(corpo) == {"erro": "Erro interno"}
+    assert caplog.records[0].exc_info is not None
+
+    # A falha não ficou guardada como resposta da versão
+    monkeypatch.undo()
+    assert _chamar(api, "/termos")[0] == 200
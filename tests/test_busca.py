@@ -0,0 +1,240 @@
+import random
+
+import pytest
+
+from busca import IndicePrefixos, IndiceRelevancia, IndiceSubstring, IndiceTrigramas, distancia_edicao, normalizar
+from versoes import VersaoGlossario
+
+PALAVRAS = ["ação", "acao", "Recurso", "recursos", "especial", "habeas", "corpus", "HC", "pública", "civil",
+            "rescisória", "de", "a", "x", "Código", "art.", "5º", "1234", "12345"]
+AREAS = ["Direito Civil", "Direito Penal", "Direito Constitucional"]
+
+
+def _forca_bruta(dados, busca, area=None):
+    # Comportamento da varredura linear: substring em nome ou definição
+    consulta = normalizar(busca).strip()
+    if not consulta:
+        return ()
+    return tuple(doc_id for doc_id, termo in enumerate(dados)
+                 if (area is None or termo["area"] == area)
+                 and any(consulta in normalizar(termo[campo]) for campo in ("termo", "definicao")))
+
+
+def _frase(rng, tamanho):
+    return "".join(rng.choice(PALAVRAS) + rng.choice([" ", " ", ", ", "-", "/", "  "]) for _ in range(tamanho)).strip()
+
+
+def _glossario(rng, quantidade):
+    return [{"termo": f"{_frase(rng, rng.randint(1, 3))} {i}", "definicao": _frase(rng, rng.randint(0, 12)),
+             "area": rng.choice(AREAS)} for i in range(quantidade)]
+
+
+def _consultas(rng, dados):
+    consultas = ["", "  ", "-", ", ", "a", "de a", "ão", "cao de", "HC", "recurso", "rso esp", "1234", "5o",
+                 "inexistente", "art. 5"]
+    for _ in range(30):
+        texto = rng.choice(dados)[rng.choice(["termo", "definicao"])]
+        inicio = rng.randint(0, max(0, len(texto) - 1))
+        consultas.append(texto[inicio:inicio + rng.randint(1, 15)])
+    return consultas
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_substring_igual_a_forca_bruta(semente):
+    rng = random.Random(semente)
+    dados = _glossario(rng, rng.randint(1, 80))
+    indice = IndiceSubstring(dados)
+    for consulta in _consultas(rng, dados):
+        for area in (None, AREAS[0]):
+            assert indice.buscar_ids(consulta, area) == _forca_bruta(dados, consulta, area), consulta
+
+
+@pytest.mark.parametrize("semente", range(10))
+def test_substring_atualizado_igual_a_forca_bruta(semente):
+    rng = random.Random(semente)
+    antigos = _glossario(rng, 60)
+    indice = IndiceSubstring(antigos)
+    for _ in range(3):
+        # Definições e áreas trocadas em alguns termos, e termos novos no fim
+        novos = [dict(termo) for termo in antigos] + _glossario(rng, rng.randint(0, 5))
+        alterados = sorted(rng.sample(range(len(antigos)), rng.randint(1, 8)))
+        for doc_id in alterados:
+            novos[doc_id]["definicao"] = _frase(rng, rng.randint(0, 12))
+            novos[doc_id]["area"] = rng.choice(AREAS)
+        anterior, indice = indice, indice.atualizado(novos, alterados + list(range(len(antigos), len(novos))))
+        for consulta in _consultas(rng, novos):
+            for area in (None, AREAS[1]):
+                assert indice.buscar_ids(consulta, area) == _forca_bruta(novos, consulta, area), consulta
+            # A versão anterior continua respondendo pelos dados dela
+            anterior._cache.clear()
+            assert anterior.buscar_ids(consulta) == _forca_bruta(antigos, consulta), consulta
+        antigos = novos
+
+
+def test_busca_nao_casa_entre_campos_nem_entre_documentos():
+    indice = IndiceSubstring([{"termo": "Habeas", "definicao": "Corpus", "area": "X"},
+                              {"termo": "Data", "definicao": "Pública", "area": "X"}])
+    assert indice.buscar_ids("habeas corpus") == ()
+    assert indice.buscar_ids("corpusdata") == ()
+    assert indice.buscar_ids("publica") == (1,)
+
+
+def _termo(nome, definicao, area="Direito Civil", sinonimos=()):
+    return {"termo": nome, "definicao": definicao, "area": area, "sinonimos": list(sinonimos),
+            "exemplo": "", "jurisprudencia": ""}
+
+
+RANQUEAMENTO = [
+    _termo("Prazo Recursal", "Tempo para interpor o recurso cabível contra a decisão."),
+    _termo("Recurso Especial", "Recurso ao STJ contra acórdão que contraria lei federal.", sinonimos=["REsp"]),
+    _termo("Apelação", "Recurso contra sentença; o recurso devolve a matéria ao tribunal.", area="Direito Processual Civil"),
+    _termo("Agravo de Instrumento", "Contra decisão interlocutória, com efeito devolutivo."),
+    _termo("Habeas Corpus", "Protege a liberdade de locomoção.", area="Direito Constitucional", sinonimos=["HC"]),
+    _termo("Hc Administrativo", "Pedido administrativo de hc no tribunal, também chamado de HC administrativo."),
+]
+
+
+def test_ranquear_prefere_o_nome_a_definicao():
+    indice = IndiceRelevancia(RANQUEAMENTO)
+    # Nome pesa mais que definição; duas ocorrências no texto pesam mais que uma
+    assert indice.ranquear("recurso") == (1, 2, 0)
+    # Todos os tokens são exigidos; "recur" também casa "recursal" e "recurso"
+    assert indice.ranquear("recurso contra") == (1, 2, 0)
+    assert indice.ranquear("recur") == (0, 1, 2)
+    assert indice.ranquear("recurso", "Direito Processual Civil") == (2,)
+    assert indice.ranquear("recurso locomoção") == ()
+    assert indice.ranquear("...") == ()
+
+
+def test_apelido_exato_vem_antes_do_ranqueamento():
+    versao = VersaoGlossario("teste", RANQUEAMENTO)
+    # "Hc Administrativo" cita "hc" no nome e duas vezes na definição, mas
+    # "HC" é o sinônimo exato de Habeas Corpus
+    assert versao.indice_relevancia.ranquear("hc")[0] == 5
+    assert versao.ranquear("HC") == (4, 5)
+    assert versao.ranquear("resp") == (1,)
+    assert versao.ranquear("HC", "Direito Civil") == (5,)
+
+
+def test_buscar_traz_trechos_depois_dos_ranqueados():
+    versao = VersaoGlossario("teste", RANQUEAMENTO)
+    # "curso" não é token nem prefixo de token: só a busca por trecho acha
+    assert versao.buscar("curso") == (0, 1, 2)
+    assert versao.buscar("instrumento") == (3,)
+    assert versao.buscar("recurso") == (1, 2, 0)
+
+
+def _levenshtein(a, b):
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        atual = [i]
+        for j, cb in enumerate(b, 1):
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        anterior = atual
+    return anterior[-1]
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_distancia_edicao_com_corte(semente):
+    rng = random.Random(semente)
+    for _ in range(300):
+        a = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 8)))
+        b = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 8)))
+        limite = rng.randint(0, 3)
+        assert distancia_edicao(a, b, limite) == min(_levenshtein(a, b), limite + 1), (a, b, limite)
+
+
+def _sugestoes_forca_bruta(dados, busca):
+    # Todos os termos a no máximo max_distancia edições de algum nome ou sinônimo
+    consulta = normalizar(busca).strip()
+    max_distancia = min(3, max(1, len(consulta) // 5))
+    melhores = {}
+    for doc_id, termo in enumerate(dados):
+        distancia = min(_levenshtein(consulta, normalizar(nome)) for nome in [termo["termo"], *termo["sinonimos"]])
+        if distancia <= max_distancia:
+            melhores[doc_id] = distancia
+    return [(doc_id, melhores[doc_id]) for doc_id in sorted(melhores, key=lambda d: (melhores[d], d))]
+
+
+def _com_erros(rng, texto):
+    # Troca, remove, insere ou inverte alguns caracteres
+    texto = list(texto)
+    for _ in range(rng.randint(0, 3)):
+        posicao = rng.randrange(len(texto) + 1)
+        operacao = rng.choice(["troca", "remove", "insere", "inverte"])
+        if operacao == "insere" or posicao == len(texto):
+            texto.insert(posicao, rng.choice("aeiourst"))
+        elif operacao == "troca":
+            texto[posicao] = rng.choice("aeiourst")
+        elif operacao == "remove" and len(texto) > 1:
+            del texto[posicao]
+        elif posicao + 1 < len(texto):
+            texto[posicao], texto[posicao + 1] = texto[posicao + 1], texto[posicao]
+    return "".join(texto)
+
+
+@pytest.mark.parametrize("semente", range(10))
+def test_sugerir_igual_a_forca_bruta(semente):
+    rng = random.Random(semente)
+    dados = [{**termo, "sinonimos": [_frase(rng, 1) for _ in range(rng.randint(0, 2))]}
+             for termo in _glossario(rng, 60)]
+    indice = IndiceTrigramas(dados)
+    for _ in range(30):
+        termo = rng.choice(dados)
+        busca = _com_erros(rng, rng.choice([termo["termo"], *termo["sinonimos"]]))
+        if len(normalizar(busca).strip()) < 3:
+            # Consulta curta demais para exigir um trigrama em comum: nomes
+            # próximos sem nenhum (ex.: "ee" e "de") não viram candidatos
+            continue
+        esperado = _sugestoes_forca_bruta(dados, busca)
+        obtido = [(dados.index(achado), distancia) for achado, distancia in indice.sugerir(busca, limite=len(dados))]
+        assert obtido == esperado, busca
+
+
+def test_sugerir_tolera_erros_acentos_e_sinonimos():
+    indice = IndiceTrigramas(RANQUEAMENTO)
+    assert indice.sugerir("habeas corpsu") == [(RANQUEAMENTO[4], 2)]
+    assert indice.sugerir("AGRAVO DE INSTRUMENTU") == [(RANQUEAMENTO[3], 1)]
+    # Sinônimo curto com um erro; o termo aparece uma vez só, pela menor distância
+    assert [termo["termo"] for termo, _ in indice.sugerir("rsp")] == ["Recurso Especial"]
+    assert indice.sugerir("prazo recursal", limite=1) == [(RANQUEAMENTO[0], 0)]
+    assert indice.sugerir("mandado de injunção") == []
+    assert indice.sugerir("   ") == []
+
+
+def _completar_forca_bruta(dados, prefixo, limite):
+    # Ordem alfabética do primeiro nome ou sinônimo de cada termo que começa pelo prefixo
+    prefixo = normalizar(prefixo).strip()
+    primeiros = {}
+    for doc_id, termo in enumerate(dados):
+        chaves = [normalizar(nome) for nome in [termo["termo"], *termo["sinonimos"]]]
+        casadas = [chave for chave in chaves if chave.startswith(prefixo)]
+        if prefixo and casadas:
+            primeiros[doc_id] = min(casadas)
+    return sorted(primeiros, key=lambda d: (primeiros[d], d))[:limite]
+
+
+@pytest.mark.parametrize("semente", range(10))
+def test_completar_igual_a_forca_bruta(semente):
+    rng = random.Random(semente)
+    dados = [{**termo, "sinonimos": [_frase(rng, rng.randint(1, 2)) for _ in range(rng.randint(0, 2))]}
+             for termo in _glossario(rng, 80)]
+    indice = IndicePrefixos(dados)
+    for _ in range(40):
+        nome = rng.choice([nome for termo in dados for nome in [termo["termo"], *termo["sinonimos"]]])
+        prefixo = nome[:rng.randint(0, len(nome))]
+        limite = rng.choice([1, 5, 100])
+        obtido = [dados.index(termo) for termo in indice.completar(prefixo, limite)]
+        assert obtido == _completar_forca_bruta(dados, prefixo, limite), prefixo
+
+
+def test_completar_por_nome_ou_sinonimo_sem_acentos():
+    indice = IndicePrefixos(RANQUEAMENTO)
+    nomes = lambda prefixo, limite=5: [termo["termo"] for termo in indice.completar(prefixo, limite)]
+    assert nomes("Ap") == ["Apelação"]
+    assert nomes("apela") == nomes("APELA") == ["Apelação"]
+    # "hc" casa o nome de um termo e o sinônimo de outro, em ordem alfabética
+    assert nomes("hc") == ["Habeas Corpus", "Hc Administrativo"]
+    assert nomes("hc", limite=1) == ["Habeas Corpus"]
+    assert nomes("re") == ["Recurso Especial"]
+    assert nomes("  ") == [] and nomes("zz") == []
@@ -0,0 +1,145 @@
+import csv
+import json
+
+import pytest
+
+from armazenamento import BancoGlossario
+from importacao import ImportadorGlossario, RegistroInvalido, exportar_glossario, validar_registro
+from versoes import GerenciadorVersoes, hash_conteudo
+
+BASE = {"termo": "Habeas Corpus", "definicao": "Ação contra prisão ilegal.", "fonte": "CF/88",
+        "area": "Direito Constitucional"}
+
+
+@pytest.fixture
+def banco(tmp_path):
+    banco = BancoGlossario(tmp_path / "glossario.db")
+    banco.criar_esquema()
+    banco.salvar_termos([{**BASE, "sinonimos": ["HC"], "relacionados": ["Mandado de Segurança"]}],
+                        data="2024-01-01")
+    return banco
+
+
+def _csv(caminho, linhas):
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        escritor = csv.DictWriter(arquivo, ["termo", "definicao", "fonte", "area", "data", "sinonimos"])
+        escritor.writeheader()
+        escritor.writerows(linhas)
+    return caminho
+
+
+def test_validar_registro_normaliza_campos_e_listas():
+    registro = validar_registro({**BASE, "termo": "  Habeas   Corpus ", "definicao": " Texto. ",
+                                 "sinonimos": "HC; Remédio heroico; hc; HABEAS corpus",
+                                 "relacionados": '["Mandado de Segurança", "Habeas Data"]'})
+    assert registro["termo"] == "Habeas Corpus"
+    assert registro["definicao"] == "Texto."
+    # Repetições (sem acento e caixa) e o próprio nome saem das listas
+    assert registro["sinonimos"] == ["HC", "Remédio heroico"]
+    assert registro["relacionados"] == ["Mandado de Segurança", "Habeas Data"]
+    assert registro["exemplo"] == "" and registro["data"] == ""
+
+
+@pytest.mark.parametrize("bruto, mensagem", [
+    ({**BASE, "definicao": "  "}, "campos obrigatórios vazios: definicao"),
+    ({"termo": "X"}, "campos obrigatórios vazios: definicao, fonte, area"),
+    ({**BASE, "data": "01/02/2024"}, "data fora do formato"),
+    ({**BASE, "termo": "x" * 201}, "mais de 200 caracteres"),
+    ({**BASE, "fonte": 88}, "campo 'fonte' deve ser texto"),
+    ({**BASE, "sinonimos": '["HC"'}, "lista malformada"),
+    ({**BASE, "sinonimos": [1, 2]}, "listas de textos"),
+    (["Habeas Corpus"], "não é um objeto"),
+])
+def test_validar_registro_recusa_invalidos(bruto, mensagem):
+    with pytest.raises(RegistroInvalido, match=mensagem):
+        validar_registro(bruto)
+
+
+def test_importar_junta_repetidos_entre_blocos_e_com_o_banco(banco, tmp_path):
+    arquivo = _csv(tmp_path / "dump.csv", [
+        {**BASE, "termo": "HABEAS CORPUS", "sinonimos": "Remédio heroico"},
+        {"termo": "Usucapião", "definicao": "Aquisição pela posse.", "fonte": "CC", "area": "Direito Civil",
+         "sinonimos": "Prescrição aquisitiva"},
+        {"termo": "Sem Área", "definicao": "Falta a área.", "fonte": "CC", "area": ""},
+        {"termo": "usucapiao", "definicao": "Aquisição da propriedade pela posse prolongada.", "fonte": "CC",
+         "area": "Direito Civil", "sinonimos": "Usucapião extraordinária"},
+        {"termo": "Data Ruim", "definicao": "Texto.", "fonte": "CC", "area": "Direito Civil", "data": "2024-13-01"},
+    ])
+    relatorio = ImportadorGlossario(banco, tamanho_bloco=2).importar([arquivo], data="2024-06-01")
+
+    assert (relatorio.lidos, relatorio.invalidos, relatorio.duplicados) == (5, 2, 1)
+    assert (relatorio.inseridos, relatorio.atualizados, relatorio.inalterados) == (1, 1, 0)
+    assert [linha for _, linha, _ in relatorio.erros] == [4, 6]
+    assert banco.contar() == 2
+
+    # Nome gravado e listas existentes mantidos, sinônimo novo acrescentado
+    habeas = banco.obter("Habeas Corpus")
+    assert habeas.sinonimos == ("HC", "Remédio heroico")
+    assert habeas.relacionados == ("Mandado de Segurança",)
+    # A repetição em outro bloco atualiza o termo gravado pelo bloco anterior
+    usucapiao = banco.obter("Usucapião")
+    assert usucapiao.definicao == "Aquisição da propriedade pela posse prolongada."
+    assert usucapiao.sinonimos == ("Prescrição aquisitiva", "Usucapião extraordinária")
+    assert usucapiao.data == "2024-06-01"
+
+
+def test_reimportar_o_mesmo_arquivo_nao_altera_nada(banco, tmp_path):
+    arquivo = tmp_path / "dump.jsonl"
+    arquivo.write_text("\n".join([
+        json.dumps({**BASE, "sinonimos": ["HC"]}, ensure_ascii=False),
+        "{json quebrado",
+        "",
+        json.dumps({**BASE, "termo": "Habeas Data", "sinonimos": ["HD"]}, ensure_ascii=False),
+    ]), encoding="utf-8")
+    importador = ImportadorGlossario(banco)
+    primeira = importador.importar([arquivo])
+    segunda = importador.importar([arquivo])
+
+    assert (primeira.inseridos, primeira.inalterados, primeira.invalidos) == (1, 1, 1)
+    assert primeira.erros[0][1] == 2 and "JSON inválido" in primeira.erros[0][2]
+    assert (segunda.inseridos, segunda.atualizados, segunda.inalterados) == (0, 0, 2)
+    assert banco.contar() == 2
+
+
+def test_exportar_regrava_o_glossario_e_a_versao_do_banco(banco, tmp_path):
+    arquivo = _csv(tmp_path / "dump.csv", [
+        {"termo": "Usucapião", "definicao": "Aquisição pela posse.", "fonte": "CC", "area": "Direito Civil"}])
+    ImportadorGlossario(banco).importar([arquivo])
+    destino = tmp_path / "glossario.json"
+    versao = exportar_glossario(banco, destino)
+
+    assert versao == hash_conteudo(destino.read_bytes()) == banco.versao_termos()
+    assert [termo["termo"] for termo in json.loads(destino.read_text(encoding="utf-8"))] == [
+        "Habeas Corpus", "Usucapião"]
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    # O app parte do arquivo exportado: o banco já está na versão dele e
+    # nenhum termo importado é removido pela sincronização
+    versoes = GerenciadorVersoes(banco, origem=destino, pasta=tmp_path)
+    assert versoes.atual().versao == versao
+    assert versoes.atual().nomes() == ["Habeas Corpus", "Usucapião"]
+    assert banco.contar() == 2
+
+
+def test_esquema_remove_o_fts_de_bancos_antigos(tmp_path):
+    # Banco de uma versão anterior: índice FTS5 mantido por gatilhos que
+    # chamam a função normalizar registrada na conexão
+    antigo = BancoGlossario(tmp_path / "glossario.db")
+    antigo.criar_esquema()
+    conexao = antigo.conexao()
+    conexao.create_function("normalizar", 1, str.lower)
+    conexao.executescript("""
+        CREATE VIRTUAL TABLE termos_fts USING fts5(termo, definicao, content='', tokenize='trigram');
+        CREATE TRIGGER termos_ai AFTER INSERT ON termos BEGIN
+            INSERT INTO termos_fts(rowid, termo, definicao) VALUES (new.id, normalizar(new.termo), new.definicao);
+        END;
+    """)
+    conexao.close()
+
+    banco = BancoGlossario(tmp_path / "glossario.db")
+    banco.criar_esquema()
+    # Sem o gatilho, gravar não depende mais da função em Python
+    banco.salvar_termos([BASE], data="2024-01-01")
+    assert banco.contar() == 1
+    assert banco.conexao().execute(
+        "SELECT name FROM sqlite_master WHERE name LIKE 'termos_%' AND type IN ('table', 'trigger')").fetchall() == []
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+from armazenamento import BancoGlossario
+from ingestao import IngestorNoticias
+from integracoes import ClienteHTTP
+
+
+@pytest.fixture
+def banco(tmp_path):
+    banco = BancoGlossario(tmp_path / "glossario.db")
+    banco.criar_esquema()
+    return banco
+
+
+def _esperar(condicao, tempo_limite=10):
+    limite = time.monotonic() + tempo_limite
+    while not condicao():
+        assert time.monotonic() < limite, "condição não atingida a tempo"
+        time.sleep(0.02)
+
+
+def test_coleta_grava_e_ignora_noticias_repetidas(banco, servidor_feed):
+    atualizados = []
+    ingestor = IngestorNoticias(banco, [f"{servidor_feed.url}/rss?q={{termo}}"], lambda: [],
+                                cliente=ClienteHTTP(), ao_atualizar=atualizados.append)
+
+    assert ingestor.coletar("Habeas Corpus") == 5
+    # Mesmo feed de novo: nada novo, nada gravado em dobro, cache não é invalidado
+    assert ingestor.coletar("Habeas Corpus") == 0
+    assert len(banco.noticias("Habeas Corpus", limite=50)) == 5
+    assert atualizados == ["Habeas Corpus"]
+    assert ingestor.metricas["noticias_novas"] == 5
+    assert ingestor.metricas["termos_processados"] == 2
+
+
+def test_fila_limitada_segura_o_agendador(banco, servidor_feed):
+    nomes = [f"Termo {i}" for i in range(40)]
+    ingestor = IngestorNoticias(banco, [f"{servidor_feed.url}/rss?q={{termo}}&atraso=0.05"], lambda: nomes,
+                                intervalo=3600, trabalhadores=1, tamanho_fila=3, cliente=ClienteHTTP())
+    ingestor.iniciar()
+    try:
+        _esperar(lambda: ingestor.metricas["termos_processados"] >= 10)
+    finally:
+        ingestor.parar()
+
+    # O agendador esperou vaga em vez de enfileirar os 40 termos de uma vez
+    assert ingestor.metricas["maior_fila"] <= 3
+    assert ingestor.metricas["espera_fila_s"] > 0
+    assert ingestor.metricas["erros"] == 0
+
+
+def test_feed_fora_do_ar_conta_erro_e_segue_para_o_proximo_termo(banco):
+    ingestor = IngestorNoticias(banco, ["http://127.0.0.1:9/rss?q={termo}"], lambda: ["Usucapião", "Habeas Data"],
+                                intervalo=3600, trabalhadores=1, cliente=ClienteHTTP(tentativas=0))
+    ingestor.iniciar()
+    try:
+        _esperar(lambda: ingestor.metricas["erros"] >= 2)
+    finally:
+        ingestor.parar()
+    assert ingestor.metricas["termos_processados"] == 0
+
+
+def test_agendador_sobrevive_a_falha_ao_obter_os_termos(banco, servidor_feed):
+    chamadas = []
+
+    def obter_termos():
+        chamadas.append(threading.current_thread().name)
+        if len(chamadas) == 1:
+            raise RuntimeError("glossário indisponível")
+        return ["Mandado de Segurança"]
+
+    ingestor = IngestorNoticias(banco, [f"{servidor_feed.url}/rss?q={{termo}}"], obter_termos,
+                                intervalo=0.05, trabalhadores=1, cliente=ClienteHTTP())
+    ingestor.iniciar()
+    try:
+        _esperar(lambda: ingestor.metricas["termos_processados"] >= 1)
+    finally:
+        ingestor.parar()
+
+    assert len(chamadas) >= 2
+    assert ingestor.metricas["erros"] >= 1
+    assert len(banco.noticias("Mandado de Segurança")) == 5
+
+
+def test_falha_na_coleta_fica_registrada_no_log(banco, caplog):
+    ingestor = IngestorNoticias(banco, ["http://127.0.0.1:9/rss?q={termo}"], lambda: ["Usucapião"],
+                                intervalo=3600, trabalhadores=1, cliente=ClienteHTTP(tentativas=0))
+    with caplog.at_level("ERROR", logger="ingestao"):
+        ingestor.iniciar()
+        try:
+            _esperar(lambda: ingestor.metricas["erros"] >= 1)
+        finally:
+            ingestor.parar()
+    registro, = [r for r in caplog.records if r.name == "ingestao"]
+    assert "Usucapião" in registro.getMessage()
+    assert registro.exc_info is not None
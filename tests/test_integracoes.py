@@ -0,0 +1,285 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from integracoes import CacheTTL, ClienteHTTP, FonteIndisponivel, consultar_fontes
+from servidores import RespostaComAtraso, ServidorSimulado
+
+LATENCIAS = {"stf": 0.3, "stj": 0.1, "noticias": 0.2}
+
+
+def _consultas(servidor, cliente, latencias=LATENCIAS):
+    return {fonte: (lambda f=fonte, a=atraso: cliente.obter_json(f"{servidor.url}/{f}?atraso={a}"))
+            for fonte, atraso in latencias.items()}
+
+
+def test_pagina_espera_so_a_fonte_mais_lenta(servidor):
+    consultas = _consultas(servidor, ClienteHTTP())
+    inicio = time.monotonic()
+    resultados = {nome: (resultado, erro) for nome, resultado, erro in consultar_fontes(consultas)}
+    decorrido = time.monotonic() - inicio
+
+    assert set(resultados) == set(LATENCIAS)
+    assert all(erro is None for _, erro in resultados.values())
+    # Perto da mais lenta (0,3s), longe da soma (0,6s)
+    assert max(LATENCIAS.values()) <= decorrido < sum(LATENCIAS.values()) - 0.1
+
+
+def test_resultados_chegam_na_ordem_em_que_terminam(servidor):
+    consultas = _consultas(servidor, ClienteHTTP())
+    assert [nome for nome, _, _ in consultar_fontes(consultas)] == ["stj", "noticias", "stf"]
+
+
+def test_fonte_travada_e_reportada_sem_atrasar_as_demais(servidor):
+    consultas = _consultas(servidor, ClienteHTTP(), {**LATENCIAS, "stf": 2})
+    inicio = time.monotonic()
+    resultados = {nome: (resultado, erro) for nome, resultado, erro in consultar_fontes(consultas, {"stf": 0.4})}
+    decorrido = time.monotonic() - inicio
+
+    resultado, erro = resultados["stf"]
+    assert resultado is None
+    assert isinstance(erro, FonteIndisponivel)
+    assert resultados["stj"][1] is None and resultados["noticias"][1] is None
+    assert decorrido < 1
+
+
+def test_fonte_travada_libera_o_trabalhador_no_prazo(servidor):
+    cliente = ClienteHTTP(tentativas=3, espera_base=0.01)
+    terminou = []
+
+    def travada():
+        try:
+            return cliente.obter_json(f"{servidor.url}/stf-travado?atraso=2")
+        finally:
+            terminou.append(time.monotonic())
+
+    inicio = time.monotonic()
+    (_, _, erro), = consultar_fontes({"stf": travada}, {"stf": 0.4})
+    assert isinstance(erro, FonteIndisponivel)
+    # A requisição desiste no prazo da fonte (sem novas tentativas depois
+    # dele) em vez de prender a thread do pool até o servidor responder
+    deadline = time.monotonic() + 2
+    while not terminou and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert terminou and terminou[0] - inicio < 0.9
+
+
+def test_erro_de_uma_fonte_vem_junto_do_resultado(servidor):
+    cliente = ClienteHTTP(tentativas=0)
+    consultas = {
+        "stf": lambda: cliente.obter_json(f"{servidor.url}/stf"),
+        "stj": lambda: cliente.obter_json(f"{servidor.url}/stj-fora?falhas=1"),
+    }
+    resultados = {nome: (resultado, erro) for nome, resultado, erro in consultar_fontes(consultas)}
+    assert resultados["stf"][1] is None
+    assert resultados["stj"][0] is None and resultados["stj"][1] is not None
+
+
+class _ContaSimultaneas(RespostaComAtraso):
+    # Registra o maior número de requisições atendidas ao mesmo tempo
+    ativas = 0
+    maximo = 0
+
+    def do_GET(self):
+        with self.trava:
+            _ContaSimultaneas.ativas += 1
+            _ContaSimultaneas.maximo = max(_ContaSimultaneas.maximo, _ContaSimultaneas.ativas)
+        try:
+            super().do_GET()
+        finally:
+            with self.trava:
+                _ContaSimultaneas.ativas -= 1
+
+
+class _DerrubaConexao(RespostaComAtraso):
+    # As ?derrubar=N primeiras chamadas de cada caminho fecham a conexão sem responder
+    chamadas = {}
+
+    def do_GET(self):
+        with self.trava:
+            vistas = self.chamadas[self.path] = self.chamadas.get(self.path, 0) + 1
+        if vistas <= int(parse_qs(urlparse(self.path).query).get("derrubar", ["0"])[0]):
+            self.close_connection = True
+            return
+        super().do_GET()
+
+
+def test_conexao_reaproveitada_entre_chamadas(servidor):
+    cliente = ClienteHTTP()
+    for _ in range(10):
+        cliente.obter_json(f"{servidor.url}/stf")
+
+    (host,) = cliente.metricas()["hosts"].values()
+    assert host == {"conexoes_abertas": 1, "requisicoes": 10}
+
+
+def test_limite_de_conexoes_por_host():
+    _ContaSimultaneas.ativas = _ContaSimultaneas.maximo = 0
+    cliente = ClienteHTTP(max_por_host=3)
+    with ServidorSimulado(_ContaSimultaneas) as servidor, ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda _: cliente.obter_json(f"{servidor.url}/stf?atraso=0.05"), range(16)))
+
+    assert _ContaSimultaneas.maximo <= 3
+    (host,) = cliente.metricas()["hosts"].values()
+    assert host["conexoes_abertas"] <= 3
+    assert host["requisicoes"] == 16
+
+
+def test_nova_tentativa_em_erro_5xx(servidor):
+    cliente = ClienteHTTP(tentativas=3, espera_base=0.01)
+    caminho = "/instavel?falhas=2"
+    assert cliente.obter_json(servidor.url + caminho)["definicao"] == "Resposta de /instavel"
+    # Duas respostas 503 e o sucesso na terceira chamada
+    assert RespostaComAtraso.falhas_por_caminho[caminho] == 3
+    assert cliente.metricas()["erros"] == 0
+
+
+def test_desiste_depois_das_tentativas(servidor):
+    cliente = ClienteHTTP(tentativas=1, espera_base=0.01)
+    caminho = "/fora-do-ar?falhas=5"
+    with pytest.raises(requests.RequestException):
+        cliente.obter_json(servidor.url + caminho)
+    assert RespostaComAtraso.falhas_por_caminho[caminho] == 2
+    assert cliente.metricas()["erros"] == 1
+
+
+def test_nova_tentativa_em_erro_de_conexao():
+    cliente = ClienteHTTP(tentativas=3, espera_base=0.01)
+    caminho = "/derrubada?derrubar=2"
+    with ServidorSimulado(_DerrubaConexao) as servidor:
+        assert cliente.obter_json(servidor.url + caminho)["definicao"] == "Resposta de /derrubada"
+    # Duas conexões encerradas sem resposta e o sucesso na terceira chamada
+    assert _DerrubaConexao.chamadas[caminho] == 3
+
+
+class _Relogio:
+    # Relógio controlado pelo teste
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def _esperar(condicao, tempo_limite=5):
+    limite = time.monotonic() + tempo_limite
+    while not condicao():
+        assert time.monotonic() < limite, "condição não atingida a tempo"
+        time.sleep(0.01)
+
+
+def test_cache_recarrega_depois_do_ttl():
+    relogio = _Relogio()
+    cache = CacheTTL(ttl=10, tempo_obsoleto=0, relogio=relogio)
+    cargas = []
+    carregar = lambda: cargas.append(relogio.agora) or len(cargas)
+
+    assert cache.obter("hc", carregar) == 1
+    relogio.agora = 9.9
+    assert cache.obter("hc", carregar) == 1
+    relogio.agora = 10
+    assert cache.obter("hc", carregar) == 2
+    assert cargas == [0.0, 10]
+    estatisticas = cache.estatisticas()
+    assert (estatisticas["acertos"], estatisticas["falhas"], estatisticas["obsoletos"]) == (1, 2, 0)
+    assert estatisticas["taxa_acerto"] == 1 / 3
+
+
+def test_cache_remove_o_usado_ha_mais_tempo():
+    cache = CacheTTL(capacidade=2, relogio=_Relogio())
+    cache.obter("a", lambda: "A")
+    cache.obter("b", lambda: "B")
+    cache.obter("a", lambda: "?")
+    cache.obter("c", lambda: "C")
+
+    # "b" era o menos recente: sai ele, "a" continua em cache
+    assert cache.obter("a", lambda: "?") == "A"
+    assert cache.obter("b", lambda: "B2") == "B2"
+    estatisticas = cache.estatisticas()
+    assert (estatisticas["itens"], estatisticas["remocoes"]) == (2, 2)
+
+
+def test_cache_serve_obsoleto_enquanto_revalida():
+    relogio = _Relogio()
+    cache = CacheTTL(ttl=10, tempo_obsoleto=100, relogio=relogio)
+    cache.obter("hc", lambda: "antigo")
+    liberar = threading.Event()
+    cargas = []
+
+    def carregar_devagar():
+        cargas.append(1)
+        liberar.wait(5)
+        return "novo"
+
+    relogio.agora = 50
+    # Vencido o TTL: responde na hora com o valor antigo e revalida uma vez só
+    assert cache.obter("hc", carregar_devagar) == "antigo"
+    assert cache.obter("hc", carregar_devagar) == "antigo"
+    liberar.set()
+    _esperar(lambda: cache.obter("hc", carregar_devagar) == "novo")
+    assert len(cargas) == 1
+    assert cache.estatisticas()["obsoletos"] >= 2
+
+    # Passado também o tempo obsoleto, a consulta volta a esperar a carga
+    relogio.agora = 50 + 10 + 100
+    assert cache.obter("hc", lambda: "recarregado") == "recarregado"
+
+
+def test_falha_ao_revalidar_fica_no_log_e_mantem_o_obsoleto(caplog):
+    relogio = _Relogio()
+    cache = CacheTTL(ttl=10, tempo_obsoleto=100, relogio=relogio)
+    cache.obter("hc", lambda: "antigo")
+    relogio.agora = 20
+
+    def quebrada():
+        raise requests.ConnectionError("fora do ar")
+
+    with caplog.at_level("ERROR", logger="integracoes"):
+        assert cache.obter("hc", quebrada) == "antigo"
+        _esperar(lambda: caplog.records)
+    registro, = caplog.records
+    assert "'hc'" in registro.getMessage() and registro.exc_info is not None
+    # A revalidação terminou: a próxima consulta pode tentar de novo
+    _esperar(lambda: not cache._atualizando)
+    assert cache.obter("hc", lambda: "novo") == "antigo"
+
+
+def test_cache_carrega_uma_vez_para_consultas_simultaneas():
+    cache = CacheTTL(relogio=_Relogio())
+    liberar = threading.Event()
+    cargas = []
+
+    def carregar():
+        cargas.append(1)
+        liberar.wait(5)
+        return "valor"
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futuros = [executor.submit(cache.obter, "hc", carregar) for _ in range(5)]
+        _esperar(lambda: cache.estatisticas()["falhas"] == 5)
+        liberar.set()
+        assert [futuro.result() for futuro in futuros] == ["valor"] * 5
+    assert len(cargas) == 1
+    assert cache.estatisticas()["esperas"] == 4
+
+
+def test_erro_na_carga_chega_a_quem_esperava_e_nao_fica_em_cache():
+    cache = CacheTTL(relogio=_Relogio())
+    liberar = threading.Event()
+
+    def quebrada():
+        liberar.wait(5)
+        raise FonteIndisponivel("hc")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futuros = [executor.submit(cache.obter, "hc", quebrada) for _ in range(3)]
+        _esperar(lambda: cache.estatisticas()["falhas"] == 3)
+        liberar.set()
+        for futuro in futuros:
+            with pytest.raises(FonteIndisponivel):
+                futuro.result()
+    assert cache.obter("hc", lambda: "valor") == "valor"
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+REGISTROS = [
+    {"termo": "Habeas Corpus", "definicao": "Protege a liberdade de locomoção.", "area": "Direito Constitucional",
+     "fonte": "STF", "data": "2024-01-15", "sinonimos": ["HC", "Remédio Heroico"], "relacionados": ["Habeas Data"]},
+    {"termo": "Ação HC Coletivo", "definicao": "Habeas corpus em favor de um grupo.", "area": "Direito Constitucional",
+     "fonte": "STJ", "data": "2024-01-10", "sinonimos": ["Remédio Heroico"], "relacionados": []},
+    {"termo": "Ação Civil Pública", "definicao": "Tutela de direitos difusos.", "area": "Direito Civil",
+     "fonte": "STJ", "data": "2024-01-05", "sinonimos": ["ACP"], "relacionados": ["Habeas Corpus"]},
+    {"termo": "Art. 5º (caput)", "definicao": "Igualdade perante a lei.", "area": "Direito Constitucional",
+     "fonte": "CF/88", "data": "2023-12-01", "sinonimos": [], "relacionados": []},
+    {"termo": "Artigo Cinco", "definicao": "Outro nome do art. 5º.", "area": "Direito Civil",
+     "fonte": "CF/88", "data": "", "sinonimos": [], "relacionados": []},
+]
+
+
+@pytest.fixture(scope="module")
+def app():
+    # O app chama st.* no nível do módulo; fora do "streamlit run" isso só gera avisos
+    set_log_level("error")
+    import main
+    return main
+
+
+@pytest.fixture
+def tabelas(app, monkeypatch, request):
+    # Tabelas do teste no lugar das compartilhadas, com uma versão própria:
+    # os caches por versão não se misturam entre testes
+    df, listas = app.montar_tabelas(REGISTROS, versao=request.node.name)
+    monkeypatch.setattr(app, "tabelas_compartilhadas", lambda: (df, listas))
+    return df, listas
+
+
+def _nomes(df):
+    return df["termo"].tolist()
+
+
+def test_filtrar_sem_filtros_devolve_o_proprio_df(app, tabelas):
+    df, _ = tabelas
+    assert app.filtrar_termos(df, "Todas", "Todas", "") is df
+
+
+@pytest.mark.parametrize("busca, esperado", [
+    ("acao", ["Ação HC Coletivo", "Ação Civil Pública"]),
+    ("CIVIL", ["Ação Civil Pública"]),
+    # Literal: "." e "(" não são expressão regular
+    ("art.", ["Art. 5º (caput)"]),
+    ("(caput", ["Art. 5º (caput)"]),
+    ("inexistente", []),
+])
+def test_filtrar_busca_literal_no_nome(app, tabelas, busca, esperado):
+    df, _ = tabelas
+    sem_versao, _ = app.montar_tabelas(REGISTROS)
+    assert _nomes(app.filtrar_termos(df, "Todas", "Todas", busca)) == esperado
+    assert _nomes(app.filtrar_termos(sem_versao, "Todas", "Todas", busca)) == esperado
+
+
+def test_filtrar_por_area_e_fonte(app, tabelas):
+    df, _ = tabelas
+    assert _nomes(app.filtrar_termos(df, "Direito Constitucional", "STJ", "")) == ["Ação HC Coletivo"]
+    assert _nomes(app.filtrar_termos(df, "Todas", "CF/88", "art")) == ["Art. 5º (caput)", "Artigo Cinco"]
+    assert _nomes(app.filtrar_termos(df, "Direito Civil", "STF", "")) == []
+
+
+def test_apelido_exato_entra_primeiro(app, tabelas):
+    df, _ = tabelas
+    # "HC" não está no nome de Habeas Corpus, mas é o sinônimo dele
+    assert _nomes(app.filtrar_termos(df, "Todas", "Todas", "hc")) == ["Habeas Corpus", "Ação HC Coletivo"]
+    assert _nomes(app.filtrar_termos(df, "Todas", "STJ", "hc")) == ["Ação HC Coletivo"]
+
+
+def _filtrar_em_cache():
+    import streamlit as st
+
+    import main
+    for df in st.session_state.tabelas:
+        st.session_state.resultados.append(
+            main.posicoes_em_cache(df.attrs["versao"], "Todas", "Todas", "acao", (), df).tolist())
+
+
+def test_posicoes_em_cache_por_versao(app, monkeypatch, request):
+    # Fora de uma execução do Streamlit o cache não guarda nada: o AppTest
+    # roda o trecho com o runtime de verdade
+    calculos = []
+    calcular = app.calcular_filtro
+    monkeypatch.setattr(app, "calcular_filtro", lambda *args: calculos.append(args[1:]) or calcular(*args))
+    antigo, _ = app.montar_tabelas(REGISTROS, versao=request.node.name + "-1")
+    # Mesma versão com outro conteúdo: o df não entra na chave do cache
+    mesmo, _ = app.montar_tabelas(REGISTROS[2:], versao=request.node.name + "-1")
+    novo, _ = app.montar_tabelas(REGISTROS[2:], versao=request.node.name + "-2")
+
+    teste = AppTest.from_function(_filtrar_em_cache)
+    teste.session_state["tabelas"] = [antigo, mesmo, novo, antigo]
+    teste.session_state["resultados"] = []
+    teste.run()
+    assert not teste.exception
+    assert teste.session_state["resultados"] == [[1, 2], [1, 2], [0], [1, 2]]
+    assert len(calculos) == 2
+
+
+class _Sessao(dict):
+    # Substituto do st.session_state: aceita sessao.chave e sessao.get(...)
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+@pytest.fixture
+def sessao(app, monkeypatch):
+    sessao = _Sessao(termo_selecionado=None)
+    monkeypatch.setattr(app.st, "session_state", sessao)
+    return sessao
+
+
+@pytest.mark.parametrize("busca, esperado", [
+    ("hc", "Habeas Corpus"),
+    ("  HABEAS corpus ", "Habeas Corpus"),
+    ("acp", "Ação Civil Pública"),
+    ("acao civil publica", "Ação Civil Pública"),
+    # Apelido de dois termos, ou só parte de um nome: fica na lista
+    ("remedio heroico", None),
+    ("habeas", None),
+])
+def test_abrir_termo_por_apelido(app, tabelas, sessao, busca, esperado):
+    df, _ = tabelas
+    app.abrir_termo_por_apelido(df, busca)
+    assert sessao.termo_selecionado == esperado
+
+
+def test_apelido_abre_uma_vez_por_busca(app, tabelas, sessao):
+    df, _ = tabelas
+    app.abrir_termo_por_apelido(df, "HC")
+    assert sessao.termo_selecionado == "Habeas Corpus"
+    # "Voltar" com a mesma busca na barra lateral não reabre o termo
+    sessao.termo_selecionado = None
+    app.abrir_termo_por_apelido(df, "HC")
+    assert sessao.termo_selecionado is None
+    app.abrir_termo_por_apelido(df, "ACP")
+    app.abrir_termo_por_apelido(df, "HC")
+    assert sessao.termo_selecionado == "Habeas Corpus"
+
+
+def test_sem_versao_ou_sem_busca_nao_abre(app, tabelas, sessao):
+    sem_versao, _ = app.montar_tabelas(REGISTROS)
+    app.abrir_termo_por_apelido(sem_versao, "hc")
+    app.abrir_termo_por_apelido(tabelas[0], "")
+    assert sessao == {"termo_selecionado": None}
+
+
+def test_carregar_dados_juridicos_devolve_vistas_das_tabelas_compartilhadas(app, tabelas):
+    df, listas = tabelas
+    vista, listas_vista = app.carregar_dados_juridicos()
+    outra, _ = app.carregar_dados_juridicos()
+    assert vista is not df and vista is not outra
+    assert vista.attrs["versao"] == df.attrs["versao"]
+    # Sem cópia dos dados: as colunas apontam para a memória compartilhada
+    assert np.shares_memory(vista["data"].to_numpy(), df["data"].to_numpy())
+    assert np.shares_memory(vista["area"].array.codes, df["area"].array.codes)
+
+    # O que uma sessão escreve na vista dela não chega às tabelas nem às outras sessões
+    vista.loc[0, "definicao"] = "Alterada pela sessão."
+    vista["data"] = pd.NaT
+    listas_vista["sinonimos"].loc[0, "valor"] = "XX"
+    assert df.loc[0, "definicao"] == outra.loc[0, "definicao"] == REGISTROS[0]["definicao"]
+    assert df["data"].notna().sum() == outra["data"].notna().sum() == 4
+    assert listas["sinonimos"].loc[0, "valor"] == "HC"
+    assert app.carregar_dados_juridicos()[0].loc[0, "definicao"] == REGISTROS[0]["definicao"]
@@ -0,0 +1,65 @@
+import copy
+import pickle
+
+import pytest
+
+from modelos import CAMPOS_TERMO, Termo
+
+DADOS = {"termo": "Habeas Corpus", "definicao": "Protege a liberdade de locomoção.", "fonte": "CF/88",
+         "jurisprudencia": "", "area": "Direito Constitucional", "exemplo": "",
+         "sinonimos": ["HC"], "relacionados": ["Habeas Data"], "data": "2024-01-15"}
+
+
+def test_termo_e_somente_leitura():
+    termo = Termo.de_dict(DADOS)
+    with pytest.raises(AttributeError, match="somente leitura"):
+        termo.definicao = "outra"
+    with pytest.raises(AttributeError, match="somente leitura"):
+        del termo.area
+    with pytest.raises(AttributeError):
+        termo.campo_novo = 1
+    with pytest.raises(TypeError):
+        termo["termo"] = "outro"
+    assert not hasattr(termo, "__dict__")
+
+    # Listas viram tuplas: nem quem montou o termo consegue alterá-lo depois
+    sinonimos = ["HC"]
+    termo = Termo.de_dict({**DADOS, "sinonimos": sinonimos})
+    sinonimos.append("Remédio Heroico")
+    assert termo.sinonimos == ("HC",)
+    with pytest.raises(AttributeError):
+        termo.sinonimos.append("Remédio Heroico")
+
+
+def test_termo_compara_como_o_dict_dos_campos():
+    termo = Termo.de_dict(DADOS)
+    assert termo == Termo.de_dict(dict(DADOS))
+    assert termo == {**DADOS, "sinonimos": ("HC",), "relacionados": ("Habeas Data",)}
+    assert termo != Termo.de_dict({**DADOS, "definicao": "Outra."})
+    assert dict(termo) == {**DADOS, "sinonimos": ("HC",), "relacionados": ("Habeas Data",)}
+    assert list(termo) == list(CAMPOS_TERMO) and len(termo) == len(CAMPOS_TERMO)
+
+
+def test_termo_como_mapeamento():
+    termo = Termo.de_dict({**DADOS, "campo_extra": "ignorado"})
+    assert termo["area"] == termo.area == "Direito Constitucional"
+    assert termo.get("exemplo") == "" and termo.get("campo_extra") is None
+    with pytest.raises(KeyError):
+        termo["campo_extra"]
+    # Campos opcionais ausentes ficam vazios
+    assert Termo("Usucapião", "Aquisição pela posse.", "CC").sinonimos == ()
+
+
+def test_campos_repetidos_sao_internados():
+    a = Termo.de_dict(DADOS)
+    b = Termo.de_dict({campo: "".join(valor) if isinstance(valor, str) else valor for campo, valor in DADOS.items()})
+    assert a.area is b.area and a.fonte is b.fonte and a.data is b.data
+
+
+@pytest.mark.parametrize("copiar", [copy.copy, copy.deepcopy, lambda termo: pickle.loads(pickle.dumps(termo))])
+def test_copias_continuam_iguais_e_imutaveis(copiar):
+    termo = Termo.de_dict(DADOS)
+    copia = copiar(termo)
+    assert type(copia) is Termo and copia == termo
+    with pytest.raises(AttributeError):
+        copia.termo = "outro"
@@ -0,0 +1,120 @@
+import copy
+import json
+import struct
+
+import pytest
+
+from armazenamento import BancoGlossario
+from benchmarks.comum import PALAVRAS, gerar_glossario_sintetico
+from modelos import Termo
+from snapshot import ASSINATURA, SnapshotGlossario, SnapshotInvalido, compilar_snapshot
+from versoes import GerenciadorVersoes, VersaoGlossario, diferencas, hash_conteudo
+
+# doc_ids alterados entre a versão antiga e a nova (além dos acrescentados)
+ALTERADOS = [3, 40, 41, 199]
+
+
+def _snapshot(pasta, nome, registros):
+    return SnapshotGlossario(compilar_snapshot(registros, pasta / nome), Termo.de_dict)
+
+
+def _montar_todos(versao):
+    for propriedade in ("indice_aproximado", "indice_prefixos", "indice_termos", "indice_apelidos",
+                        "indice_relevancia", "indice_substring", "estatisticas", "anotador"):
+        getattr(versao, propriedade)
+
+
+@pytest.fixture
+def glossarios(tmp_path):
+    registros = gerar_glossario_sintetico(250)
+    # Apelido compartilhado por um termo editado (3) e um que não muda (10)
+    registros[10]["sinonimos"] = list(registros[3]["sinonimos"])
+    antigos, novos = registros[:200], copy.deepcopy(registros)
+    novos[3]["definicao"] = "Definição revista: Agravo de instrumento contra decisão interlocutória."
+    novos[40]["sinonimos"] = ["Capijuris Novo", novos[40]["sinonimos"][0]]
+    novos[41]["area"] = "Direito do Consumidor"
+    novos[199]["data"] = "2025-12-31"
+    return _snapshot(tmp_path, "antigo.snap", antigos), _snapshot(tmp_path, "novo.snap", novos)
+
+
+def test_diferencas_lista_alterados_e_acrescentados(glossarios):
+    antigo, novo = glossarios
+    assert diferencas(antigo, novo) == ALTERADOS + list(range(200, 250))
+    assert diferencas(novo, novo) == []
+
+
+def test_diferencas_exige_reconstrucao_quando_posicoes_mudam(tmp_path):
+    registros = gerar_glossario_sintetico(20)
+    antigo = _snapshot(tmp_path, "antigo.snap", registros)
+    renomeado = copy.deepcopy(registros)
+    renomeado[5]["termo"] += " (renomeado)"
+    assert diferencas(antigo, _snapshot(tmp_path, "renomeado.snap", renomeado)) is None
+    assert diferencas(antigo, _snapshot(tmp_path, "removido.snap", registros[:19])) is None
+
+
+def test_indices_atualizados_equivalem_a_reconstruir(glossarios):
+    antigo, novo = glossarios
+    anterior = VersaoGlossario("antiga", antigo)
+    _montar_todos(anterior)
+    incremental = VersaoGlossario("nova", novo, anterior)
+    # Todos os índices vieram da versão anterior (atualizado), nenhum ficou para depois
+    assert set(incremental._indices) == set(anterior._indices)
+    reconstruida = VersaoGlossario("nova", novo)
+
+    nomes = [novo.campo(doc_id, "termo") for doc_id in range(len(novo))]
+    apelidos = [apelido for termo in novo for apelido in termo.sinonimos] + ["Capijuris Novo"]
+    palavras = PALAVRAS[:20] + ["capijuris", "revista", "interlocutoria", "consumidor"]
+
+    def nomes_de(termos):
+        return [termo.termo for termo in termos]
+
+    for versao in (incremental, reconstruida):
+        _montar_todos(versao)
+
+    for nome in nomes:
+        assert incremental.indice_termos.obter(nome) == reconstruida.indice_termos.obter(nome)
+        assert (incremental.indice_termos.obter_relacionados(nome)
+                == reconstruida.indice_termos.obter_relacionados(nome))
+        assert incremental.indice_apelidos.resolver_ids(nome) == reconstruida.indice_apelidos.resolver_ids(nome)
+        errado = nome[:-3] + "x" + nome[-2:]
+        assert (nomes_de(t for t, _ in incremental.indice_aproximado.sugerir(errado))
+                == nomes_de(t for t, _ in reconstruida.indice_aproximado.sugerir(errado)))
+    for apelido in apelidos:
+        assert incremental.indice_apelidos.resolver_ids(apelido) == reconstruida.indice_apelidos.resolver_ids(apelido)
+    compartilhado = novo[3].sinonimos[0]
+    assert incremental.indice_apelidos.resolver_ids(compartilhado)[:2] == (3, 10)
+    assert incremental.indice_apelidos.por_apelido == reconstruida.indice_apelidos.por_apelido
+    for palavra in palavras:
+        prefixo = palavra[:4]
+        assert (nomes_de(incremental.indice_prefixos.completar(prefixo))
+                == nomes_de(reconstruida.indice_prefixos.completar(prefixo)))
+        for area in (None, "Direito Civil", "Direito do Consumidor"):
+            assert incremental.ranquear(palavra, area) == reconstruida.ranquear(palavra, area)
+            assert incremental.buscar(palavra, area) == reconstruida.buscar(palavra, area)
+
+    estatisticas, esperadas = incremental.estatisticas, reconstruida.estatisticas
+    assert estatisticas.total == esperadas.total == 250
+    assert estatisticas.por_area == esperadas.por_area
+    assert estatisticas.por_fonte == esperadas.por_fonte
+    assert estatisticas.areas() == esperadas.areas()
+    assert estatisticas.fontes() == esperadas.fontes()
+    assert estatisticas.data_mais_recente == esperadas.data_mais_recente == "2025-12-31"
+
+    texto = " e ".join(nomes[::7] + ["Capijuris Novo"])
+    assert incremental.anotador.anotar(texto) == reconstruida.anotador.anotar(texto)
+
+
+def test_snapshot_de_formato_antigo_e_compilado_de_novo(tmp_path):
+    origem = tmp_path / "glossario.json"
+    origem.write_text(json.dumps(gerar_glossario_sintetico(20), ensure_ascii=False), encoding="utf-8")
+    # Arquivo do formato 1 (cabeçalho com 12 inteiros) já no caminho da versão
+    antigo = tmp_path / f"glossario-{hash_conteudo(origem.read_bytes())}.snap"
+    antigo.write_bytes(struct.pack("<4s12I", ASSINATURA, 1, *[0] * 11) + b"\0" * 64)
+    with pytest.raises(SnapshotInvalido):
+        SnapshotGlossario(antigo)
+
+    banco = BancoGlossario(tmp_path / "glossario.db")
+    banco.criar_esquema()
+    versoes = GerenciadorVersoes(banco, origem=origem, pasta=tmp_path)
+    assert len(versoes.atual().nomes()) == 20
+    assert SnapshotGlossario(antigo).versao == versoes.atual().versao
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import threading
+import time
+
+from anotador import AnotadorTermos
+from armazenamento import CAMINHO_GLOSSARIO, PASTA_DADOS
+from busca import IndiceApelidos, IndicePrefixos, IndiceRelevancia, IndiceSubstring, IndiceTermos, IndiceTrigramas
+from estatisticas import EstatisticasGlossario
+from modelos import Termo
+from snapshot import SnapshotGlossario, SnapshotInvalido, compilar_snapshot
+
+# Intervalo mínimo entre verificações do arquivo de origem (segundos)
+INTERVALO_VERIFICACAO = 2.0
+# Versões antigas mantidas em disco (reruns em andamento ainda podem usá-las)
+VERSOES_MANTIDAS = 2
+
+
+def hash_conteudo(conteudo):
+    return hashlib.sha256(conteudo).hexdigest()[:16]
+
+
+def diferencas(antigos, novos):
+    # doc_ids alterados ou acrescentados de "antigos" para "novos". Se algum
+    # termo foi removido ou renomeado as posições mudam: devolve None e os
+    # índices são reconstruídos do zero.
+    if len(novos) < len(antigos) or antigos.campos != novos.campos:
+        return None
+    alterados = []
+    posicao_termo = novos.campos.index("termo")
+    for i in range(len(antigos)):
+        brutos_antigos, brutos_novos = antigos.campos_brutos(i), novos.campos_brutos(i)
+        if brutos_antigos[posicao_termo] != brutos_novos[posicao_termo]:
+            return None
+        if brutos_antigos != brutos_novos:
+            alterados.append(i)
+    alterados.extend(range(len(antigos), len(novos)))
+    return alterados
+
+
+class VersaoGlossario:
+    # Uma versão imutável do glossário: snapshot (mmap, somente leitura) e os
+    # índices e estatísticas derivados dele, construídos na primeira consulta;
+    # os que já existiam na versão anterior são atualizados incrementalmente.
+
+    def __init__(self, versao, dados, anterior=None):
+        self.versao = versao
+        self.dados = dados
+        self._indices = {}
+        self._trava = threading.Lock()
+        if anterior is not None and anterior._indices:
+            alterados = diferencas(anterior.dados, dados)
+            for classe, indice in anterior._indices.items():
+                self._indices[classe] = classe(dados) if alterados is None else indice.atualizado(dados, alterados)
+
+    def _indice(self, classe):
+        indice = self._indices.get(classe)
+        if indice is None:
+            with self._trava:
+                indice = self._indices.get(classe)
+                if indice is None:
+                    indice = self._indices[classe] = classe(self.dados)
+        return indice
+
+    @property
+    def indice_aproximado(self):
+        return self._indice(IndiceTrigramas)
+
+    @property
+    def indice_prefixos(self):
+        return self._indice(IndicePrefixos)
+
+    @property
+    def indice_termos(self):
+        return self._indice(IndiceTermos)
+
+    @property
+    def indice_apelidos(self):
+        return self._indice(IndiceApelidos)
+
+    @property
+    def indice_relevancia(self):
+        return self._indice(IndiceRelevancia)
+
+    @property
+    def indice_substring(self):
+        return self._indice(IndiceSubstring)
+
+    @property
+    def estatisticas(self):
+        return self._indice(EstatisticasGlossario)
+
+    @property
+    def anotador(self):
+        return self._indice(AnotadorTermos)
+
+    def nomes(self):
+        # Nomes na ordem do glossário, lidos direto do snapshot (sem montar registros)
+        return [self.dados.campo(doc_id, "termo") for doc_id in range(len(self.dados))]
+
+    def ranquear(self, busca, area=None):
+        # doc_ids por relevância (BM25F); nome, sinônimo ou abreviação
+        # idênticos à busca ("HC", "MS") vêm sempre primeiro
+        ranqueados = self.indice_relevancia.ranquear(busca, area)
+        exatos = self.indice_apelidos.resolver_ids(busca)
+        if area is not None:
+            exatos = [doc_id for doc_id in exatos if self.dados[doc_id]["area"] == area]
+        if not exatos:
+            return ranqueados
+        return tuple(exatos) + tuple(doc_id for doc_id in ranqueados if doc_id not in exatos)
+
+    def buscar(self, busca, area=None):
+        # Todos os termos que casam com a busca: os ranqueados primeiro e, em
+        # seguida, os que só contêm a busca como trecho ("acao" em "Prisão
+        # Preventiva"), que o ranqueamento por tokens não encontra
+        ranqueados = self.ranquear(busca, area)
+        trechos = self.indice_substring.buscar_ids(busca, area)
+        if not trechos:
+            return ranqueados
+        vistos = set(ranqueados)
+        return tuple(ranqueados) + tuple(doc_id for doc_id in trechos if doc_id not in vistos)
+
+
+class GerenciadorVersoes:
+    # Mantém a versão atual do glossário e recarrega quando o arquivo de
+    # origem muda: sincroniza o banco, compila um snapshot novo
+    # (glossario-<hash>.snap) e troca a referência de uma vez. A recarga roda
+    # em segundo plano; até ela terminar, todos continuam na versão anterior.
+
+    def __init__(self, banco, origem=CAMINHO_GLOSSARIO, pasta=PASTA_DADOS, intervalo=INTERVALO_VERIFICACAO):
+        self.banco = banco
+        self.origem = origem
+        self.pasta = pasta
+        self.intervalo = intervalo
+        self._versao = None
+        self._assinatura = None
+        self._verificado_em = time.monotonic()
+        self._recarregando = threading.Lock()
+        self._fixada = threading.local()
+        self.recargas = 0
+        self._recarregar()
+
+    def _assinatura_origem(self):
+        estado = self.origem.stat()
+        return estado.st_mtime_ns, estado.st_size
+
+    def atual(self):
+        agora = time.monotonic()
+        if agora - self._verificado_em >= self.intervalo:
+            self._verificado_em = agora
+            if self._assinatura_origem() != self._assinatura and not self._recarregando.locked():
+                threading.Thread(target=self._recarregar, name="recarga-glossario", daemon=True).start()
+        return self._versao
+
+    def fixar(self):
+        # Chamado no início de cada execução da página: até a próxima, a
+        # thread enxerga sempre a mesma versão, mesmo que uma recarga termine
+        self._fixada.versao = self.atual()
+        return self._fixada.versao
+
+    def fixada(self):
+        return getattr(self._fixada, "versao", None) or self.atual()
+
+    def _recarregar(self):
+        if not self._recarregando.acquire(blocking=False):
+            return
+        try:
+            assinatura = self._assinatura_origem()
+            # Lido uma vez: o hash e o conteúdo gravado vêm dos mesmos bytes
+            conteudo = self.origem.read_bytes()
+            versao = hash_conteudo(conteudo)
+            if self._versao is not None and versao == self._versao.versao:
+                self._assinatura = assinatura
+                return
+
+            if self.banco.versao_termos() != versao:
+                self.banco.sincronizar_termos(json.loads(conteudo), versao=versao)
+            caminho = self.pasta / f"glossario-{versao}.snap"
+            if not caminho.exists():
+                compilar_snapshot(self.banco.buscar(), caminho, versao)
+            try:
+                dados = SnapshotGlossario(caminho, Termo.de_dict)
+            except SnapshotInvalido:
+                # Gravado por uma versão anterior do formato: compila de novo
+                compilar_snapshot(self.banco.buscar(), caminho, versao)
+                dados = SnapshotGlossario(caminho, Termo.de_dict)
+
+            nova = VersaoGlossario(versao, dados, self._versao)
+            self._versao = nova
+            self._assinatura = assinatura
+            self.recargas += 1
+            self._limpar_antigas(caminho)
+        finally:
+            self._recarregando.release()
+
+    def _limpar_antigas(self, atual):
+        antigas = sorted((p for p in self.pasta.glob("glossario-*.snap") if p != atual),
+                         key=lambda p: p.stat().st_mtime, reverse=True)
+        for caminho in antigas[VERSOES_MANTIDAS - 1:]:
+            try:
+                caminho.unlink()
+            except OSError:
+                # Ainda mapeado por outro processo (Windows): fica para a próxima
+                pass